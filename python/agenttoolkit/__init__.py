@@ -1,16 +1,86 @@
 """Siren Agent Toolkit for Python."""
 
-from .api import SirenAPI
-from .configuration import Configuration, Context, Actions, is_tool_allowed
-from .tools import tools
-from .schema import *
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from .configuration import Configuration, Context, Actions, filter_tools, is_tool_allowed
+
+if TYPE_CHECKING:
+    from .api import SirenAPI
+    from .tools import tools
+    from .schema import *
+
+# SirenAPI pulls in the siren SDK and tools/schemas pull in pydantic, so they
+# are imported on first attribute access (PEP 562) rather than with the package.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "SirenAPI": ".api",
+    "tools": ".tools",
+    **dict.fromkeys(
+        [
+            "SendMessage",
+            "BatchRecipient",
+            "SendMessagesBatch",
+            "GetMessageStatus",
+            "GetMessageReplies",
+            "ListTemplates",
+            "CreateTemplate",
+            "UpdateTemplate",
+            "DeleteTemplate",
+            "PublishTemplate",
+            "AddUser",
+            "UpdateUser",
+            "DeleteUser",
+            "BulkUserUpdate",
+            "AddUsersBulk",
+            "UpdateUsersBulk",
+            "DeleteUsersBulk",
+            "GetUser",
+            "ListUsers",
+            "TriggerWorkflow",
+            "TriggerWorkflowBulk",
+            "ScheduleWorkflow",
+            "ConfigureNotificationWebhooks",
+            "ConfigureInboundWebhooks",
+        ],
+        ".schema",
+    ),
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Importing the ``tools`` submodule binds it on the package, which
+        # would shadow the ``tools`` list this package has always exported.
+        if name == "tools" and isinstance(value, types.ModuleType):
+            value = value.tools
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
 
 __version__ = "1.0.0"
 __all__ = [
     "SirenAPI",
-    "Configuration", 
+    "Configuration",
     "Context",
     "Actions",
     "is_tool_allowed",
+    "filter_tools",
     "tools",
-]
\ No newline at end of file
+]
@@ -1,70 +1,966 @@
-from typing import Any, Dict, Optional
+import asyncio
+import copy
+import functools
+import inspect
+import weakref
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from pydantic import BaseModel, ValidationError
 from siren import SirenClient
+from siren.clients.async_base import AsyncBaseClient
+from siren.clients.channel_templates_async import AsyncChannelTemplateClient
+from siren.clients.messaging_async import AsyncMessageClient
+from siren.clients.templates_async import AsyncTemplateClient
+from siren.clients.users_async import AsyncUserClient
+from siren.clients.webhooks_async import AsyncWebhookClient
+from siren.clients.workflows_async import AsyncWorkflowClient
+from siren.models.base import BaseAPIResponse
+from siren.models.user import User
+from .batching import (
+    DEFAULT_CHUNK_BYTES,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_FAN_OUT_CONCURRENCY,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_RETRIES,
+    BulkResult,
+    afan_out,
+    arun_chunks,
+    chunked,
+    fan_out,
+    run_chunks,
+)
+from .cache import (
+    CACHEABLE_METHODS,
+    DEFAULT_DISK_CACHE_BYTES,
+    DEFAULT_READ_CACHE_BYTES,
+    DEFAULT_READ_CACHE_SIZE,
+    DEFAULT_READ_CACHE_TTL,
+    INVALIDATED_BY,
+    MISSING,
+    ReadCache,
+    SQLiteCache,
+)
 from .configuration import Context
+from .instrumentation import instrumentation, request_size
+from .middleware import Middleware, default_middleware, is_unprocessed
+from .pagination import DEFAULT_PAGE_SIZE, SUMMARY_FIELDS, aiter_pages, asummarize, iter_pages, summarize
+from .pool import PooledTransport, pool
+from .ratelimit import rate_limit_middleware
+from .schema import AddUser, BulkUserUpdate, DeleteUser
+from .tools import tools
+from .validation import validate_many
+from .webhooks import DEFAULT_REPLY_MAX_AGE, DEFAULT_STATUS_MAX_AGE, ReplyStore, StatusIndex
+
+AsyncClientT = TypeVar("AsyncClientT", bound=AsyncBaseClient)
+
+Handler = Callable[..., Any]
+AsyncHandler = Callable[..., Awaitable[Any]]
+
+
+class Route(NamedTuple):
+    """Where a tool method lives on the Siren SDK clients.
+
+    ``namespace`` is the domain client attribute (``"message"``) and
+    ``attribute`` the method on it (``"send"``). Params are passed as keyword
+    arguments, which the SDK accepts for ids such as ``template_id`` too;
+    ``positional`` lists params that must be passed positionally, in order.
+    """
+
+    namespace: str
+    attribute: str
+    positional: Tuple[str, ...] = ()
+
+
+ROUTES: Dict[str, Route] = {
+    "send_message": Route("message", "send"),
+    "get_message_status": Route("message", "get_status"),
+    "get_message_replies": Route("message", "get_replies"),
+
+    "list_templates": Route("template", "get"),
+    "create_template": Route("template", "create"),
+    "update_template": Route("template", "update"),
+    "delete_template": Route("template", "delete"),
+    "publish_template": Route("template", "publish"),
+    "create_channel_templates": Route("channel_template", "create"),
+    "get_channel_templates": Route("channel_template", "get"),
+
+    "add_user": Route("user", "add"),
+    "update_user": Route("user", "update"),
+    "delete_user": Route("user", "delete"),
+
+    "trigger_workflow": Route("workflow", "trigger"),
+    "trigger_workflow_bulk": Route("workflow", "trigger_bulk"),
+    "schedule_workflow": Route("workflow", "schedule"),
+
+    "configure_notification_webhooks": Route("webhook", "configure_notifications"),
+    "configure_inbound_webhooks": Route("webhook", "configure_inbound"),
+}
+
+NOT_IMPLEMENTED = ("get_user",)
+
+# Methods that are safe to repeat, so transient failures may be retried.
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset(
+    [tool["method"] for tool in tools if tool.get("idempotent")] + ["get_channel_templates"]
+)
+
+# Seconds within which an identical repeat of a mutating call is not sent again.
+DEDUPE_WINDOWS: Dict[str, float] = {
+    tool["method"]: tool["dedupe_window"] for tool in tools if tool.get("dedupe_window")
+}
+ARGS_SCHEMAS = {tool["method"]: tool["args_schema"] for tool in tools}
+
+USERS_ENDPOINT = "/api/v1/public/users"
+
+
+class UserListResponse(BaseAPIResponse[List[User]]):
+    """Response of the user listing endpoint, which the Siren SDK does not wrap."""
+
+
+def register_route(method: str, route: Route) -> None:
+    """Register an SDK route for a method; applies to SirenAPI objects created afterwards."""
+    ROUTES[method] = route
+
+
+def _pooled_client(cls: Type[AsyncClientT], api_key: str, base_url: str, transport: PooledTransport) -> AsyncClientT:
+    # AsyncBaseClient.__init__ would open a private httpx.AsyncClient per
+    # domain client; borrow the pooled transport instead.
+    client = cls.__new__(cls)
+    client.api_key = api_key
+    client.base_url = base_url
+    client._transport = transport
+    return client
+
+
+class PooledAsyncSirenClient:
+    """Async Siren client whose domain clients share a pooled transport."""
+
+    def __init__(self, api_key: str, base_url: str, transport: PooledTransport):
+        self.message = _pooled_client(AsyncMessageClient, api_key, base_url, transport)
+        self.template = _pooled_client(AsyncTemplateClient, api_key, base_url, transport)
+        self.channel_template = _pooled_client(AsyncChannelTemplateClient, api_key, base_url, transport)
+        self.user = _pooled_client(AsyncUserClient, api_key, base_url, transport)
+        self.workflow = _pooled_client(AsyncWorkflowClient, api_key, base_url, transport)
+        self.webhook = _pooled_client(AsyncWebhookClient, api_key, base_url, transport)
 
 
 class SirenAPI:
     """API wrapper that integrates with the Siren Python SDK."""
-    
-    def __init__(self, api_key: str, context: Optional[Context] = None):
+
+    def __init__(
+        self,
+        api_key: str,
+        context: Optional[Context] = None,
+        middleware: Optional[Sequence[Middleware]] = None,
+    ):
+        self.api_key = api_key
+        self.context: Context = context or {}
         self.client = SirenClient(
             api_key=api_key,
-            env=context.get("env") if context else None,
+            env=self.context.get("env"),
+        )
+        self.env = self.client.env
+        self.base_url = self.context.get("base_url") or self.client.base_url
+        _configure_sync_client(self.client, self.base_url, self.context.get("timeout"))
+        self.read_cache: Optional[ReadCache] = None
+        if self.context.get("read_cache"):
+            store_path = self.context.get("read_cache_path")
+            self.read_cache = ReadCache.for_api(
+                api_key,
+                self.base_url,
+                ttl=self.context.get("read_cache_ttl", DEFAULT_READ_CACHE_TTL),
+                maxsize=self.context.get("read_cache_max_entries") or DEFAULT_READ_CACHE_SIZE,
+                max_bytes=self.context.get("read_cache_max_bytes", DEFAULT_READ_CACHE_BYTES),
+                store=SQLiteCache.shared(
+                    store_path,
+                    self.context.get("read_cache_disk_max_bytes", DEFAULT_DISK_CACHE_BYTES),
+                ) if store_path else None,
+            )
+        self.status_index: Optional[StatusIndex] = None
+        self.status_max_age: Optional[float] = None
+        self.reply_store: Optional[ReplyStore] = None
+        self.reply_max_age: Optional[float] = None
+        self.middleware: List[Middleware] = default_middleware(
+            self.context,
+            api_key,
+            self.base_url,
+            IDEMPOTENT_METHODS,
+            DEDUPE_WINDOWS,
+            ARGS_SCHEMAS,
         )
+        rate_limiter = rate_limit_middleware(self.context, api_key, self.base_url)
+        if rate_limiter is not None:
+            # Inside retries and the breaker, so that every attempt takes a token.
+            self.middleware.append(rate_limiter)
+        self.middleware.extend(middleware or ())
+        # Async clients and their route handlers are kept per event loop so one
+        # SirenAPI can be shared by threads that each run their own loop.
+        self._async_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncState]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self._route_handlers: Dict[str, Handler] = {
+            method: _bind(self.client, route) for method, route in ROUTES.items()
+        }
+        if ROUTES.get("trigger_workflow_bulk") == Route("workflow", "trigger_bulk"):
+            # WorkflowClient.trigger_bulk swaps its timeout while the request is
+            # in flight; a copy per call keeps concurrent chunks from racing on it.
+            self._route_handlers["trigger_workflow_bulk"] = (
+                lambda **params: copy.copy(self.client.workflow).trigger_bulk(**params)
+            )
+        self._registered: Dict[str, Tuple[Handler, Optional[AsyncHandler]]] = {}
+        self._handlers: Dict[str, Handler] = {
+            method: self._wrap(method, handler) for method, handler in self._route_handlers.items()
+        }
+        self._async_handlers: Dict[str, AsyncHandler] = {}
+        self._async_routes = dict(ROUTES)
+        for method in NOT_IMPLEMENTED:
+            self.register(method, *_not_implemented(method))
+        self.register("list_users", self._list_users, self._alist_users)
+        self.register("send_messages_batch", self.send_messages_batch, self.asend_messages_batch)
+        self.register("add_users_bulk", self.add_users_bulk, self.aadd_users_bulk)
+        self.register("update_users_bulk", self.update_users_bulk, self.aupdate_users_bulk)
+        self.register("delete_users_bulk", self.delete_users_bulk, self.adelete_users_bulk)
+        self.register(
+            "trigger_workflow_bulk_chunked",
+            self._trigger_workflow_bulk_summary,
+            self._atrigger_workflow_bulk_summary,
+        )
+
+    @property
+    def async_client(self) -> PooledAsyncSirenClient:
+        """Asynchronous Siren client borrowing the process-wide connection pool."""
+        return self._async_state().client
+
+    def _async_state(self) -> "_AsyncState":
+        loop = asyncio.get_running_loop()
+        state = self._async_states.get(loop)
+        if state is None:
+            http_client = pool.get(self.env, self.base_url, self.context)
+            transport = PooledTransport(http_client, self.context.get("timeout"))
+            client = PooledAsyncSirenClient(self.api_key, self.base_url, transport)
+            state = self._async_states.setdefault(loop, _AsyncState(client))
+        return state
+
+    def register(self, method: str, handler: Handler, async_handler: Optional[AsyncHandler] = None) -> None:
+        """Register a handler for ``method`` on this instance; it is called with ``**params``.
+
+        Without ``async_handler``, ``arun`` runs ``handler`` on the default executor.
+        """
+        self._registered[method] = (handler, async_handler)
+        self._handlers[method] = self._wrap(method, handler)
+        self._async_routes.pop(method, None)
+        if async_handler is not None:
+            self._async_handlers[method] = self._awrap(method, async_handler)
+        else:
+            self._async_handlers.pop(method, None)
+
+    def add_middleware(self, middleware: Middleware) -> None:
+        """Append ``middleware`` (innermost) and rebuild every handler with it."""
+        self.middleware.append(middleware)
+        self._handlers = {
+            method: self._wrap(method, handler) for method, handler in self._route_handlers.items()
+        }
+        self._async_handlers = {}
+        for method, (handler, async_handler) in self._registered.items():
+            self._handlers[method] = self._wrap(method, handler)
+            if async_handler is not None:
+                self._async_handlers[method] = self._awrap(method, async_handler)
+        for state in list(self._async_states.values()):
+            state.handlers.clear()
 
     def run(self, method: str, params: Dict[str, Any]) -> Any:
         """Execute a method on the Siren client with the given parameters."""
-        
-        if method == "send_message":
-            return self.client.message.send(**params)
-        elif method == "get_message_status":
-            return self.client.message.get_status(params["message_id"])
-        elif method == "get_message_replies":
-            return self.client.message.get_replies(params["message_id"])
-        
-        elif method == "list_templates":
-            return self.client.template.get(**params)
-        elif method == "create_template":
-            return self.client.template.create(**params)
-        elif method == "update_template":
-            template_id = params.pop("template_id")
-            return self.client.template.update(template_id, **params)
-        elif method == "delete_template":
-            return self.client.template.delete(params["template_id"])
-        elif method == "publish_template":
-            return self.client.template.publish(params["template_id"])
-        elif method == "create_channel_templates":
-            template_id = params.pop("template_id")
-            return self.client.template.create_channel_templates(template_id, **params)
-        elif method == "get_channel_templates":
-            version_id = params.pop("version_id") 
-            return self.client.template.get_channel_templates(version_id, **params)
-        
-        elif method == "add_user":
-            return self.client.user.add(**params)
-        elif method == "update_user":
-            unique_id = params.pop("unique_id")
-            return self.client.user.update(unique_id, **params)
-        elif method == "delete_user":
-            return self.client.user.delete(params["unique_id"])
-        elif method == "get_user":
-            raise NotImplementedError("get_user is not implemented")
-            #return self.client.user.get(params["unique_id"])
-        elif method == "list_users":
-            raise NotImplementedError("list_users is not implemented")
-            #return self.client.user.list(**params)
-        
-        elif method == "trigger_workflow":
-            return self.client.workflow.trigger(**params)
-        elif method == "trigger_workflow_bulk":
-            return self.client.workflow.trigger_bulk(**params)
-        elif method == "schedule_workflow":
-            return self.client.workflow.schedule(**params)
-        
-        elif method == "configure_notification_webhooks":
-            return self.client.webhook.configure_notifications(**params)
-        elif method == "configure_inbound_webhooks":
-            return self.client.webhook.configure_inbound(**params)
-        
+        handler = self._handlers.get(method)
+        if handler is None:
+            raise ValueError(f"Unknown method: {method}")
+        if instrumentation.sinks:
+            instrumentation.size(method, "request", request_size(params))
+            return instrumentation.time(method, "run", handler, **params)
+        return handler(**params)
+
+    async def arun(self, method: str, params: Dict[str, Any]) -> Any:
+        """Execute a method on the async Siren client without blocking the event loop.
+
+        A few async SDK methods accept fewer arguments than their sync
+        counterparts (direct body messages, filtered template listings,
+        template configurations). Calls that use such arguments are handed to
+        ``run`` on the default executor so that no parameter is silently dropped.
+        """
+        if instrumentation.sinks:
+            instrumentation.size(method, "request", request_size(params))
+            return await instrumentation.atime(method, "run", self._arun, method, params)
+        return await self._arun(method, params)
+
+    async def _arun(self, method: str, params: Dict[str, Any]) -> Any:
+        handler = self._async_handlers.get(method)
+        if handler is None:
+            route = self._async_routes.get(method)
+            if route is None:
+                if method not in self._handlers:
+                    raise ValueError(f"Unknown method: {method}")
+                return await self._run_in_executor(method, params)
+            state = self._async_state()
+            handler = state.handlers.get(method)
+            if handler is None:
+                handler = state.handlers[method] = self._awrap(
+                    method, self._abind(state.client, method, route)
+                )
+        return await handler(**params)
+
+    def use_status_index(
+        self, index: Optional[StatusIndex], max_age: Optional[float] = DEFAULT_STATUS_MAX_AGE
+    ) -> None:
+        """Answer ``get_message_status`` from ``index`` (fed by a ``WebhookReceiver``).
+
+        Statuses older than ``max_age`` seconds, or unknown to the index, are
+        fetched from the API and recorded, so a status change the webhook
+        missed is still seen. Pass ``None`` to detach.
+        """
+        self.status_index = index
+        self.status_max_age = max_age
+
+    async def wait_for_status(
+        self, message_id: str, states: Collection[str], timeout: Optional[float] = None
+    ) -> str:
+        """Wait until ``message_id`` reaches one of ``states`` and return its status.
+
+        The status is checked once (from the index or the API) and then
+        awaited on the attached ``StatusIndex`` without polling. Raises
+        ``asyncio.TimeoutError`` after ``timeout`` seconds.
+        """
+        index = self.status_index
+        if index is None:
+            raise RuntimeError("wait_for_status needs a StatusIndex; call use_status_index first")
+        status = await self.arun("get_message_status", {"message_id": message_id})
+        if str(status).upper() in {state.upper() for state in states}:
+            return str(status).upper()
+        return await index.wait(message_id, states, timeout)
+
+    def use_reply_store(
+        self, store: Optional[ReplyStore], max_age: Optional[float] = DEFAULT_REPLY_MAX_AGE
+    ) -> None:
+        """Answer ``get_message_replies`` from ``store`` (fed by a ``WebhookReceiver``).
+
+        Replies of messages the store does not know yet, or has not fetched
+        from the API in the last ``max_age`` seconds, are fetched from the API
+        and seeded into it; inbound replies in between are appended by the
+        webhook. Pass ``None`` to detach.
+        """
+        self.reply_store = store
+        self.reply_max_age = max_age
+
+    async def wait_for_reply(
+        self, message_id: str, timeout: Optional[float] = None, after: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Wait for replies to ``message_id`` beyond the first ``after`` and return them.
+
+        ``after`` defaults to the number of replies known now, so only new
+        replies are returned; an empty list means none arrived within ``timeout``.
+        """
+        store = self.reply_store
+        if store is None:
+            raise RuntimeError("wait_for_reply needs a ReplyStore; call use_reply_store first")
+        if after is None:
+            after = len(await self.arun("get_message_replies", {"message_id": message_id}))
+        return await store.wait(message_id, after, timeout)
+
+    def iter_templates(
+        self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True, **filters: Any
+    ) -> Iterator[Any]:
+        """Iterate over every template matching ``filters`` (``tag_names``, ``search``, ``sort``).
+
+        Pages of ``page_size`` are fetched through ``list_templates``, the next
+        one in the background while the current one is consumed, so memory use
+        does not grow with the number of templates.
+        """
+        return iter_pages(
+            lambda page: self.run("list_templates", {**filters, "page": page, "size": page_size}),
+            page_size,
+            prefetch=prefetch,
+        )
+
+    def aiter_templates(
+        self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True, **filters: Any
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of ``iter_templates``."""
+        return aiter_pages(
+            lambda page: self.arun("list_templates", {**filters, "page": page, "size": page_size}),
+            page_size,
+            prefetch=prefetch,
+        )
+
+    def iter_users(
+        self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True, search: Optional[str] = None
+    ) -> Iterator[Any]:
+        """Iterate over every user, optionally matching ``search``, like ``iter_templates``."""
+        return iter_pages(
+            lambda page: self.run("list_users", {"search": search, "page": page, "size": page_size}),
+            page_size,
+            prefetch=prefetch,
+        )
+
+    def aiter_users(
+        self, page_size: int = DEFAULT_PAGE_SIZE, prefetch: bool = True, search: Optional[str] = None
+    ) -> AsyncIterator[Any]:
+        """Async counterpart of ``iter_users``."""
+        return aiter_pages(
+            lambda page: self.arun("list_users", {"search": search, "page": page, "size": page_size}),
+            page_size,
+            prefetch=prefetch,
+        )
+
+    def send_messages_batch(
+        self,
+        recipients: Iterable[Dict[str, Any]],
+        channel: Optional[str] = None,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        **message: Any,
+    ) -> Dict[str, Any]:
+        """Send one message to several recipients concurrently and summarize the outcome.
+
+        Each recipient is a dict with ``recipient_value`` and optionally
+        ``channel`` and ``template_variables``, which override ``channel`` and
+        are merged over the shared ``template_variables``. The remaining
+        ``send_message`` params (``body``, ``template_name``, ...) are shared.
+        Returns ``{"total", "sent", "failed", "message_ids", "errors"}``.
+        """
+        requests = _batch_requests(recipients, channel, message)
+        results = fan_out(requests, lambda params: self.run("send_message", params), max_concurrency)
+        return _batch_summary(requests, results)
+
+    async def asend_messages_batch(
+        self,
+        recipients: Iterable[Dict[str, Any]],
+        channel: Optional[str] = None,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        **message: Any,
+    ) -> Dict[str, Any]:
+        """Async counterpart of ``send_messages_batch``; the sends share the pooled connections."""
+        requests = _batch_requests(recipients, channel, message)
+        results = await afan_out(requests, lambda params: self.arun("send_message", params), max_concurrency)
+        return _batch_summary(requests, results)
+
+    def trigger_workflow_bulk_chunked(
+        self,
+        workflow_name: str,
+        notify: Iterable[Dict[str, Any]],
+        data: Optional[Dict[str, Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_bytes: Optional[int] = DEFAULT_CHUNK_BYTES,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> BulkResult:
+        """Trigger a workflow for a large or streamed ``notify`` iterable.
+
+        ``notify`` is consumed lazily and sent as ``trigger_workflow_bulk``
+        requests of at most ``chunk_size`` entries and ``max_bytes`` bytes, with
+        up to ``max_concurrency`` in flight. Chunks failing before Siren acted
+        on them (``is_unprocessed``) are retried ``retries`` times; others, such
+        as read timeouts that may have triggered the workflow, are not. See
+        ``BulkResult.failed_entries`` to resubmit failed chunks.
+        """
+        def send(chunk: Any) -> Any:
+            return self.run(
+                "trigger_workflow_bulk",
+                {"workflow_name": workflow_name, "notify": chunk, "data": data},
+            )
+
+        return run_chunks(
+            chunked(notify, chunk_size, max_bytes), send, max_concurrency, retries, retryable=is_unprocessed
+        )
+
+    async def atrigger_workflow_bulk_chunked(
+        self,
+        workflow_name: str,
+        notify: Iterable[Dict[str, Any]],
+        data: Optional[Dict[str, Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_bytes: Optional[int] = DEFAULT_CHUNK_BYTES,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> BulkResult:
+        """Async counterpart of ``trigger_workflow_bulk_chunked`` built on ``arun``."""
+        async def send(chunk: Any) -> Any:
+            return await self.arun(
+                "trigger_workflow_bulk",
+                {"workflow_name": workflow_name, "notify": chunk, "data": data},
+            )
+
+        return await arun_chunks(
+            chunked(notify, chunk_size, max_bytes), send, max_concurrency, retries, retryable=is_unprocessed
+        )
+
+    def _trigger_workflow_bulk_summary(self, **params: Any) -> Dict[str, Any]:
+        # The tool hands the model the summary; callers keep the BulkResult.
+        return self.trigger_workflow_bulk_chunked(**params).to_dict()
+
+    async def _atrigger_workflow_bulk_summary(self, **params: Any) -> Dict[str, Any]:
+        return (await self.atrigger_workflow_bulk_chunked(**params)).to_dict()
+
+    def add_users_bulk(
+        self,
+        users: Iterable[Mapping[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> Dict[str, Any]:
+        """Create or update every user of a large or streamed ``users`` iterable.
+
+        ``users`` is consumed lazily, ``chunk_size`` records at a time. Each
+        chunk is validated against ``AddUser`` in one pass, and its valid
+        records are sent as ``add_user`` calls, up to ``max_concurrency`` at a
+        time. Transport failures are retried by the middleware like any call;
+        a call that certainly never reached Siren (a connect error or 429) is
+        also resent up to ``retries`` times. Returns ``{"total", "succeeded", "failed", "errors"}``; each
+        error has the record's ``index``, its ``unique_id`` and the ``error``.
+        """
+        return self._users_bulk("add_user", AddUser, users, chunk_size, max_concurrency, retries)
+
+    def update_users_bulk(
+        self,
+        users: Iterable[Mapping[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> Dict[str, Any]:
+        """Like ``add_users_bulk``, for ``BulkUserUpdate`` records sent as ``update_user`` calls."""
+        return self._users_bulk("update_user", BulkUserUpdate, users, chunk_size, max_concurrency, retries)
+
+    def delete_users_bulk(
+        self,
+        unique_ids: Iterable[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> Dict[str, Any]:
+        """Like ``add_users_bulk``, deleting the users of ``unique_ids`` with ``delete_user`` calls."""
+        records = ({"unique_id": unique_id} for unique_id in unique_ids)
+        return self._users_bulk("delete_user", DeleteUser, records, chunk_size, max_concurrency, retries)
+
+    async def aadd_users_bulk(
+        self,
+        users: Iterable[Mapping[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> Dict[str, Any]:
+        """Async counterpart of ``add_users_bulk`` built on ``arun``."""
+        return await self._ausers_bulk("add_user", AddUser, users, chunk_size, max_concurrency, retries)
+
+    async def aupdate_users_bulk(
+        self,
+        users: Iterable[Mapping[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> Dict[str, Any]:
+        """Async counterpart of ``update_users_bulk`` built on ``arun``."""
+        return await self._ausers_bulk("update_user", BulkUserUpdate, users, chunk_size, max_concurrency, retries)
+
+    async def adelete_users_bulk(
+        self,
+        unique_ids: Iterable[str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+    ) -> Dict[str, Any]:
+        """Async counterpart of ``delete_users_bulk`` built on ``arun``."""
+        records = ({"unique_id": unique_id} for unique_id in unique_ids)
+        return await self._ausers_bulk("delete_user", DeleteUser, records, chunk_size, max_concurrency, retries)
+
+    def _users_bulk(
+        self,
+        method: str,
+        schema: Type[BaseModel],
+        records: Iterable[Mapping[str, Any]],
+        chunk_size: int,
+        max_concurrency: int,
+        retries: int,
+    ) -> Dict[str, Any]:
+        summary = _UsersBulkSummary()
+        for chunk in chunked(records, chunk_size, max_bytes=None):
+            validated = validate_many(schema, chunk)
+            results = fan_out(
+                [params for params in validated if not isinstance(params, ValidationError)],
+                lambda params: self.run(method, params),
+                max_concurrency,
+                retries=retries,
+                retryable=is_unprocessed,
+            )
+            summary.add(chunk, validated, results)
+        return summary.to_dict()
+
+    async def _ausers_bulk(
+        self,
+        method: str,
+        schema: Type[BaseModel],
+        records: Iterable[Mapping[str, Any]],
+        chunk_size: int,
+        max_concurrency: int,
+        retries: int,
+    ) -> Dict[str, Any]:
+        summary = _UsersBulkSummary()
+        for chunk in chunked(records, chunk_size, max_bytes=None):
+            validated = validate_many(schema, chunk)
+            results = await afan_out(
+                [params for params in validated if not isinstance(params, ValidationError)],
+                lambda params: self.arun(method, params),
+                max_concurrency,
+                retries=retries,
+                retryable=is_unprocessed,
+            )
+            summary.add(chunk, validated, results)
+        return summary.to_dict()
+
+    async def aclose(self) -> None:
+        """Detach from the shared pool on this loop; the pooled connections stay open."""
+        self._async_states.pop(asyncio.get_running_loop(), None)
+
+    def _abind(self, client: PooledAsyncSirenClient, method: str, route: Route) -> AsyncHandler:
+        func = getattr(getattr(client, route.namespace), route.attribute)
+        accepted = _accepted_arguments(func)
+        positional = route.positional
+
+        async def call(**params: Any) -> Any:
+            if accepted is not None and any(
+                not _is_empty(value) for key, value in params.items() if key not in accepted
+            ):
+                # The sync handler without the read cache, which wraps this call already.
+                return await _run_in_executor(self._route_handlers[method], params)
+            # Async SDK methods default every optional argument to None, so
+            # dropping None values keeps their defaults and out of query strings.
+            args = [params[name] for name in positional]
+            kwargs = {
+                key: value for key, value in params.items()
+                if value is not None and key not in positional
+                and (accepted is None or key in accepted)
+            }
+            return await func(*args, **kwargs)
+
+        return call
+
+    def _list_users(self, page: Optional[int] = None, size: Optional[int] = None, search: Optional[str] = None) -> Any:
+        return self.client.user._make_request(
+            method="GET",
+            endpoint=USERS_ENDPOINT,
+            response_model=UserListResponse,
+            params=_query(page=page, size=size, search=search),
+        )
+
+    async def _alist_users(
+        self, page: Optional[int] = None, size: Optional[int] = None, search: Optional[str] = None
+    ) -> Any:
+        return await self.async_client.user._make_request(
+            method="GET",
+            endpoint=USERS_ENDPOINT,
+            response_model=UserListResponse,
+            params=_query(page=page, size=size, search=search),
+        )
+
+    def _wrap(self, method: str, handler: Handler) -> Handler:
+        for middleware in reversed(self.middleware):
+            handler = middleware.wrap(method, handler)
+        return self._paginated(method, self._read_through(method, self._tracked(method, handler)))
+
+    def _awrap(self, method: str, handler: AsyncHandler) -> AsyncHandler:
+        for middleware in reversed(self.middleware):
+            handler = middleware.awrap(method, handler)
+        return self._apaginated(method, self._aread_through(method, self._atracked(method, handler)))
+
+    def _tracked(self, method: str, handler: Handler) -> Handler:
+        if method == "get_message_replies":
+            return self._replies(handler)
+        if method != "get_message_status":
+            return handler
+
+        def call(message_id: str) -> Any:
+            index = self.status_index
+            if index is None:
+                return handler(message_id=message_id)
+            status = index.get(message_id, self.status_max_age)
+            if status is None:
+                status = handler(message_id=message_id)
+                index.record(message_id, status)
+            return status
+
+        return call
+
+    def _atracked(self, method: str, handler: AsyncHandler) -> AsyncHandler:
+        if method == "get_message_replies":
+            return self._areplies(handler)
+        if method != "get_message_status":
+            return handler
+
+        async def call(message_id: str) -> Any:
+            index = self.status_index
+            if index is None:
+                return await handler(message_id=message_id)
+            status = index.get(message_id, self.status_max_age)
+            if status is None:
+                status = await handler(message_id=message_id)
+                index.record(message_id, status)
+            return status
+
+        return call
+
+    def _replies(self, handler: Handler) -> Handler:
+        def call(message_id: str, wait_seconds: Optional[float] = None) -> Any:
+            store = self.reply_store
+            if store is None:
+                return handler(message_id=message_id)
+            replies = store.replies(message_id, self.reply_max_age)
+            if replies is None:
+                replies = store.seed(message_id, handler(message_id=message_id) or [])
+            if not replies and wait_seconds:
+                replies = store.wait_blocking(message_id, 0, wait_seconds)
+            return replies
+
+        return call
+
+    def _areplies(self, handler: AsyncHandler) -> AsyncHandler:
+        async def call(message_id: str, wait_seconds: Optional[float] = None) -> Any:
+            store = self.reply_store
+            if store is None:
+                return await handler(message_id=message_id)
+            replies = store.replies(message_id, self.reply_max_age)
+            if replies is None:
+                replies = store.seed(message_id, await handler(message_id=message_id) or [])
+            if not replies and wait_seconds:
+                replies = await store.wait(message_id, 0, wait_seconds)
+            return replies
+
+        return call
+
+    def _paginated(self, method: str, handler: Handler) -> Handler:
+        if method not in SUMMARY_FIELDS:
+            return handler
+
+        def call(all_pages: Optional[bool] = None, max_results: Optional[int] = None, **params: Any) -> Any:
+            if not all_pages:
+                return handler(**params)
+            size = params.pop("size", None) or DEFAULT_PAGE_SIZE
+            params.pop("page", None)
+            items = iter_pages(lambda page: handler(**params, page=page, size=size), size)
+            return summarize(method, items, max_results)
+
+        return call
+
+    def _apaginated(self, method: str, handler: AsyncHandler) -> AsyncHandler:
+        if method not in SUMMARY_FIELDS:
+            return handler
+
+        async def call(all_pages: Optional[bool] = None, max_results: Optional[int] = None, **params: Any) -> Any:
+            if not all_pages:
+                return await handler(**params)
+            size = params.pop("size", None) or DEFAULT_PAGE_SIZE
+            params.pop("page", None)
+            items = aiter_pages(lambda page: handler(**params, page=page, size=size), size)
+            return await asummarize(method, items, max_results)
+
+        return call
+
+    def _read_through(self, method: str, handler: Handler) -> Handler:
+        cache = self.read_cache
+        if cache is None:
+            return handler
+        if method in CACHEABLE_METHODS:
+            def cached(**params: Any) -> Any:
+                result = cache.get(method, params)
+                if result is MISSING:
+                    result = handler(**params)
+                    cache.set(method, params, result)
+                return result
+            return cached
+        if method in INVALIDATED_BY:
+            def invalidating(**params: Any) -> Any:
+                try:
+                    return handler(**params)
+                finally:
+                    cache.invalidate(method)
+            return invalidating
+        return handler
+
+    def _aread_through(self, method: str, handler: AsyncHandler) -> AsyncHandler:
+        cache = self.read_cache
+        if cache is None:
+            return handler
+        if method in CACHEABLE_METHODS:
+            async def cached(**params: Any) -> Any:
+                result = cache.get(method, params)
+                if result is MISSING:
+                    result = await handler(**params)
+                    cache.set(method, params, result)
+                return result
+            return cached
+        if method in INVALIDATED_BY:
+            async def invalidating(**params: Any) -> Any:
+                try:
+                    return await handler(**params)
+                finally:
+                    cache.invalidate(method)
+            return invalidating
+        return handler
+
+    async def _run_in_executor(self, method: str, params: Dict[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self._handlers[method], **params))
+
+
+async def _run_in_executor(handler: Handler, params: Dict[str, Any]) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(handler, **params))
+
+
+class _AsyncState:
+    def __init__(self, client: PooledAsyncSirenClient):
+        self.client = client
+        self.handlers: Dict[str, AsyncHandler] = {}
+
+
+def _batch_requests(
+    recipients: Iterable[Dict[str, Any]], channel: Optional[str], message: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    shared_variables = message.get("template_variables")
+    requests = []
+    for recipient in recipients:
+        params = dict(message)
+        params["recipient_value"] = recipient["recipient_value"]
+        params["channel"] = recipient.get("channel") or channel
+        if not params["channel"]:
+            raise ValueError(f"No channel given for recipient {recipient['recipient_value']!r}")
+        if recipient.get("template_variables"):
+            params["template_variables"] = {**(shared_variables or {}), **recipient["template_variables"]}
+        requests.append(params)
+    return requests
+
+
+def _batch_summary(requests: List[Dict[str, Any]], results: List[Any]) -> Dict[str, Any]:
+    message_ids = []
+    errors = []
+    for params, result in zip(requests, results):
+        if isinstance(result, Exception):
+            errors.append({
+                "recipient_value": params["recipient_value"],
+                "channel": params["channel"],
+                "error": str(result),
+            })
         else:
-            raise ValueError(f"Unknown method: {method}")
\ No newline at end of file
+            message_ids.append(result)
+    return {
+        "total": len(requests),
+        "sent": len(message_ids),
+        "failed": len(errors),
+        "message_ids": message_ids,
+        "errors": errors,
+    }
+
+
+class _UsersBulkSummary:
+    """Running totals of a bulk user operation, with one compact entry per failed record."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.succeeded = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def add(self, records: List[Mapping[str, Any]], validated: List[Any], results: List[Any]) -> None:
+        outcomes = iter(results)
+        for record, params in zip(records, validated):
+            outcome = params if isinstance(params, ValidationError) else next(outcomes)
+            if isinstance(outcome, Exception):
+                self.errors.append({
+                    "index": self.total,
+                    "unique_id": record.get("unique_id") if isinstance(record, Mapping) else None,
+                    "error": _error_text(outcome),
+                })
+            else:
+                self.succeeded += 1
+            self.total += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": len(self.errors),
+            "errors": self.errors,
+        }
+
+
+def _error_text(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, detail['loc'])) or 'record'}: {detail['msg']}" for detail in error.errors()
+        )
+    return str(error)
+
+
+def _bind(client: Any, route: Route) -> Handler:
+    func = getattr(getattr(client, route.namespace), route.attribute)
+    positional = route.positional
+    if not positional:
+        return func
+
+    def call(**params: Any) -> Any:
+        args = [params.pop(name) for name in positional]
+        return func(*args, **params)
+
+    return call
+
+
+def _not_implemented(method: str) -> Tuple[Handler, AsyncHandler]:
+    def handler(**params: Any) -> Any:
+        raise NotImplementedError(f"{method} is not implemented")
+
+    async def async_handler(**params: Any) -> Any:
+        return handler(**params)
+
+    return handler, async_handler
+
+
+def _accepted_arguments(func: Callable[..., Any]) -> Optional[FrozenSet[str]]:
+    parameters = inspect.signature(func).parameters.values()
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters):
+        return None
+    return frozenset(p.name for p in parameters)
+
+
+def _query(**params: Any) -> Dict[str, Any]:
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (dict, list)) and not value)
+
+
+def _configure_sync_client(client: SirenClient, base_url: str, timeout: Optional[int]) -> None:
+    domain_clients = [
+        client.message,
+        client.template,
+        client.template._channel_template_client,
+        client.channel_template,
+        client.user,
+        client.workflow,
+        client.webhook,
+    ]
+    client.base_url = base_url
+    for domain_client in domain_clients:
+        domain_client.base_url = base_url
+        if timeout is not None:
+            domain_client.timeout = timeout
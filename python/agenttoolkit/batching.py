@@ -0,0 +1,278 @@
+"""Chunked, concurrent execution of large bulk requests.
+
+A bulk request with tens of thousands of entries is too large to build in
+memory and send as one payload. ``chunked`` splits any iterable (including a
+generator) into chunks bounded by entry count and serialized size, and
+``run_chunks`` / ``arun_chunks`` send them with bounded parallelism, retry the
+chunks that fail and collect a per-chunk ``BulkResult``. Only the chunks in
+flight are held in memory; failed chunks keep their entries so they can be
+resubmitted.
+
+``fan_out`` / ``afan_out`` are the per-item variant for requests that only take
+one entry at a time, such as sending a message to each of a list of recipients
+or adding each of a stream of users (fed to them one chunk at a time).
+"""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHUNK_BYTES = 512 * 1024
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_DELAY = 0.5
+DEFAULT_FAN_OUT_CONCURRENCY = 10
+
+
+def entry_size(entry: Any) -> int:
+    """Approximate the number of bytes ``entry`` adds to a JSON array payload."""
+    return len(json.dumps(entry, separators=(",", ":"), default=str).encode("utf-8")) + 1
+
+
+def chunked(
+    entries: Iterable[T],
+    max_items: int = DEFAULT_CHUNK_SIZE,
+    max_bytes: Optional[int] = DEFAULT_CHUNK_BYTES,
+) -> Iterator[List[T]]:
+    """Lazily split ``entries`` into lists of at most ``max_items`` entries and ``max_bytes``.
+
+    An entry that is larger than ``max_bytes`` on its own is sent in a chunk by itself.
+    """
+    if max_items <= 0:
+        raise ValueError("max_items must be positive")
+    chunk: List[T] = []
+    chunk_bytes = 0
+    for entry in entries:
+        size = entry_size(entry) if max_bytes is not None else 0
+        if chunk and (len(chunk) >= max_items or (max_bytes is not None and chunk_bytes + size > max_bytes)):
+            yield chunk
+            chunk, chunk_bytes = [], 0
+        chunk.append(entry)
+        chunk_bytes += size
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of sending one chunk."""
+
+    index: int
+    size: int
+    attempts: int
+    result: Any = None
+    error: Optional[str] = None
+    entries: Optional[List[Any]] = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = self.result
+        if result is not None and not isinstance(result, (str, int, float, bool, dict, list)):
+            result = getattr(result, "__dict__", result)
+        return {
+            "index": self.index,
+            "size": self.size,
+            "status": "success" if self.ok else "failed",
+            "attempts": self.attempts,
+            "result": result,
+            "error": self.error,
+        }
+
+
+@dataclass
+class BulkResult:
+    """Aggregated outcome of a chunked bulk request, ordered by chunk index."""
+
+    chunks: List[ChunkResult] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(chunk.size for chunk in self.chunks)
+
+    @property
+    def succeeded(self) -> int:
+        return sum(chunk.size for chunk in self.chunks if chunk.ok)
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.succeeded
+
+    @property
+    def ok(self) -> bool:
+        return all(chunk.ok for chunk in self.chunks)
+
+    def failed_entries(self) -> List[Any]:
+        """Entries of every failed chunk, in order, ready to be resubmitted."""
+        return [entry for chunk in self.chunks if not chunk.ok for entry in chunk.entries or ()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "chunks": [chunk.to_dict() for chunk in self.chunks],
+        }
+
+
+def _retry_delay(retry_delay: float, attempt: int) -> float:
+    return retry_delay * (2 ** (attempt - 1))
+
+
+async def arun_chunks(
+    chunks: Iterable[List[T]],
+    send: Callable[[List[T]], Awaitable[Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    retryable: Callable[[Exception], bool] = lambda error: True,
+) -> BulkResult:
+    """Send ``chunks`` with ``send``, at most ``max_concurrency`` at a time.
+
+    A chunk whose ``send`` raises a ``retryable`` error is retried up to
+    ``retries`` times with exponential backoff starting at ``retry_delay``
+    seconds. The next chunk is
+    only pulled from ``chunks`` once a slot is free.
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be positive")
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: List[ChunkResult] = []
+
+    async def attempt(index: int, chunk: List[T]) -> None:
+        try:
+            for attempts in range(1, retries + 2):
+                try:
+                    result = await send(chunk)
+                except Exception as error:
+                    if attempts > retries or not retryable(error):
+                        results.append(ChunkResult(index, len(chunk), attempts, error=str(error), entries=chunk))
+                        return
+                    await asyncio.sleep(_retry_delay(retry_delay, attempts))
+                else:
+                    results.append(ChunkResult(index, len(chunk), attempts, result=result))
+                    return
+        finally:
+            semaphore.release()
+
+    tasks: Set["asyncio.Task[None]"] = set()
+    try:
+        for index, chunk in enumerate(chunks):
+            await semaphore.acquire()
+            task = asyncio.ensure_future(attempt(index, chunk))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    results.sort(key=lambda chunk: chunk.index)
+    return BulkResult(results)
+
+
+def run_chunks(
+    chunks: Iterable[List[T]],
+    send: Callable[[List[T]], Any],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    retryable: Callable[[Exception], bool] = lambda error: True,
+) -> BulkResult:
+    """Blocking counterpart of ``arun_chunks`` that sends chunks from a thread pool."""
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be positive")
+    lock = threading.Lock()
+    results: List[ChunkResult] = []
+
+    def attempt(index: int, chunk: List[T]) -> None:
+        for attempts in range(1, retries + 2):
+            try:
+                result = send(chunk)
+            except Exception as error:
+                if attempts > retries or not retryable(error):
+                    with lock:
+                        results.append(ChunkResult(index, len(chunk), attempts, error=str(error), entries=chunk))
+                    return
+                time.sleep(_retry_delay(retry_delay, attempts))
+            else:
+                with lock:
+                    results.append(ChunkResult(index, len(chunk), attempts, result=result))
+                return
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending: Set["Future[None]"] = set()
+        for index, chunk in enumerate(chunks):
+            if len(pending) >= max_concurrency:
+                _, pending = wait(pending, return_when=FIRST_COMPLETED)
+            pending.add(executor.submit(attempt, index, chunk))
+        wait(pending)
+
+    results.sort(key=lambda chunk: chunk.index)
+    return BulkResult(results)
+
+
+async def afan_out(
+    items: Iterable[T],
+    call: Callable[[T], Awaitable[Any]],
+    max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+    retries: int = 0,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    retryable: Callable[[Exception], bool] = lambda error: True,
+) -> List[Any]:
+    """Await ``call(item)`` for every item, at most ``max_concurrency`` at a time.
+
+    Returns the results in input order; an item whose call raised yields the
+    exception instead. Calls failing with a ``retryable`` error are retried
+    up to ``retries`` times with exponential backoff from ``retry_delay``.
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be positive")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(item: T) -> Any:
+        async with semaphore:
+            for attempts in range(1, retries + 2):
+                try:
+                    return await call(item)
+                except Exception as error:
+                    if attempts > retries or not retryable(error):
+                        return error
+                await asyncio.sleep(_retry_delay(retry_delay, attempts))
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
+
+
+def fan_out(
+    items: Iterable[T],
+    call: Callable[[T], Any],
+    max_concurrency: int = DEFAULT_FAN_OUT_CONCURRENCY,
+    retries: int = 0,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    retryable: Callable[[Exception], bool] = lambda error: True,
+) -> List[Any]:
+    """Blocking counterpart of ``afan_out`` that runs the calls in a thread pool."""
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be positive")
+
+    def run(item: T) -> Any:
+        for attempts in range(1, retries + 2):
+            try:
+                return call(item)
+            except Exception as error:
+                if attempts > retries or not retryable(error):
+                    return error
+            time.sleep(_retry_delay(retry_delay, attempts))
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        return list(executor.map(run, items))
@@ -0,0 +1,598 @@
+"""Small thread-safe caches shared by the toolkits.
+
+``TTLCache`` is an LRU mapping whose entries also expire after a fixed
+time-to-live and, optionally, whose total approximate size is bounded.
+``cached_toolkit`` uses one to hand out a shared toolkit instance per
+``(toolkit class, api_key, configuration)``; the API key only ever appears in
+the cache key as a SHA-256 digest. ``ReadCache`` is the read-through cache
+``SirenAPI`` puts in front of its read-only methods, optionally backed by a
+``SQLiteCache`` on disk that survives restarts and is shared by processes.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Generic,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from pydantic import TypeAdapter
+from siren.models.templates import ChannelTemplate, Template
+
+from .configuration import Configuration
+from .encoding import to_jsonable
+
+V = TypeVar("V")
+T = TypeVar("T")
+
+DEFAULT_TOOLKIT_CACHE_SIZE = 32
+DEFAULT_TOOLKIT_CACHE_TTL = 3600.0
+
+# Returned by lookups that find nothing, so that None can be cached.
+MISSING = object()
+
+
+class TTLCache(Generic[V]):
+    """LRU cache with a per-entry time-to-live.
+
+    ``maxsize`` bounds the number of entries (least recently used are evicted
+    first) and ``ttl`` is the number of seconds an entry stays valid; ``None``
+    disables expiry. ``max_bytes`` additionally bounds the sum of
+    ``sizeof(value)`` over all entries. All methods are safe to call from
+    several threads.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._timer = timer
+        self._sizeof = sizeof or approximate_size
+        self._data: "OrderedDict[Hashable, Tuple[float, int, V]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._building: Dict[Hashable, threading.Lock] = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key, count=False) is not MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for ``key``, or ``default`` if absent or expired."""
+        value = self._lookup(key, count=True)
+        return default if value is MISSING else value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entries if full.
+
+        ``ttl`` shortens the cache's time-to-live for this entry. A value
+        larger than ``max_bytes`` on its own is not stored.
+        """
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        if self.ttl is not None:
+            ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            expires = self._timer() + ttl if ttl is not None else float("inf")
+            self._data[key] = (expires, size, value)
+            self.bytes += size
+            while len(self._data) > self.maxsize or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                _, (_, evicted, _) = self._data.popitem(last=False)
+                self.bytes -= evicted
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value, or ``default`` if absent."""
+        with self._lock:
+            entry = self._remove(key)
+        return default if entry is None else entry[2]
+
+    def evict(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches ``predicate``; returns how many."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit and miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.bytes = self.hits = self.misses = 0
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], V]) -> V:
+        """Return the cached value for ``key``, building it with ``factory`` on a miss.
+
+        Concurrent callers with the same key wait on a lock of that key while
+        ``factory`` runs and share one instance instead of racing to build
+        several; callers with other keys are not held up.
+        """
+        value = self._lookup(key, count=True)
+        if value is not MISSING:
+            return value
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        try:
+            with building:
+                value = self._lookup(key, count=False)
+                if value is MISSING:
+                    value = factory()
+                    self.set(key, value)
+                return value
+        finally:
+            with self._lock:
+                if self._building.get(key) is building:
+                    del self._building[key]
+
+    def _lookup(self, key: Hashable, count: bool) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= self._timer():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[2]
+
+    def _remove(self, key: Hashable) -> Optional[Tuple[float, int, V]]:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+        return entry
+
+    def _expire(self) -> None:
+        now = self._timer()
+        for key in [key for key, (expires, _, _) in self._data.items() if expires <= now]:
+            self._remove(key)
+
+
+def approximate_size(value: Any, _depth: int = 0) -> int:
+    """Roughly estimate the memory held by ``value`` and what it contains, in bytes."""
+    size = sys.getsizeof(value)
+    if _depth > 32:
+        return size
+    if isinstance(value, Mapping):
+        return size + sum(
+            approximate_size(key, _depth + 1) + approximate_size(item, _depth + 1)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(approximate_size(item, _depth + 1) for item in value)
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+    attributes = getattr(value, "__dict__", None)
+    if attributes is not None:
+        return size + approximate_size(attributes, _depth + 1)
+    return size
+
+
+toolkit_cache: TTLCache[Any] = TTLCache(
+    maxsize=DEFAULT_TOOLKIT_CACHE_SIZE, ttl=DEFAULT_TOOLKIT_CACHE_TTL
+)
+
+
+def hash_api_key(api_key: str) -> str:
+    """Return the SHA-256 hex digest used in place of ``api_key`` in cache keys."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def account_id(api_key: str, base_url: str) -> str:
+    """Return the digest identifying the account behind ``api_key`` at ``base_url``."""
+    return hashlib.sha256(f"{hash_api_key(api_key)}:{base_url}".encode("utf-8")).hexdigest()
+
+
+def toolkit_key(
+    cls: type, api_key: str, configuration: Optional[Configuration] = None
+) -> Tuple[str, str, str]:
+    """Return the cache key for a toolkit built from these arguments.
+
+    An API key in the configuration's context is hashed like ``api_key``.
+    """
+    configuration = configuration or {}
+    context = configuration.get("context") or {}
+    if context.get("api_key"):
+        context = {**context, "api_key": hash_api_key(context["api_key"])}
+        configuration = {**configuration, "context": context}  # type: ignore[typeddict-item]
+    return (
+        f"{cls.__module__}.{cls.__qualname__}",
+        hash_api_key(api_key),
+        json.dumps(configuration, sort_keys=True, default=str),
+    )
+
+
+def cached_toolkit(
+    cls: Type[T],
+    api_key: str,
+    configuration: Optional[Configuration] = None,
+    cache: Optional[TTLCache[Any]] = None,
+    **kwargs: Any,
+) -> T:
+    """Return a shared ``cls(api_key, configuration, **kwargs)`` instance.
+
+    Identical ``api_key`` and ``configuration`` (compared by value) return the
+    same toolkit until it is evicted from ``cache``, which defaults to the
+    process-wide ``toolkit_cache``. Extra keyword arguments are part of the key.
+    """
+    cache = toolkit_cache if cache is None else cache
+    key = toolkit_key(cls, api_key, configuration)
+    if kwargs:
+        key += (json.dumps(kwargs, sort_keys=True, default=str),)
+    return cache.get_or_set(key, lambda: cls(api_key, configuration, **kwargs))
+
+
+def cache_stats(cache: Optional[TTLCache[Any]] = None) -> Dict[str, int]:
+    """Return the size and hit/miss counters of ``cache`` (default ``toolkit_cache``)."""
+    cache = toolkit_cache if cache is None else cache
+    return {"size": len(cache), "hits": cache.hits, "misses": cache.misses}
+
+
+DEFAULT_READ_CACHE_TTL = 60.0
+DEFAULT_READ_CACHE_SIZE = 256
+DEFAULT_READ_CACHE_BYTES = 8 * 1024 * 1024
+DEFAULT_DISK_CACHE_BYTES = 64 * 1024 * 1024
+
+# Read-only methods a ReadCache answers, and the read methods each mutating
+# call makes stale. Replies are not cached: a message can be answered at any
+# time, which the webhook-fed ReplyStore tracks instead.
+CACHEABLE_METHODS: FrozenSet[str] = frozenset({"list_templates", "get_channel_templates"})
+INVALIDATED_BY: Dict[str, FrozenSet[str]] = {
+    "create_template": frozenset({"list_templates"}),
+    "update_template": frozenset({"list_templates", "get_channel_templates"}),
+    "delete_template": frozenset({"list_templates", "get_channel_templates"}),
+    "publish_template": frozenset({"list_templates", "get_channel_templates"}),
+    "create_channel_templates": frozenset({"get_channel_templates"}),
+}
+
+# What the SDK returns for each cacheable method, so results read back from a
+# SQLiteCache are validated into the same models again.
+RESULT_TYPES: Dict[str, Any] = {
+    "list_templates": List[Template],
+    "get_channel_templates": List[ChannelTemplate],
+}
+
+# ReadCaches per account (hashed API key and base URL), so that a mutation
+# through one SirenAPI invalidates every cache for that account in the process.
+_accounts: Dict[Tuple[str, str], "weakref.WeakSet[ReadCache]"] = {}
+_accounts_lock = threading.Lock()
+
+
+def normalize_params(params: Mapping[str, Any]) -> str:
+    """Return a canonical string for ``params``; ``None`` values are ignored."""
+    return json.dumps(
+        {key: value for key, value in params.items() if value is not None},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+class SQLiteCache:
+    """Content-addressed cache of read results in a SQLite database.
+
+    An entry's key is the SHA-256 of the account (hashed API key and base
+    URL), the method and its normalized params; its value is stored as JSON
+    once per distinct content under the SHA-256 of that JSON, so equal
+    results of different calls share their bytes. Entries expire after their
+    TTL by the wall clock, and once the stored values exceed ``max_bytes`` the
+    oldest entries are evicted first. The database runs in WAL mode and writes
+    take an immediate transaction, so several processes on one host can share
+    one file; the file is created readable by its owner only. Values come
+    back as plain JSON unless ``get`` is given a ``validate`` callable, and a
+    value it rejects counts as a miss.
+    """
+
+    _shared: Dict[Tuple[str, Optional[int]], "SQLiteCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = DEFAULT_DISK_CACHE_BYTES,
+        timer: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._pid = -1
+        self._db: Optional[sqlite3.Connection] = None
+        with self._lock:
+            self._connection()
+
+    @classmethod
+    def shared(cls, path: str, max_bytes: Optional[int] = DEFAULT_DISK_CACHE_BYTES) -> "SQLiteCache":
+        """Return the process-wide cache for ``path``, so SirenAPIs share one connection."""
+        key = (os.path.abspath(path), max_bytes)
+        with cls._shared_lock:
+            cache = cls._shared.get(key)
+            if cache is None:
+                cache = cls._shared[key] = cls(path, max_bytes)
+            return cache
+
+    @staticmethod
+    def key(account: Tuple[str, str], method: str, params: Mapping[str, Any]) -> str:
+        """Return the content hash an entry is stored under."""
+        return hashlib.sha256(
+            json.dumps([*account, method, normalize_params(params)]).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str, validate: Optional[Callable[[Any], Any]] = None) -> Tuple[Any, float]:
+        """Return the value stored under ``key`` and its remaining TTL, or ``(MISSING, 0)``.
+
+        ``validate`` turns the decoded JSON back into the value that was stored.
+        """
+        now = self._timer()
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT blobs.data, entries.expires FROM entries JOIN blobs USING (digest) "
+                "WHERE entries.key = ? AND entries.expires > ?",
+                (key, now),
+            ).fetchone()
+        try:
+            if row is None:
+                value = MISSING
+            else:
+                value = json.loads(row[0])
+                if validate is not None:
+                    value = validate(value)
+        except Exception:
+            # Corrupt, or written for an incompatible version of a model; fetch it again.
+            value = MISSING
+        with self._lock:
+            if value is MISSING:
+                self.misses += 1
+                return MISSING, 0.0
+            self.hits += 1
+        return value, row[1] - now
+
+    def set(self, key: str, account: Tuple[str, str], method: str, value: Any, ttl: Optional[float]) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds (forever for None)."""
+        try:
+            data = json.dumps(to_jsonable(value), separators=(",", ":")).encode("utf-8")
+        except Exception:
+            return
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+        digest = hashlib.sha256(data).hexdigest()
+        now = self._timer()
+        expires = now + ttl if ttl is not None else float("inf")
+        with self._lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT OR IGNORE INTO blobs (digest, size, data) VALUES (?, ?, ?)",
+                    (digest, len(data), data),
+                )
+                db.execute(
+                    "INSERT OR REPLACE INTO entries (key, account, method, digest, stored, expires) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, _account_id(account), method, digest, now, expires),
+                )
+                db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+                if self.max_bytes is not None:
+                    self._evict(db)
+                self._collect(db)
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def invalidate(self, account: Tuple[str, str], methods: Collection[str]) -> int:
+        """Drop the entries of ``methods`` for ``account``; returns how many."""
+        placeholders = ",".join("?" * len(methods))
+        with self._lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                removed = db.execute(
+                    f"DELETE FROM entries WHERE account = ? AND method IN ({placeholders})",
+                    (_account_id(account), *methods),
+                ).rowcount
+                self._collect(db)
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        return removed
+
+    def clear(self) -> None:
+        """Drop every entry, of every account, and reset the hit and miss counters."""
+        with self._lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("DELETE FROM entries")
+            db.execute("DELETE FROM blobs")
+            db.execute("COMMIT")
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit and miss counters of this process and the entries and bytes on disk."""
+        with self._lock:
+            db = self._connection()
+            size = db.execute("SELECT COUNT(*) FROM entries WHERE expires > ?", (self._timer(),)).fetchone()[0]
+            stored = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "size": size, "bytes": stored}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not be used across fork, so children open their own.
+        if self._db is not None and self._pid == os.getpid():
+            return self._db
+        if not os.path.exists(self.path):
+            os.close(os.open(self.path, os.O_CREAT | os.O_WRONLY, 0o600))
+        db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER NOT NULL, data BLOB NOT NULL)"
+        )
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, account TEXT NOT NULL, "
+            "method TEXT NOT NULL, digest TEXT NOT NULL, stored REAL NOT NULL, expires REAL NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS entries_account_method ON entries (account, method)")
+        db.execute("CREATE INDEX IF NOT EXISTS entries_stored ON entries (stored)")
+        db.execute("CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest)")
+        self._db, self._pid = db, os.getpid()
+        return db
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        # Oldest entries first, until the values they reference fit max_bytes.
+        self._collect(db)
+        stored = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        while stored > self.max_bytes:
+            row = db.execute("SELECT key, digest FROM entries ORDER BY stored LIMIT 1").fetchone()
+            if row is None:
+                break
+            db.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+            if db.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (row[1],)).fetchone() is None:
+                stored -= db.execute("SELECT size FROM blobs WHERE digest = ?", (row[1],)).fetchone()[0]
+                db.execute("DELETE FROM blobs WHERE digest = ?", (row[1],))
+
+    @staticmethod
+    def _collect(db: sqlite3.Connection) -> None:
+        db.execute("DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM entries)")
+
+
+def _account_id(account: Tuple[str, str]) -> str:
+    return "\x00".join(account)
+
+
+@functools.lru_cache(maxsize=None)
+def _validator(method: str) -> Optional[Callable[[Any], Any]]:
+    result_type = RESULT_TYPES.get(method)
+    return None if result_type is None else TypeAdapter(result_type).validate_python
+
+
+class ReadCache:
+    """Read-through cache for ``SirenAPI``'s read-only methods.
+
+    Results are keyed on the method and its normalized params, expire after
+    ``ttl`` seconds and are evicted least recently used first once
+    ``maxsize`` entries or ``max_bytes`` are exceeded. Mutating template
+    calls made through any ``SirenAPI`` of the same account in this process
+    drop the affected entries.
+
+    With a ``store``, results are also written to that ``SQLiteCache`` and
+    misses in memory are looked up there, so a restarted process or another
+    worker on the host starts warm; mutations drop the affected entries from
+    the store too.
+    """
+
+    def __init__(
+        self,
+        account: Tuple[str, str],
+        ttl: Optional[float] = DEFAULT_READ_CACHE_TTL,
+        maxsize: int = DEFAULT_READ_CACHE_SIZE,
+        max_bytes: Optional[int] = DEFAULT_READ_CACHE_BYTES,
+        timer: Callable[[], float] = time.monotonic,
+        store: Optional[SQLiteCache] = None,
+    ):
+        self.account = account
+        self.ttl = ttl
+        self.store = store
+        self.entries: TTLCache[Any] = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer, max_bytes=max_bytes)
+        with _accounts_lock:
+            _accounts.setdefault(account, weakref.WeakSet()).add(self)
+
+    @classmethod
+    def for_api(cls, api_key: str, base_url: str, **kwargs: Any) -> "ReadCache":
+        """Create a cache for the account behind ``api_key`` at ``base_url``."""
+        return cls((hash_api_key(api_key), base_url), **kwargs)
+
+    def get(self, method: str, params: Mapping[str, Any]) -> Any:
+        """Return the cached result, or the ``MISSING`` sentinel on a miss."""
+        key = (method, normalize_params(params))
+        result = self.entries.get(key, MISSING)
+        if result is MISSING and self.store is not None:
+            result, ttl = self.store.get(self.store.key(self.account, method, params), _validator(method))
+            if result is not MISSING:
+                self.entries.set(key, result, ttl)
+        return result
+
+    def set(self, method: str, params: Mapping[str, Any], result: Any) -> None:
+        """Cache ``result`` of ``method`` called with ``params``."""
+        self.entries.set((method, normalize_params(params)), result)
+        if self.store is not None:
+            self.store.set(self.store.key(self.account, method, params), self.account, method, result, self.ttl)
+
+    def invalidate(self, method: str) -> None:
+        """Drop, in every cache of this account, what ``method`` made stale."""
+        stale = INVALIDATED_BY.get(method)
+        if not stale:
+            return
+        with _accounts_lock:
+            peers = list(_accounts.get(self.account, ()))
+        for peer in peers:
+            peer.entries.evict(lambda key: key[0] in stale)
+        for store in {id(peer.store): peer.store for peer in peers if peer.store is not None}.values():
+            store.invalidate(self.account, stale)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hit and miss counters, the entry count and the approximate bytes held.
+
+        With a store, its own counters and totals are under ``"disk"``.
+        """
+        stats: Dict[str, Any] = {
+            "hits": self.entries.hits,
+            "misses": self.entries.misses,
+            "size": len(self.entries),
+            "bytes": self.entries.bytes,
+        }
+        if self.store is not None:
+            stats["disk"] = self.store.stats()
+        return stats
+
@@ -0,0 +1,150 @@
+"""Compaction of tool results before they are handed back to the model.
+
+Listings such as ``list_templates`` carry far more than a model needs to pick
+the next call, and everything returned stays in its context for the rest of
+the conversation. ``Compactor`` shrinks results in three steps:
+
+1. Fields are projected to the ``"result_fields"`` declared for the tool in
+   ``tools.py``; dotted names select fields of nested objects and lists.
+2. Lists longer than ``max_items`` are cut, with a ``"... N more"`` marker
+   in place of the rest.
+3. If the JSON is still longer than ``max_chars`` (or ``max_tokens``, counted
+   as four characters each), lists are cut further, and as a last resort only
+   a preview of the text is returned.
+
+Only the results of tools that declare ``"result_fields"`` are compacted.
+The others, such as the summaries of batch and bulk tools whose message ids
+and errors the model needs for later calls, are returned whole.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from .configuration import Configuration, ResultOptions
+from .encoding import dumps, to_jsonable
+from .pagination import DEFAULT_MAX_RESULTS
+from .tools import tools
+
+DEFAULT_MAX_ITEMS = DEFAULT_MAX_RESULTS
+CHARS_PER_TOKEN = 4
+
+# A projection maps each kept field to the projection of its value, or to
+# None to keep the value whole.
+Projection = Dict[str, Optional["Projection"]]
+
+# Keys of the summaries the list tools return in all_pages mode; their items
+# are projected rather than the summary itself.
+PAGE_SUMMARY_KEYS = frozenset({"count", "truncated", "items"})
+
+
+def compile_projection(fields: Sequence[str]) -> Projection:
+    """Turn dotted field names into a nested ``Projection``."""
+    projection: Projection = {}
+    for field in fields:
+        node = projection
+        *parents, leaf = field.split(".")
+        for name in parents:
+            child = node.get(name)
+            if child is None:
+                child = node[name] = {}
+            node = child
+        node.setdefault(leaf, None)
+    return projection
+
+
+PROJECTIONS: Dict[str, Projection] = {
+    tool["method"]: compile_projection(tool["result_fields"]) for tool in tools if tool.get("result_fields")
+}
+
+
+def project(value: Any, projection: Optional[Projection]) -> Any:
+    """Keep only the fields of ``projection`` in the JSON-like ``value``, list items included."""
+    if projection is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, projection) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {
+        name: project(value[name], child) for name, child in projection.items()
+        if value.get(name) not in (None, "", [], {})
+    }
+
+
+def truncate(value: Any, max_items: int) -> Any:
+    """Cut every list in ``value`` to ``max_items`` items plus a ``"... N more"`` marker."""
+    if isinstance(value, list):
+        items = [truncate(item, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"... {len(value) - max_items} more")
+        return items
+    if isinstance(value, dict):
+        return {key: truncate(item, max_items) for key, item in value.items()}
+    return value
+
+
+class Compactor:
+    """Turns tool results into compact JSON text; see the module docstring.
+
+    ``compact=False`` returns results whole, as ``encoding.encode_result`` does.
+    """
+
+    def __init__(
+        self,
+        compact: bool = True,
+        max_items: Optional[int] = DEFAULT_MAX_ITEMS,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        projections: Optional[Mapping[str, Projection]] = None,
+    ):
+        self.compact = compact
+        self.max_items = max_items
+        budgets = [budget for budget in (max_chars, max_tokens and max_tokens * CHARS_PER_TOKEN) if budget]
+        self.max_chars: Optional[int] = min(budgets) if budgets else None
+        self.projections = PROJECTIONS if projections is None else projections
+
+    @classmethod
+    def from_configuration(cls, configuration: Optional[Configuration] = None) -> "Compactor":
+        """Build the compactor a toolkit's ``configuration["results"]`` asks for."""
+        options: ResultOptions = (configuration or {}).get("results") or {}
+        return cls(
+            compact=options.get("compact", True),
+            max_items=options.get("max_items", DEFAULT_MAX_ITEMS),
+            max_chars=options.get("max_chars"),
+            max_tokens=options.get("max_tokens"),
+        )
+
+    def encode(self, method: str, result: Any) -> str:
+        """Return the compacted JSON text for ``method``'s ``result``; strings pass through."""
+        if isinstance(result, str):
+            return result
+        if not self.compact:
+            return dumps(result)
+        projection = self.projections.get(method)
+        if projection is None:
+            return dumps(result)
+        value = to_jsonable(result)
+        if isinstance(value, dict) and PAGE_SUMMARY_KEYS <= value.keys():
+            value = {**value, "items": project(value["items"], projection)}
+        else:
+            value = project(value, projection)
+        max_items = self.max_items
+        text = dumps(truncate(value, max_items) if max_items is not None else value)
+        if self.max_chars is None:
+            return text
+        while len(text) > self.max_chars and max_items != 1:
+            max_items = max(1, (max_items or _longest_list(value)) // 2)
+            text = dumps(truncate(value, max_items))
+        if len(text) > self.max_chars:
+            text = dumps({"truncated": True, "length": len(text), "preview": text[: self.max_chars // 2]})
+        return text
+
+
+def _longest_list(value: Any) -> int:
+    if isinstance(value, list):
+        return max([len(value), *(_longest_list(item) for item in value)])
+    if isinstance(value, dict):
+        return max([1, *(_longest_list(item) for item in value.values())])
+    return 1
+
+
+default_compactor = Compactor()
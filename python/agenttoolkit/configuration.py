@@ -1,4 +1,5 @@
-from typing import Dict, List, Literal, Optional, TypedDict
+import threading
+from typing import Dict, List, Literal, Optional, Sequence, Tuple, TypedDict
 
 
 Object = Literal[
@@ -25,15 +26,98 @@ class Context(TypedDict, total=False):
     api_key: Optional[str]
     base_url: Optional[str]
     timeout: Optional[int]
+    max_connections: Optional[int]
+    max_keepalive_connections: Optional[int]
+    keepalive_expiry: Optional[float]
+    read_cache: Optional[bool]
+    read_cache_ttl: Optional[float]
+    read_cache_max_entries: Optional[int]
+    read_cache_max_bytes: Optional[int]
+    read_cache_path: Optional[str]
+    read_cache_disk_max_bytes: Optional[int]
+    retry_attempts: Optional[int]
+    retry_backoff: Optional[float]
+    retry_max_backoff: Optional[float]
+    circuit_breaker_threshold: Optional[int]
+    circuit_breaker_reset: Optional[float]
+    dedupe: Optional[bool]
+    dedupe_max_entries: Optional[int]
+    rate_limits: Optional[Dict[str, float]]
+    rate_limit_burst: Optional[Dict[str, float]]
+    rate_limit_max_queue: Optional[int]
+    rate_limit_max_wait: Optional[float]
+    rate_limit_dir: Optional[str]
+
+
+class ResultOptions(TypedDict, total=False):
+    compact: Optional[bool]
+    max_items: Optional[int]
+    max_chars: Optional[int]
+    max_tokens: Optional[int]
 
 
 class Configuration(TypedDict, total=False):
     actions: Optional[Actions]
     context: Optional[Context]
+    results: Optional[ResultOptions]
+
+
+OBJECTS: Tuple[str, ...] = ("messaging", "templates", "users", "workflows", "webhooks")
+PERMISSIONS: Tuple[str, ...] = ("create", "update", "read", "delete", "trigger", "schedule")
+
+# One bit per (object, permission) pair plus one per object that marks it as
+# configured at all. Names outside the Literal types get bits on first sight.
+_bits: Dict[Tuple[str, Optional[str]], int] = {}
+_bits_lock = threading.Lock()
+
+
+def _bit(resource: str, permission: Optional[str] = None) -> int:
+    bit = _bits.get((resource, permission))
+    if bit is None:
+        with _bits_lock:
+            bit = _bits.setdefault((resource, permission), 1 << len(_bits))
+    return bit
+
+
+for _resource in OBJECTS:
+    _bit(_resource)
+    for _permission in PERMISSIONS:
+        _bit(_resource, _permission)
+del _resource, _permission
+
+
+def compile_actions(actions: Optional[Actions]) -> Optional[int]:
+    """Compile an actions config into a mask of granted permissions.
+
+    Returns ``None`` when no actions are configured, meaning everything is allowed.
+    """
+    if not actions:
+        return None
+    mask = 0
+    for resource, permissions in actions.items():
+        mask |= _bit(resource)
+        for permission, granted in (permissions or {}).items():
+            if granted:
+                mask |= _bit(resource, permission)
+    return mask
+
+
+def required_mask(tool: Dict) -> int:
+    """Compile the permissions a tool needs into a mask."""
+    mask = 0
+    for resource, permissions in tool.get("actions", {}).items():
+        mask |= _bit(resource)
+        for permission in permissions:
+            mask |= _bit(resource, permission)
+    return mask
 
 
 def is_tool_allowed(tool: Dict, configuration: Optional[Configuration] = None) -> bool:
-    """Check if a tool is allowed based on configuration permissions."""
+    """Check if a tool is allowed based on configuration permissions.
+
+    Use ``filter_tools`` to filter a whole tools list; it compiles the
+    configuration once instead of walking it for every tool.
+    """
     if not configuration or not configuration.get("actions"):
         return True  # Allow all tools if no configuration is provided
 
@@ -43,4 +127,50 @@ def is_tool_allowed(tool: Dict, configuration: Optional[Configuration] = None) -
         for permission in permissions:
             if not configuration["actions"].get(resource, {}).get(permission, False):
                 return False
-    return True
\ No newline at end of file
+    return True
+
+
+class _CompiledTools:
+    """Required masks for a tools list plus its filtered views, keyed by granted mask."""
+
+    def __init__(self, tools: Sequence[Dict]):
+        self.snapshot = tuple(tools)
+        self.masks = tuple(required_mask(tool) for tool in self.snapshot)
+        self.allowed: Dict[int, Tuple[Dict, ...]] = {}
+
+    def matches(self, tools: Sequence[Dict]) -> bool:
+        return len(tools) == len(self.snapshot) and all(
+            a is b for a, b in zip(tools, self.snapshot)
+        )
+
+    def filter(self, granted: int) -> Tuple[Dict, ...]:
+        allowed = self.allowed.get(granted)
+        if allowed is None:
+            allowed = self.allowed[granted] = tuple(
+                tool for tool, required in zip(self.snapshot, self.masks)
+                if required & granted == required
+            )
+        return allowed
+
+
+_compiled_tools: Dict[int, _CompiledTools] = {}
+_compiled_lock = threading.Lock()
+_MAX_COMPILED_TOOLS = 64
+
+
+def filter_tools(tools: Sequence[Dict], configuration: Optional[Configuration] = None) -> Tuple[Dict, ...]:
+    """Return the tools allowed by ``configuration``, in registry order.
+
+    Tool masks are compiled once per tools list and the result is memoized by
+    the granted mask, so tenants with equivalent actions share one tuple.
+    """
+    granted = compile_actions(configuration.get("actions") if configuration else None)
+    compiled = _compiled_tools.get(id(tools))
+    if compiled is None or not compiled.matches(tools):
+        with _compiled_lock:
+            if len(_compiled_tools) >= _MAX_COMPILED_TOOLS:
+                _compiled_tools.clear()
+            compiled = _compiled_tools[id(tools)] = _CompiledTools(tools)
+    if granted is None:
+        return compiled.snapshot
+    return compiled.filter(granted)
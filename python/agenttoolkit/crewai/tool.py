@@ -1,15 +1,16 @@
-import json
-from typing import Any, Dict, Type
+from typing import Any, Dict, Optional, Type
 from crewai.tools import BaseTool
 from pydantic import BaseModel
 
 from ..api import SirenAPI
+from ..compaction import Compactor, default_compactor
+from ..instrumentation import encode_tool_result, validate_arguments
 
 
 class SirenTool(BaseTool):
     """CrewAI tool wrapper for Siren functionality."""
     
-    def __init__(self, siren_api: SirenAPI, tool_config: Dict[str, Any]):
+    def __init__(self, siren_api: SirenAPI, tool_config: Dict[str, Any], compactor: Optional[Compactor] = None):
         
         super().__init__(
             name=tool_config["method"],
@@ -22,6 +23,7 @@ class SirenTool(BaseTool):
         object.__setattr__(self, "_siren_api", siren_api)
         object.__setattr__(self, "_method", tool_config["method"])
         object.__setattr__(self, "_tool_config", tool_config)
+        object.__setattr__(self, "_compactor", compactor or default_compactor)
 
     def _run(self, **kwargs) -> Any:
         """Execute the tool."""
@@ -31,12 +33,18 @@ class SirenTool(BaseTool):
         tool_config = object.__getattribute__(self, "_tool_config")
         
 
-        validated_params = tool_config["args_schema"](**kwargs) 
-        result = siren_api.run(method, validated_params.model_dump())
-        
+        params = validate_arguments(method, tool_config["args_schema"], kwargs)
+        result = siren_api.run(method, params)
+
+        return encode_tool_result(object.__getattribute__(self, "_compactor"), method, result)
+
+    async def _arun(self, **kwargs) -> Any:
+        """Execute the tool asynchronously."""
+        siren_api = object.__getattribute__(self, "_siren_api")
+        method = object.__getattribute__(self, "_method")
+        tool_config = object.__getattribute__(self, "_tool_config")
 
-        if hasattr(result, '__dict__'):
-            result = result.__dict__
-     
+        params = validate_arguments(method, tool_config["args_schema"], kwargs)
+        result = await siren_api.arun(method, params)
 
-        return json.dumps(result) if not isinstance(result, str) else result
\ No newline at end of file
+        return encode_tool_result(object.__getattribute__(self, "_compactor"), method, result)
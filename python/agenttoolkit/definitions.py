@@ -0,0 +1,130 @@
+"""Tool definitions in the shapes expected by OpenAI, LangChain and MCP.
+
+Pydantic JSON schema generation is comparatively expensive, so every
+``args_schema`` is converted once per process and the resulting definitions
+are cached. They are returned as immutable objects shared by all toolkits;
+``copy.deepcopy`` one to get a plain, mutable dict.
+"""
+
+import functools
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, NoReturn, Tuple, Type
+
+from pydantic import BaseModel
+
+
+class FrozenDict(dict):
+    """A ``dict`` that refuses mutation but still compares and serializes like one."""
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("tool definitions are shared and cannot be modified")
+
+    __setitem__ = __delitem__ = _immutable  # type: ignore[assignment]
+    clear = pop = popitem = setdefault = update = _immutable  # type: ignore[assignment]
+    __ior__ = _immutable  # type: ignore[assignment]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (dict, (_thaw(self),))
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return _thaw(self)
+
+
+class FrozenList(list):
+    """A ``list`` that refuses mutation but still serializes like one."""
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("tool definitions are shared and cannot be modified")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable  # type: ignore[assignment]
+    append = extend = insert = remove = pop = clear = sort = reverse = _immutable  # type: ignore[assignment]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (list, (_thaw(self),))
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return _thaw(self)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _key(tool: Mapping[str, Any]) -> Hashable:
+    return (tool["method"], tool["description"], tool["args_schema"])
+
+
+@functools.lru_cache(maxsize=None)
+def json_schema(args_schema: Type[BaseModel]) -> FrozenDict:
+    """Return the cached JSON schema of ``args_schema``."""
+    return _freeze(args_schema.model_json_schema())
+
+
+@functools.lru_cache(maxsize=None)
+def _openai_definition(method: str, description: str, args_schema: Type[BaseModel]) -> FrozenDict:
+    return _freeze({
+        "type": "function",
+        "function": {
+            "name": method,
+            "description": description,
+            "parameters": json_schema(args_schema),
+        },
+    })
+
+
+@functools.lru_cache(maxsize=None)
+def _langchain_definition(method: str, description: str, args_schema: Type[BaseModel]) -> FrozenDict:
+    return _freeze({
+        "name": method,
+        "description": description,
+        "parameters": json_schema(args_schema),
+    })
+
+
+@functools.lru_cache(maxsize=None)
+def _mcp_definition(method: str, description: str, args_schema: Type[BaseModel]) -> FrozenDict:
+    return _freeze({
+        "name": method,
+        "description": description,
+        "inputSchema": json_schema(args_schema),
+    })
+
+
+def openai_definition(tool: Mapping[str, Any]) -> FrozenDict:
+    """Return the OpenAI function tool definition for a ``tools`` entry."""
+    return _openai_definition(*_key(tool))
+
+
+def langchain_definition(tool: Mapping[str, Any]) -> FrozenDict:
+    """Return the LangChain function definition (name, description, parameters)."""
+    return _langchain_definition(*_key(tool))
+
+
+def mcp_definition(tool: Mapping[str, Any]) -> FrozenDict:
+    """Return the MCP tool definition (name, description, inputSchema)."""
+    return _mcp_definition(*_key(tool))
+
+
+def warm(tools: Iterable[Mapping[str, Any]]) -> None:
+    """Build every definition for ``tools`` up front, e.g. at worker start-up."""
+    for tool in tools:
+        openai_definition(tool)
+        langchain_definition(tool)
+        mcp_definition(tool)
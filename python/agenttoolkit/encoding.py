@@ -0,0 +1,82 @@
+"""JSON encoding of tool results.
+
+The framework adapters hand tool results back to the model as JSON text.
+``encode_result`` produces it in one pass, without copying results into
+intermediate dicts: orjson is used when it is installed (``pip install
+siren-agent-toolkit[fast]``), pydantic-core's encoder otherwise and for
+results that are models or lists of models. Both write
+Pydantic models (such as the Siren SDK's), dataclasses, datetimes, enums and
+UUIDs natively, models by field name; other objects are encoded from their
+attributes, and anything else as its ``str``. The output is compact UTF-8 JSON.
+"""
+
+import importlib.util
+import json
+from typing import Any, Union
+
+# to_json and to_jsonable_python take fallback= since pydantic-core 2.0.1,
+# the version pydantic 2.0, the declared minimum, requires.
+import pydantic_core
+from pydantic import BaseModel
+
+ORJSON_AVAILABLE = importlib.util.find_spec("orjson") is not None
+
+if ORJSON_AVAILABLE:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+    # Fragments embed already encoded JSON, so models are encoded by their own
+    # serializer straight into the output. Older orjson releases lack them.
+    _Fragment = getattr(orjson, "Fragment", None)
+
+
+def _fallback(value: Any) -> Any:
+    attributes = getattr(value, "__dict__", None)
+    if attributes is not None:
+        return attributes
+    return str(value)
+
+
+def _orjson_default(value: Any) -> Any:
+    if _Fragment is not None and isinstance(value, BaseModel):
+        return _Fragment(pydantic_core.to_json(value, by_alias=False, fallback=_fallback))
+    return pydantic_core.to_jsonable_python(value, by_alias=False, fallback=_fallback)
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert ``value`` to the dicts, lists and scalars ``dumps`` would encode it as."""
+    return pydantic_core.to_jsonable_python(value, by_alias=False, fallback=_fallback)
+
+
+def _models(value: Any) -> bool:
+    # Models and listings of models are faster to encode in one pydantic-core
+    # call than through one orjson default() call per model.
+    if isinstance(value, (list, tuple)):
+        return bool(value) and isinstance(value[0], BaseModel)
+    return isinstance(value, BaseModel)
+
+
+def dumpb(value: Any) -> bytes:
+    """Encode ``value`` as compact UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE and not _models(value):
+        return orjson.dumps(value, default=_orjson_default, option=_ORJSON_OPTIONS)
+    return pydantic_core.to_json(value, by_alias=False, fallback=_fallback)
+
+
+def dumps(value: Any) -> str:
+    """Encode ``value`` as a compact JSON string."""
+    return dumpb(value).decode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text, such as the arguments of a model's tool call."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_result(result: Any) -> str:
+    """Return the text a tool hands back to the model: strings as is, anything else as JSON."""
+    if isinstance(result, str):
+        return result
+    return dumps(result)
@@ -0,0 +1,323 @@
+"""Timings, sizes and counters for tool calls.
+
+A tool call goes through three phases: its arguments are validated against
+the tool's schema (``"validate"``), ``SirenAPI`` calls Siren (``"run"``) and
+the result is encoded for the model (``"serialize"``). Once a sink is added
+with ``add_sink``, every phase reports its duration and any error, ``run``
+reports the request size and ``serialize`` the response size, and the
+middleware reports retries, deduplicated calls and rate-limit rejections.
+
+Sinks receive these as they happen: ``InMemorySink`` aggregates them into
+histograms and counters, ``PrometheusSink`` renders those in the Prometheus
+text format, and ``OpenTelemetrySink`` turns phases into spans (``pip install
+siren-agent-toolkit[otel]``). Without sinks, instrumented code only checks
+``instrumentation.sinks`` and takes its uninstrumented path.
+"""
+
+import bisect
+import importlib.util
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
+
+from .encoding import dumpb
+from .validation import validate, validate_json
+
+T = TypeVar("T")
+
+PHASES: Tuple[str, ...] = ("validate", "run", "serialize")
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+DEFAULT_SIZE_BUCKETS: Tuple[float, ...] = (
+    128, 512, 2048, 8192, 32768, 131072, 524288, 2097152,
+)
+
+OTEL_AVAILABLE = importlib.util.find_spec("opentelemetry") is not None
+
+
+class Sink:
+    """Receives instrumentation events; subclasses override what they record."""
+
+    def phase(self, method: str, phase: str, start_ns: int, duration: float, error: Optional[BaseException]) -> None:
+        """A phase of a ``method`` call started at ``start_ns`` (epoch) and took ``duration`` seconds."""
+
+    def size(self, method: str, kind: str, size: int) -> None:
+        """A ``"request"`` or ``"response"`` payload of ``size`` bytes."""
+
+    def count(self, method: str, event: str, value: int = 1) -> None:
+        """An event such as ``"retries"`` or ``"deduplicated"`` happened ``value`` times."""
+
+
+class Instrumentation:
+    """Dispatches events to the registered sinks; see the module docstring."""
+
+    def __init__(self) -> None:
+        self.sinks: Tuple[Sink, ...] = ()
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink: Sink) -> Sink:
+        with self._lock:
+            self.sinks = (*self.sinks, sink)
+        return sink
+
+    def remove_sink(self, sink: Sink) -> None:
+        with self._lock:
+            self.sinks = tuple(s for s in self.sinks if s is not sink)
+
+    def time(self, method: str, phase: str, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Call ``func`` and report its duration as ``phase`` of ``method``."""
+        start_ns = time.time_ns()
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as error:
+            self._phase(method, phase, start_ns, time.perf_counter() - start, error)
+            raise
+        self._phase(method, phase, start_ns, time.perf_counter() - start, None)
+        return result
+
+    async def atime(
+        self, method: str, phase: str, func: Callable[..., Awaitable[T]], /, *args: Any, **kwargs: Any
+    ) -> T:
+        """Async counterpart of ``time``."""
+        start_ns = time.time_ns()
+        start = time.perf_counter()
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException as error:
+            self._phase(method, phase, start_ns, time.perf_counter() - start, error)
+            raise
+        self._phase(method, phase, start_ns, time.perf_counter() - start, None)
+        return result
+
+    def size(self, method: str, kind: str, size: int) -> None:
+        for sink in self.sinks:
+            sink.size(method, kind, size)
+
+    def count(self, method: str, event: str, value: int = 1) -> None:
+        for sink in self.sinks:
+            sink.count(method, event, value)
+
+    def _phase(self, method: str, phase: str, start_ns: int, duration: float, error: Optional[BaseException]) -> None:
+        for sink in self.sinks:
+            sink.phase(method, phase, start_ns, duration, error)
+
+
+instrumentation = Instrumentation()
+add_sink = instrumentation.add_sink
+remove_sink = instrumentation.remove_sink
+
+
+def validate_arguments(method: str, schema: Any, arguments: Union[Mapping[str, Any], str, bytes]) -> Dict[str, Any]:
+    """Validate a tool call's ``arguments``, a mapping or JSON text, against ``schema`` and return them as params."""
+    validator = validate_json if isinstance(arguments, (str, bytes)) else validate
+    if not instrumentation.sinks:
+        return validator(schema, arguments)
+    return instrumentation.time(method, "validate", validator, schema, arguments)
+
+
+def encode_tool_result(compactor: Any, method: str, result: Any) -> str:
+    """Encode ``result`` for the model with ``compactor`` (a ``compaction.Compactor``)."""
+    if not instrumentation.sinks:
+        return compactor.encode(method, result)
+    text = instrumentation.time(method, "serialize", compactor.encode, method, result)
+    instrumentation.size(method, "response", len(text.encode("utf-8")))
+    return text
+
+
+def request_size(params: Dict[str, Any]) -> int:
+    """Size in bytes of ``params`` encoded as JSON."""
+    try:
+        return len(dumpb(params))
+    except Exception:
+        return 0
+
+
+class Histogram:
+    """Cumulative-bucket histogram as Prometheus defines it."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """``(le, count)`` pairs, ending with ``+Inf``."""
+        pairs = []
+        total = 0
+        for bound, count in zip((*map(_format, self.buckets), "+Inf"), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "buckets": dict(self.cumulative())}
+
+
+class InMemorySink(Sink):
+    """Aggregates events into per-method histograms and counters.
+
+    ``latency[(method, phase)]`` and ``sizes[(method, kind)]`` are
+    ``Histogram``s; ``errors[(method, phase, error type)]`` and
+    ``events[(method, event)]`` are counts.
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = DEFAULT_SIZE_BUCKETS,
+    ):
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.sizes: Dict[Tuple[str, str], Histogram] = {}
+        self.errors: Dict[Tuple[str, str, str], int] = {}
+        self.events: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def phase(self, method: str, phase: str, start_ns: int, duration: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            histogram = self.latency.get((method, phase))
+            if histogram is None:
+                histogram = self.latency[(method, phase)] = Histogram(self.latency_buckets)
+            histogram.observe(duration)
+            if error is not None:
+                key = (method, phase, type(error).__name__)
+                self.errors[key] = self.errors.get(key, 0) + 1
+
+    def size(self, method: str, kind: str, size: int) -> None:
+        with self._lock:
+            histogram = self.sizes.get((method, kind))
+            if histogram is None:
+                histogram = self.sizes[(method, kind)] = Histogram(self.size_buckets)
+            histogram.observe(size)
+
+    def count(self, method: str, event: str, value: int = 1) -> None:
+        with self._lock:
+            self.events[(method, event)] = self.events.get((method, event), 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return everything recorded so far as plain, nested dicts."""
+        with self._lock:
+            return {
+                "latency": {f"{m}.{p}": h.to_dict() for (m, p), h in self.latency.items()},
+                "sizes": {f"{m}.{k}": h.to_dict() for (m, k), h in self.sizes.items()},
+                "errors": {f"{m}.{p}.{e}": n for (m, p, e), n in self.errors.items()},
+                "events": {f"{m}.{e}": n for (m, e), n in self.events.items()},
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self.latency.clear()
+            self.sizes.clear()
+            self.errors.clear()
+            self.events.clear()
+
+
+class PrometheusSink(InMemorySink):
+    """``InMemorySink`` that renders its metrics in the Prometheus text exposition format.
+
+    Serve ``render()`` from a ``/metrics`` endpoint, or combine it with the
+    output of an existing client library.
+    """
+
+    def __init__(self, namespace: str = "siren_tool", **kwargs: Any):
+        super().__init__(**kwargs)
+        self.namespace = namespace
+
+    def render(self) -> str:
+        ns = self.namespace
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                f"# HELP {ns}_phase_seconds Duration of each phase of a tool call.",
+                f"# TYPE {ns}_phase_seconds histogram",
+            ]
+            for (method, phase), histogram in sorted(self.latency.items()):
+                lines += _histogram_lines(f"{ns}_phase_seconds", {"method": method, "phase": phase}, histogram)
+            lines += [
+                f"# HELP {ns}_payload_bytes Size of tool call requests and responses.",
+                f"# TYPE {ns}_payload_bytes histogram",
+            ]
+            for (method, kind), histogram in sorted(self.sizes.items()):
+                lines += _histogram_lines(f"{ns}_payload_bytes", {"method": method, "kind": kind}, histogram)
+            lines += [
+                f"# HELP {ns}_errors_total Tool call phases that raised, by error type.",
+                f"# TYPE {ns}_errors_total counter",
+            ]
+            for (method, phase, error), count in sorted(self.errors.items()):
+                lines.append(f"{ns}_errors_total{_labels(method=method, phase=phase, error=error)} {count}")
+            lines += [
+                f"# HELP {ns}_events_total Retries, deduplicated calls and rate-limit rejections.",
+                f"# TYPE {ns}_events_total counter",
+            ]
+            for (method, event), count in sorted(self.events.items()):
+                lines.append(f"{ns}_events_total{_labels(method=method, event=event)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetrySink(Sink):
+    """Reports each phase as an OpenTelemetry span named ``siren.<phase>``.
+
+    Spans are created when a phase ends, with its real start and end times,
+    as children of the span current at that point. Events are added as
+    counters on the ``meter``, when one is given.
+    """
+
+    def __init__(self, tracer: Any = None, meter: Any = None):
+        if not OTEL_AVAILABLE:
+            raise RuntimeError(
+                "OpenTelemetrySink needs opentelemetry-api; install siren-agent-toolkit[otel]"
+            )
+        from opentelemetry import trace
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("agenttoolkit")
+        self._sizes = meter.create_histogram("siren.tool.payload", unit="By") if meter else None
+        self._events = meter.create_counter("siren.tool.events") if meter else None
+
+    def phase(self, method: str, phase: str, start_ns: int, duration: float, error: Optional[BaseException]) -> None:
+        span = self.tracer.start_span(
+            f"siren.{phase}", start_time=start_ns, attributes={"siren.method": method, "siren.phase": phase}
+        )
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(error)))
+        span.end(end_time=start_ns + int(duration * 1e9))
+
+    def size(self, method: str, kind: str, size: int) -> None:
+        if self._sizes is not None:
+            self._sizes.record(size, {"siren.method": method, "siren.kind": kind})
+
+    def count(self, method: str, event: str, value: int = 1) -> None:
+        if self._events is not None:
+            self._events.add(value, {"siren.method": method, "siren.event": event})
+
+
+def _format(bound: float) -> str:
+    return repr(float(bound)) if bound != int(bound) else f"{bound:.1f}"
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _histogram_lines(name: str, labels: Dict[str, str], histogram: Histogram) -> List[str]:
+    lines = [
+        f"{name}_bucket{_labels(**labels, le=bound)} {count}" for bound, count in histogram.cumulative()
+    ]
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
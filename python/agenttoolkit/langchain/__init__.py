@@ -1,6 +1,29 @@
 """LangChain integration for Siren Agent Toolkit."""
 
-from .toolkit import SirenAgentToolkit
-from .tool import SirenTool
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["SirenAgentToolkit", "SirenTool"]
\ No newline at end of file
+if TYPE_CHECKING:
+    from .toolkit import SirenAgentToolkit
+    from .tool import SirenTool
+
+_LAZY_ATTRIBUTES = {
+    "SirenAgentToolkit": ".toolkit",
+    "SirenTool": ".tool",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+__all__ = ["SirenAgentToolkit", "SirenTool"]
@@ -1,9 +1,11 @@
-import json
 from typing import Any, Dict, Optional, Type
 from langchain.tools.base import BaseTool
 from pydantic import BaseModel
 
 from ..api import SirenAPI
+from ..compaction import Compactor, default_compactor
+from ..definitions import langchain_definition
+from ..instrumentation import encode_tool_result, validate_arguments
 
 
 class SirenTool(BaseTool):
@@ -13,11 +15,18 @@ class SirenTool(BaseTool):
     method: str
     args_schema: Type[BaseModel]
     actions: Dict[str, Any]
+    compactor: Compactor = default_compactor
     
     class Config:
         arbitrary_types_allowed = True
 
-    def __init__(self, siren_api: SirenAPI, tool_config: Dict[str, Any], **kwargs):
+    def __init__(
+        self,
+        siren_api: SirenAPI,
+        tool_config: Dict[str, Any],
+        compactor: Optional[Compactor] = None,
+        **kwargs,
+    ):
         super().__init__(
             name=tool_config["method"],
             description=tool_config["description"],
@@ -25,23 +34,34 @@ class SirenTool(BaseTool):
             siren_api=siren_api,
             method=tool_config["method"],
             actions=tool_config["actions"],
+            compactor=compactor or default_compactor,
             **kwargs
         )
 
+    @property
+    def definition(self) -> Dict[str, Any]:
+        """Cached, read-only function definition (name, description, parameters)."""
+        return langchain_definition(
+            {"method": self.method, "description": self.description, "args_schema": self.args_schema}
+        )
+
+    @property
+    def args(self) -> Dict[str, Any]:
+        """Cached JSON schema properties of the tool arguments."""
+        return self.definition["parameters"]["properties"]
+
     def _run(self, **kwargs) -> Any:
         """Execute the tool synchronously."""
+        params = validate_arguments(self.method, self.args_schema, kwargs)
 
-        print("self.args_schema ----->>>", self.args_schema)
-        validated_params = self.args_schema(**kwargs)
-        print("validated_params", validated_params)
-        
+        result = self.siren_api.run(self.method, params)
 
-        result = self.siren_api.run(self.method, validated_params.dict())
-        
-
-        return json.dumps(result) if not isinstance(result, str) else result
+        return encode_tool_result(self.compactor, self.method, result)
 
     async def _arun(self, **kwargs) -> Any:
         """Execute the tool asynchronously."""
-        # Using sync version until Siren API supports async
-        return self._run(**kwargs)
\ No newline at end of file
+        params = validate_arguments(self.method, self.args_schema, kwargs)
+
+        result = await self.siren_api.arun(self.method, params)
+
+        return encode_tool_result(self.compactor, self.method, result)
@@ -2,7 +2,9 @@ from typing import List, Optional
 
 from ..api import SirenAPI
 from ..tools import tools
-from ..configuration import Configuration, is_tool_allowed
+from ..cache import cached_toolkit
+from ..compaction import Compactor
+from ..configuration import Configuration, filter_tools
 from .tool import SirenTool
 
 
@@ -11,17 +13,24 @@ class SirenAgentToolkit:
     
     def __init__(self, api_key: str, configuration: Optional[Configuration] = None):
         self.siren_api = SirenAPI(api_key, configuration.get("context") if configuration else None)
+        self.compactor = Compactor.from_configuration(configuration)
         
-        filtered_tools = [
-            tool for tool in tools 
-            if is_tool_allowed(tool, configuration)
-        ]
+        filtered_tools = filter_tools(tools, configuration)
         
         self._tools = [
-            SirenTool(self.siren_api, tool_config)
+            SirenTool(self.siren_api, tool_config, compactor=self.compactor)
             for tool_config in filtered_tools
         ]
 
+    @classmethod
+    def cached(cls, api_key: str, configuration: Optional[Configuration] = None) -> "SirenAgentToolkit":
+        """Return a shared toolkit for identical arguments instead of building a new one.
+
+        Building the LangChain tools validates every ``BaseTool``; cached instances
+        live in the process-wide ``agenttoolkit.cache.toolkit_cache`` (LRU with a TTL).
+        """
+        return cached_toolkit(cls, api_key, configuration)
+
     def get_tools(self) -> List[SirenTool]:
         """Get the LangChain tools."""
         return self._tools
\ No newline at end of file
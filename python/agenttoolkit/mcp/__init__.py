@@ -0,0 +1,29 @@
+"""MCP server for Siren Agent Toolkit."""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .toolkit import SirenAgentToolkit
+    from .server import main
+
+_LAZY_ATTRIBUTES = {
+    "SirenAgentToolkit": ".toolkit",
+    "main": ".server",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+__all__ = ["SirenAgentToolkit", "main"]
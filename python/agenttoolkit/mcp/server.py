@@ -0,0 +1,86 @@
+"""Command-line entry point of the Siren MCP server.
+
+    python -m agenttoolkit.mcp --tools=all
+    python -m agenttoolkit.mcp --tools=send_message,get_message_status --transport=http --port=8000
+
+The API key is read from ``--api-key`` or the ``SIREN_API_KEY`` environment
+variable. ``--tools`` takes ``all`` or tool methods from ``agenttoolkit.tools``;
+the server exposes every tool the actions of the selected ones allow.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from ..configuration import Configuration, Context
+from ..tools import tools
+from .toolkit import DEFAULT_HTTP_PATH, DEFAULT_MAX_CONCURRENCY, SirenAgentToolkit
+
+TRANSPORTS = ("stdio", "http")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m agenttoolkit.mcp", description="Siren MCP server")
+    parser.add_argument("--tools", required=True, help="comma-separated tool methods, or 'all'")
+    parser.add_argument("--api-key", default=os.environ.get("SIREN_API_KEY"), help="defaults to $SIREN_API_KEY")
+    parser.add_argument("--env", choices=("dev", "prod"), help="Siren environment")
+    parser.add_argument("--base-url", help="Siren API base URL")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="stdio")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP transport host")
+    parser.add_argument("--port", type=int, default=8000, help="HTTP transport port")
+    parser.add_argument("--path", default=DEFAULT_HTTP_PATH, help="HTTP transport path")
+    parser.add_argument("--stateless", action="store_true", help="serve HTTP without sessions")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    args = parser.parse_args(argv)
+
+    args.tools = [tool.strip() for tool in args.tools.split(",") if tool.strip()]
+    methods = {tool["method"] for tool in tools}
+    invalid = [tool for tool in args.tools if tool != "all" and tool not in methods]
+    if invalid or not args.tools:
+        parser.error(
+            f"Invalid tool: {', '.join(invalid) or args.tools}. Accepted tools are: all, {', '.join(sorted(methods))}"
+        )
+    if not args.api_key:
+        parser.error(
+            "Siren API key not provided. Please either pass it as an argument --api-key=$KEY "
+            "or set the SIREN_API_KEY environment variable."
+        )
+    return args
+
+
+def build_configuration(selected: Sequence[str], context: Optional[Context] = None) -> Configuration:
+    """Return the configuration allowing the ``selected`` tool methods (all tools for ``"all"``)."""
+    configuration: Configuration = {"context": context or {}}
+    if "all" in selected:
+        return configuration
+    actions: Dict[str, Dict[str, bool]] = {}
+    for tool in tools:
+        if tool["method"] in selected:
+            for resource, permissions in tool["actions"].items():
+                actions.setdefault(resource, {}).update(permissions)
+    configuration["actions"] = actions  # type: ignore[typeddict-item]
+    return configuration
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    context: Context = {}
+    if args.env:
+        context["env"] = args.env
+    if args.base_url:
+        context["base_url"] = args.base_url
+
+    toolkit = SirenAgentToolkit(
+        args.api_key,
+        build_configuration(args.tools, context),
+        max_concurrency=args.max_concurrency,
+    )
+    # stdout carries the stdio transport, so status goes to stderr.
+    if args.transport == "stdio":
+        print("Siren MCP Server running on stdio", file=sys.stderr)
+        asyncio.run(toolkit.run_stdio())
+    else:
+        print(f"Siren MCP Server running on http://{args.host}:{args.port}{args.path}", file=sys.stderr)
+        asyncio.run(toolkit.run_streamable_http(args.host, args.port, args.path, stateless=args.stateless))
@@ -0,0 +1,114 @@
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import mcp.types as types
+import uvicorn
+from mcp.server.lowlevel import Server
+from mcp.server.stdio import stdio_server
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from .. import __version__
+from ..api import SirenAPI
+from ..tools import tools
+from ..compaction import Compactor
+from ..configuration import Configuration, filter_tools
+from ..definitions import mcp_definition
+from ..instrumentation import encode_tool_result, validate_arguments
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_HTTP_PATH = "/mcp"
+
+
+class SirenAgentToolkit:
+    """Siren Agent Toolkit as an MCP server.
+
+    Tools are generated from ``agenttoolkit.tools``, filtered by the
+    configured actions. The MCP server handles requests concurrently on
+    asyncio; at most ``max_concurrency`` tool calls run against Siren at once,
+    all through one ``SirenAPI`` and the shared connection pool.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        configuration: Optional[Configuration] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        self.siren_api = SirenAPI(api_key, configuration.get("context") if configuration else None)
+        self.compactor = Compactor.from_configuration(configuration)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self._tools = {tool["method"]: tool for tool in filter_tools(tools, configuration)}
+        self._definitions = [types.Tool(**mcp_definition(tool)) for tool in self._tools.values()]
+
+        self.server: Server = Server("Siren", version=__version__)
+        self.server.list_tools()(self._list_tools)
+        # Arguments are validated against the tool's own schema in _call_tool.
+        self.server.call_tool(validate_input=False)(self._call_tool)
+
+    def get_tools(self) -> List[types.Tool]:
+        """Get the MCP tool definitions for all tools."""
+        return list(self._definitions)
+
+    async def _list_tools(self) -> List[types.Tool]:
+        return self._definitions
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        tool = self._tools.get(name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {name}")
+        params = validate_arguments(name, tool["args_schema"], arguments)
+        async with self._semaphore:
+            result = await self.siren_api.arun(name, params)
+        return [types.TextContent(type="text", text=encode_tool_result(self.compactor, name, result))]
+
+    async def run_stdio(self) -> None:
+        """Serve MCP over stdin and stdout until the client disconnects."""
+        async with stdio_server() as (read_stream, write_stream):
+            await self.server.run(read_stream, write_stream, self.server.create_initialization_options())
+
+    def streamable_http_app(
+        self,
+        path: str = DEFAULT_HTTP_PATH,
+        stateless: bool = False,
+        json_response: bool = False,
+    ) -> Starlette:
+        """Return an ASGI app serving MCP over streamable HTTP at ``path``."""
+        session_manager = StreamableHTTPSessionManager(
+            app=self.server,
+            stateless=stateless,
+            json_response=json_response,
+        )
+
+        @contextlib.asynccontextmanager
+        async def lifespan(app: Starlette) -> AsyncIterator[None]:
+            async with session_manager.run():
+                yield
+
+        return Starlette(routes=[Route(path, endpoint=_ASGIEndpoint(session_manager))], lifespan=lifespan)
+
+    async def run_streamable_http(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        path: str = DEFAULT_HTTP_PATH,
+        stateless: bool = False,
+        json_response: bool = False,
+    ) -> None:
+        """Serve MCP over streamable HTTP on ``host:port`` until cancelled."""
+        app = self.streamable_http_app(path, stateless=stateless, json_response=json_response)
+        await uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning")).serve()
+
+
+class _ASGIEndpoint:
+    # Starlette calls plain functions as request handlers; an instance is
+    # mounted as a raw ASGI app, which the session manager needs.
+    def __init__(self, session_manager: StreamableHTTPSessionManager):
+        self.session_manager = session_manager
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self.session_manager.handle_request(scope, receive, send)
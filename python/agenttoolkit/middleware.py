@@ -0,0 +1,515 @@
+"""Middleware wrapped around the handlers ``SirenAPI`` dispatches to.
+
+A middleware receives each method's handler once, when ``SirenAPI`` builds
+its dispatch table, and returns the handler to call instead; ``wrap`` is used
+for ``run`` and ``awrap`` for ``arun``. The first middleware in
+``SirenAPI.middleware`` is the outermost.
+
+``RetryMiddleware`` retries transient failures (429, 5xx and network errors)
+of idempotent methods with exponential backoff and full jitter, honoring
+``Retry-After``. ``CircuitBreakerMiddleware`` fails fast per method while an
+endpoint keeps failing. ``DedupeMiddleware`` sends identical mutating calls
+only once. All are configured from the ``Context``; see ``default_middleware``.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import hashlib
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Collection, Dict, FrozenSet, List, Mapping, Optional, Tuple, Type
+
+import httpx
+import requests
+from pydantic import BaseModel, ValidationError
+from siren.exceptions import SirenSDKError
+
+from .cache import MISSING, TTLCache, account_id, normalize_params
+from .configuration import Context
+from .instrumentation import instrumentation
+
+Handler = Callable[..., Any]
+AsyncHandler = Callable[..., Awaitable[Any]]
+
+DEFAULT_RETRY_ATTEMPTS = 2
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_MAX_BACKOFF = 8.0
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
+DEFAULT_CIRCUIT_BREAKER_RESET = 30.0
+DEFAULT_DEDUPE_MAX_ENTRIES = 1024
+
+RETRYABLE_STATUS_CODES: FrozenSet[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+# Transient failures where Siren did not act on the request, so that resending
+# it cannot repeat its effect.
+UNPROCESSED_STATUS_CODES: FrozenSet[int] = frozenset({425, 429, 503})
+# The sync SDK raises requests' ConnectionError (ConnectTimeout included) when
+# no connection was made; its ReadTimeout is not one, as the call may have run.
+_CONNECT_ERRORS = (
+    ConnectionRefusedError,
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    requests.exceptions.ConnectionError,
+)
+
+# Set by the pooled async transport when a response carries Retry-After, so
+# the retry middleware further up the same call can honor it.
+retry_after: "contextvars.ContextVar[Optional[float]]" = contextvars.ContextVar(
+    "siren_retry_after", default=None
+)
+
+
+class Middleware:
+    """Base class for ``SirenAPI`` middleware; the default passes handlers through."""
+
+    def wrap(self, method: str, handler: Handler) -> Handler:
+        return handler
+
+    def awrap(self, method: str, handler: AsyncHandler) -> AsyncHandler:
+        return handler
+
+
+class CallRejected(SirenSDKError):
+    """Raised by middleware that refuses a call without sending it to Siren."""
+
+
+class CircuitOpenError(CallRejected):
+    """Raised instead of calling Siren while the circuit for a method is open."""
+
+    def __init__(self, method: str, retry_in: float):
+        super().__init__(f"Circuit open for {method}; Siren is failing, retry in {retry_in:.1f}s")
+        self.method = method
+        self.retry_in = retry_in
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether ``error`` is worth retrying: throttling, a 5xx, or a network failure."""
+    if isinstance(error, CallRejected):
+        return False
+    if isinstance(error, SirenSDKError):
+        if error.status_code is not None:
+            return error.status_code in RETRYABLE_STATUS_CODES
+        # Transport failures are wrapped without a status code.
+        return error.original_exception is not None and not isinstance(error.original_exception, ValueError)
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+def is_unprocessed(error: BaseException) -> bool:
+    """Whether ``error`` is transient and Siren certainly did not act on the call.
+
+    Unlike ``is_transient`` this excludes read timeouts and 5xx answers after
+    which Siren may have done the work, so a non-idempotent call can be resent.
+    """
+    if isinstance(error, CallRejected):
+        return False
+    if isinstance(error, SirenSDKError):
+        if error.status_code is not None:
+            return error.status_code in UNPROCESSED_STATUS_CODES
+        error = error.original_exception
+    return isinstance(error, _CONNECT_ERRORS) and not isinstance(error, requests.exceptions.ReadTimeout)
+
+
+def _retry_after_from_response(error: BaseException) -> Optional[float]:
+    raw = getattr(error, "raw_response", None)
+    if not isinstance(raw, dict):
+        return None
+    for source in (raw, raw.get("error") if isinstance(raw.get("error"), dict) else {}):
+        for key in ("retryAfter", "retry_after", "Retry-After"):
+            value = source.get(key)
+            if value is not None:
+                try:
+                    return max(float(value), 0.0)
+                except (TypeError, ValueError):
+                    return None
+    return None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+class RetryMiddleware(Middleware):
+    """Retry transient failures of idempotent methods.
+
+    Up to ``attempts`` retries are made, waiting a random time up to
+    ``backoff * 2 ** n`` (capped at ``max_backoff``) before retry ``n``. A
+    ``Retry-After`` from Siren replaces that wait; a longer one than
+    ``max_backoff`` is not waited for and the error is raised instead. Only
+    ``idempotent`` methods are retried.
+    """
+
+    def __init__(
+        self,
+        idempotent: Collection[str],
+        attempts: int = DEFAULT_RETRY_ATTEMPTS,
+        backoff: float = DEFAULT_RETRY_BACKOFF,
+        max_backoff: float = DEFAULT_RETRY_MAX_BACKOFF,
+        sleep: Callable[[float], None] = time.sleep,
+        asleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.idempotent = frozenset(idempotent)
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._asleep = asleep
+
+    def delay(self, attempt: int, error: BaseException, hint: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait before retry ``attempt`` (from 1), or None to give up."""
+        if attempt > self.attempts or not is_transient(error):
+            return None
+        hint = hint if hint is not None else _retry_after_from_response(error)
+        if hint is not None:
+            return hint if hint <= self.max_backoff else None
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def wrap(self, method: str, handler: Handler) -> Handler:
+        if self.attempts <= 0 or method not in self.idempotent:
+            return handler
+
+        def call(**params: Any) -> Any:
+            attempt = 0
+            while True:
+                try:
+                    return handler(**params)
+                except Exception as error:
+                    attempt += 1
+                    delay = self.delay(attempt, error)
+                    if delay is None:
+                        raise
+                instrumentation.count(method, "retries")
+                self._sleep(delay)
+
+        return call
+
+    def awrap(self, method: str, handler: AsyncHandler) -> AsyncHandler:
+        if self.attempts <= 0 or method not in self.idempotent:
+            return handler
+
+        async def call(**params: Any) -> Any:
+            attempt = 0
+            while True:
+                token = retry_after.set(None)
+                try:
+                    return await handler(**params)
+                except Exception as error:
+                    attempt += 1
+                    delay = self.delay(attempt, error, retry_after.get())
+                    if delay is None:
+                        raise
+                finally:
+                    retry_after.reset(token)
+                instrumentation.count(method, "retries")
+                await self._asleep(delay)
+
+        return call
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one endpoint.
+
+    After ``threshold`` transient failures in a row the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds; then one trial call is let
+    through (half-open), which closes the circuit on success or reopens it.
+    Throttling (429) is left to retries and rate limiting and never counts.
+    """
+
+    def __init__(self, threshold: int, reset_timeout: float, timer: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+        self._timer = timer
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self._timer() - self.opened_at >= self.reset_timeout else "open"
+
+    def before(self, method: str) -> None:
+        """Raise ``CircuitOpenError`` unless a call may go through now."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            waited = self._timer() - self.opened_at
+            if waited < self.reset_timeout or self._trial:
+                raise CircuitOpenError(method, max(self.reset_timeout - waited, 0.0))
+            self._trial = True
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def abandon(self) -> None:
+        """Release a trial call that was cancelled, without judging the endpoint."""
+        with self._lock:
+            self._trial = False
+
+    def failure(self, error: BaseException) -> None:
+        with self._lock:
+            self._trial = False
+            if isinstance(error, CallRejected) or getattr(error, "status_code", None) == 429:
+                # Never reached Siren, or Siren throttled this account: either
+                # way it says nothing about the endpoint.
+                return
+            if not is_transient(error):
+                # Siren answered, just not with a success: the endpoint is up.
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = self._timer()
+
+
+class CircuitBreakerMiddleware(Middleware):
+    """Keeps one ``CircuitBreaker`` per method; see ``CircuitBreaker``."""
+
+    _shared: Dict[Tuple[Any, ...], "CircuitBreakerMiddleware"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_CIRCUIT_BREAKER_THRESHOLD,
+        reset_timeout: float = DEFAULT_CIRCUIT_BREAKER_RESET,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._timer = timer
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, account: str, threshold: int, reset_timeout: float) -> "CircuitBreakerMiddleware":
+        """Return the process-wide breakers for ``account``, so every SirenAPI of it sees one state."""
+        key = (account, threshold, reset_timeout)
+        with cls._shared_lock:
+            middleware = cls._shared.get(key)
+            if middleware is None:
+                middleware = cls._shared[key] = cls(threshold, reset_timeout)
+            return middleware
+
+    def breaker(self, method: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self.breakers.get(method)
+            if breaker is None:
+                breaker = self.breakers[method] = CircuitBreaker(self.threshold, self.reset_timeout, self._timer)
+            return breaker
+
+    def wrap(self, method: str, handler: Handler) -> Handler:
+        breaker = self.breaker(method)
+
+        def call(**params: Any) -> Any:
+            breaker.before(method)
+            try:
+                result = handler(**params)
+            except Exception as error:
+                breaker.failure(error)
+                raise
+            except BaseException:
+                breaker.abandon()
+                raise
+            breaker.success()
+            return result
+
+        return call
+
+    def awrap(self, method: str, handler: AsyncHandler) -> AsyncHandler:
+        breaker = self.breaker(method)
+
+        async def call(**params: Any) -> Any:
+            breaker.before(method)
+            try:
+                result = await handler(**params)
+            except Exception as error:
+                breaker.failure(error)
+                raise
+            except BaseException:
+                # Cancelled, e.g. by wait_for: neither a success nor a failure.
+                breaker.abandon()
+                raise
+            breaker.success()
+            return result
+
+        return call
+
+
+class DedupeMiddleware(Middleware):
+    """Send identical calls of the methods in ``windows`` only once.
+
+    Calls are identified by a SHA-256 hash of the method and its params,
+    validated through the method's ``schemas`` entry when there is one so that
+    omitted defaults and explicit ones hash alike. A call identical to one in
+    flight waits for and shares its outcome (success or error). A call
+    identical to one that succeeded less than ``windows[method]`` seconds ago
+    gets the same result without reaching Siren. At most ``maxsize`` results
+    are remembered per method.
+    """
+
+    def __init__(
+        self,
+        windows: Mapping[str, float],
+        schemas: Optional[Mapping[str, Type[BaseModel]]] = None,
+        maxsize: int = DEFAULT_DEDUPE_MAX_ENTRIES,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.windows = dict(windows)
+        self.schemas = dict(schemas or {})
+        self.results: Dict[str, TTLCache[Any]] = {
+            method: TTLCache(maxsize=maxsize, ttl=window, timer=timer) for method, window in self.windows.items()
+        }
+        self._inflight: Dict[str, "concurrent.futures.Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    def key(self, method: str, params: Mapping[str, Any]) -> str:
+        """Return the content hash identifying a call of ``method`` with ``params``."""
+        schema = self.schemas.get(method)
+        if schema is not None:
+            try:
+                params = schema.model_validate(params).model_dump(mode="json", exclude_none=True)
+            except ValidationError:
+                pass
+        content = f"{method}:{normalize_params(params)}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _claim(self, method: str, key: str) -> Tuple[Any, Optional["concurrent.futures.Future[Any]"], bool]:
+        # Returns the remembered result (or MISSING), the in-flight call's
+        # future and whether this caller has to make the call itself.
+        with self._lock:
+            result = self.results[method].get(key, MISSING)
+            if result is not MISSING:
+                return result, None, False
+            future = self._inflight.get(key)
+            if future is not None:
+                return MISSING, future, False
+            future = self._inflight[key] = concurrent.futures.Future()
+            return MISSING, future, True
+
+    def _settle(
+        self,
+        method: str,
+        key: str,
+        future: "concurrent.futures.Future[Any]",
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        with self._lock:
+            if error is None:
+                self.results[method].set(key, result)
+            del self._inflight[key]
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def wrap(self, method: str, handler: Handler) -> Handler:
+        if method not in self.windows:
+            return handler
+
+        def call(**params: Any) -> Any:
+            key = self.key(method, params)
+            result, future, leader = self._claim(method, key)
+            if not leader:
+                instrumentation.count(method, "deduplicated")
+            if result is not MISSING:
+                return result
+            if not leader:
+                return future.result()
+            try:
+                result = handler(**params)
+            except BaseException as error:
+                self._settle(method, key, future, error=error)
+                raise
+            self._settle(method, key, future, result)
+            return result
+
+        return call
+
+    def awrap(self, method: str, handler: AsyncHandler) -> AsyncHandler:
+        if method not in self.windows:
+            return handler
+
+        async def call(**params: Any) -> Any:
+            key = self.key(method, params)
+            result, future, leader = self._claim(method, key)
+            if not leader:
+                instrumentation.count(method, "deduplicated")
+            if result is not MISSING:
+                return result
+            if not leader:
+                return await asyncio.shield(asyncio.wrap_future(future))
+            try:
+                result = await handler(**params)
+            except BaseException as error:
+                self._settle(method, key, future, error=error)
+                raise
+            self._settle(method, key, future, result)
+            return result
+
+        return call
+
+
+def default_middleware(
+    context: Context,
+    api_key: str,
+    base_url: str,
+    idempotent: Collection[str],
+    dedupe_windows: Optional[Mapping[str, float]] = None,
+    schemas: Optional[Mapping[str, Type[BaseModel]]] = None,
+) -> List[Middleware]:
+    """Build the dedupe, retry and circuit breaker middleware the ``context`` asks for.
+
+    ``dedupe`` (off by default, since it answers an intentional repeat from
+    the remembered result) enables ``DedupeMiddleware`` for the methods in
+    ``dedupe_windows``, bounded by ``dedupe_max_entries``.
+    ``retry_attempts`` (0 disables retries), ``retry_backoff`` and
+    ``retry_max_backoff`` configure ``RetryMiddleware``;
+    ``circuit_breaker_threshold`` (0 disables it) and
+    ``circuit_breaker_reset`` configure the breakers, shared per account
+    (hashed ``api_key`` and ``base_url``).
+    """
+    middleware: List[Middleware] = []
+    if dedupe_windows and context.get("dedupe"):
+        middleware.append(DedupeMiddleware(
+            dedupe_windows,
+            schemas,
+            maxsize=context.get("dedupe_max_entries") or DEFAULT_DEDUPE_MAX_ENTRIES,
+        ))
+    attempts = context.get("retry_attempts")
+    attempts = DEFAULT_RETRY_ATTEMPTS if attempts is None else attempts
+    if attempts > 0:
+        middleware.append(RetryMiddleware(
+            idempotent,
+            attempts=attempts,
+            backoff=context.get("retry_backoff") or DEFAULT_RETRY_BACKOFF,
+            max_backoff=context.get("retry_max_backoff") or DEFAULT_RETRY_MAX_BACKOFF,
+        ))
+    threshold = context.get("circuit_breaker_threshold")
+    threshold = DEFAULT_CIRCUIT_BREAKER_THRESHOLD if threshold is None else threshold
+    if threshold > 0:
+        middleware.append(CircuitBreakerMiddleware.shared(
+            account_id(api_key, base_url),
+            threshold,
+            context.get("circuit_breaker_reset") or DEFAULT_CIRCUIT_BREAKER_RESET,
+        ))
+    return middleware
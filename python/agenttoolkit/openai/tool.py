@@ -1,6 +1,8 @@
-from typing import Any, Dict
+from typing import Any, Dict, Union
 
 from ..api import SirenAPI
+from ..definitions import openai_definition
+from ..instrumentation import validate_arguments
 
 
 class SirenTool:
@@ -13,24 +15,24 @@ class SirenTool:
         self.description = tool_config["description"]
         self.args_schema = tool_config["args_schema"]
         self.actions = tool_config["actions"]
+        self.definition = openai_definition(tool_config)
 
     def get_openai_function_definition(self) -> Dict[str, Any]:
-        """Return the OpenAI function definition for this tool."""
-        return {
-            "type": "function",
-            "function": {
-                "name": self.method,
-                "description": self.description,
-                "parameters": self.args_schema.model_json_schema(),
-            }
-        }
+        """Return the cached, read-only OpenAI function definition for this tool."""
+        return self.definition
+
+    def validate(self, **kwargs) -> Dict[str, Any]:
+        """Validate the given parameters against the tool's schema."""
+        return validate_arguments(self.method, self.args_schema, kwargs)
+
+    def validate_json(self, arguments: Union[str, bytes]) -> Dict[str, Any]:
+        """Validate the JSON arguments of a tool call against the tool's schema."""
+        return validate_arguments(self.method, self.args_schema, arguments)
 
     async def execute(self, **kwargs) -> Any:
         """Execute the tool with the given parameters."""
+        return await self.execute_validated(self.validate(**kwargs))
 
-        validated_params = self.args_schema(**kwargs)
-        
-
-        result = self.siren_api.run(self.method, validated_params.model_dump())
-        
-        return result
\ No newline at end of file
+    async def execute_validated(self, params: Dict[str, Any]) -> Any:
+        """Execute the tool with parameters that were already validated."""
+        return await self.siren_api.arun(self.method, params)
\ No newline at end of file
@@ -1,52 +1,131 @@
-import json
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from ..api import SirenAPI
 from ..tools import tools
-from ..configuration import Configuration, is_tool_allowed
+from ..cache import cached_toolkit
+from ..compaction import Compactor
+from ..encoding import dumps
+from ..instrumentation import encode_tool_result
+from ..configuration import Configuration, filter_tools
 from .tool import SirenTool
 
 
+DEFAULT_MAX_CONCURRENCY = 8
+
+
 class SirenAgentToolkit:
     """Siren Agent Toolkit for OpenAI integration."""
-    
-    def __init__(self, api_key: str, configuration: Optional[Configuration] = None):
+
+    def __init__(
+        self,
+        api_key: str,
+        configuration: Optional[Configuration] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
         self.siren_api = SirenAPI(api_key, configuration.get("context") if configuration else None)
-        
-        filtered_tools = [
-            tool for tool in tools 
-            if is_tool_allowed(tool, configuration)
-        ]
-        
+        self.max_concurrency = max_concurrency
+        self.compactor = Compactor.from_configuration(configuration)
+
+        filtered_tools = filter_tools(tools, configuration)
+
         self._tools = [
             SirenTool(self.siren_api, tool_config)
             for tool_config in filtered_tools
         ]
-        
+
         self._tool_methods = {
             tool.method: tool for tool in self._tools
         }
 
+        self._definitions = [tool.get_openai_function_definition() for tool in self._tools]
+
+    @classmethod
+    def cached(
+        cls,
+        api_key: str,
+        configuration: Optional[Configuration] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> "SirenAgentToolkit":
+        """Return a shared toolkit for identical arguments instead of building a new one.
+
+        Instances live in the process-wide ``agenttoolkit.cache.toolkit_cache``
+        (LRU with a TTL) and are safe to use from several threads and event loops.
+        """
+        return cached_toolkit(cls, api_key, configuration, max_concurrency=max_concurrency)
+
     def get_tools(self) -> List[Dict[str, Any]]:
-        """Get the OpenAI function definitions for all tools."""
-        return [tool.get_openai_function_definition() for tool in self._tools]
+        """Get the OpenAI function definitions for all tools.
+
+        The definitions are cached per process and read-only; the list itself
+        is a fresh copy that callers may extend.
+        """
+        return list(self._definitions)
 
     async def handle_tool_call(self, tool_call) -> Dict[str, Any]:
         """Handle a tool call from OpenAI."""
+        tool, params = self._prepare_tool_call(tool_call)
+        result = await tool.execute_validated(params)
+        return self._tool_message(tool_call, result)
+
+    async def handle_tool_calls(
+        self, tool_calls: Sequence[Any], max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Handle several tool calls from OpenAI concurrently.
+
+        Every call is validated before any of them is executed, then the valid
+        ones run with at most ``max_concurrency`` (defaulting to the toolkit's
+        setting) in flight. Results are returned in the order of ``tool_calls``,
+        ready to be appended to ``messages``. A call that fails validation or
+        execution yields an error message in its slot instead of raising.
+        """
+        prepared: List[Any] = []
+        for tool_call in tool_calls:
+            try:
+                prepared.append(self._prepare_tool_call(tool_call))
+            except Exception as error:
+                prepared.append(error)
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def run(tool_call: Any, prepared_call: Any) -> Dict[str, Any]:
+            if isinstance(prepared_call, Exception):
+                return self._error_message(tool_call, prepared_call)
+            tool, params = prepared_call
+            async with semaphore:
+                try:
+                    result = await tool.execute_validated(params)
+                except Exception as error:
+                    return self._error_message(tool_call, error)
+            try:
+                return self._tool_message(tool_call, result)
+            except Exception as error:
+                # Encoding or compacting the result failed; fail this call alone.
+                return self._error_message(tool_call, error)
+
+        return list(await asyncio.gather(
+            *(run(tool_call, prepared_call) for tool_call, prepared_call in zip(tool_calls, prepared))
+        ))
+
+    def _prepare_tool_call(self, tool_call) -> Tuple[SirenTool, Dict[str, Any]]:
         function_name = tool_call.function.name
-        function_args = json.loads(tool_call.function.arguments)
-        
         if function_name not in self._tool_methods:
             raise ValueError(f"Unknown tool: {function_name}")
-        
+
         tool = self._tool_methods[function_name]
-        result = await tool.execute(**function_args)
-        
-        if not isinstance(result, (str, dict, list)):
-            result = result.__dict__ 
-        
+        return tool, tool.validate_json(tool_call.function.arguments)
+
+    def _tool_message(self, tool_call, result: Any) -> Dict[str, Any]:
         return {
             "tool_call_id": tool_call.id,
             "role": "tool",
-            "content": json.dumps(result) if not isinstance(result, str) else result,
-        }
\ No newline at end of file
+            "content": encode_tool_result(self.compactor, tool_call.function.name, result),
+        }
+
+    @staticmethod
+    def _error_message(tool_call, error: Exception) -> Dict[str, Any]:
+        return {
+            "tool_call_id": tool_call.id,
+            "role": "tool",
+            "content": dumps({"error": str(error)}),
+        }
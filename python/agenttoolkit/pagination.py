@@ -0,0 +1,149 @@
+"""Iteration over paginated list endpoints.
+
+``iter_pages`` and ``aiter_pages`` walk a page-number based endpoint item by
+item and fetch page ``n + 1`` in the background while page ``n`` is being
+consumed. At most two pages are held at a time, however many items the
+workspace has. Iteration stops at the first page shorter than the page size.
+
+``summarize`` consumes such an iterator into the compact, truncated result the
+list tools return in ``all_pages`` mode.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_START_PAGE = 0
+DEFAULT_MAX_RESULTS = 50
+
+# Fields kept per item in summaries.
+SUMMARY_FIELDS: Dict[str, Sequence[str]] = {
+    "list_templates": ("id", "name", "tags"),
+    "list_users": ("unique_id", "first_name", "last_name", "email", "phone"),
+}
+
+
+def iter_pages(
+    fetch: Callable[[int], Optional[List[Any]]],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start_page: int = DEFAULT_START_PAGE,
+    prefetch: bool = True,
+) -> Iterator[Any]:
+    """Yield every item of the pages ``fetch(start_page)``, ``fetch(start_page + 1)``, ...
+
+    With ``prefetch`` the next page is requested on a worker thread as soon as
+    the current one arrives.
+    """
+    if not prefetch:
+        page = start_page
+        while True:
+            items = fetch(page) or []
+            yield from items
+            if len(items) < page_size:
+                return
+            page += 1
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="siren-prefetch") as executor:
+        page = start_page
+        pending = executor.submit(fetch, page)
+        try:
+            while True:
+                items = pending.result() or []
+                if len(items) < page_size:
+                    yield from items
+                    return
+                page += 1
+                pending = executor.submit(fetch, page)
+                yield from items
+        finally:
+            pending.cancel()
+
+
+async def aiter_pages(
+    fetch: Callable[[int], Awaitable[Optional[List[Any]]]],
+    page_size: int = DEFAULT_PAGE_SIZE,
+    start_page: int = DEFAULT_START_PAGE,
+    prefetch: bool = True,
+) -> AsyncIterator[Any]:
+    """Async counterpart of ``iter_pages``; the next page is prefetched as a task."""
+    page = start_page
+    pending = asyncio.ensure_future(fetch(page))
+    try:
+        while True:
+            items = await pending or []
+            if len(items) < page_size:
+                for item in items:
+                    yield item
+                return
+            page += 1
+            if prefetch:
+                pending = asyncio.ensure_future(fetch(page))
+            for item in items:
+                yield item
+            if not prefetch:
+                pending = asyncio.ensure_future(fetch(page))
+    finally:
+        pending.cancel()
+
+
+def summarize_item(method: str, item: Any) -> Dict[str, Any]:
+    """Keep only the ``SUMMARY_FIELDS`` of ``item`` that are set."""
+    values = item if isinstance(item, dict) else getattr(item, "__dict__", {})
+    return {
+        field: values[field] for field in SUMMARY_FIELDS.get(method, values)
+        if values.get(field) not in (None, "", [], {})
+    }
+
+
+class Summary:
+    """Accumulates the first ``max_results`` items of a listing across pages."""
+
+    def __init__(self, method: str, max_results: Optional[int] = None):
+        self.method = method
+        self.max_results = DEFAULT_MAX_RESULTS if max_results is None else max_results
+        self.items: List[Dict[str, Any]] = []
+        self.truncated = False
+
+    def add(self, item: Any) -> bool:
+        """Add ``item``; returns False once the summary is full and iteration can stop."""
+        if len(self.items) >= self.max_results:
+            self.truncated = True
+            return False
+        self.items.append(summarize_item(self.method, item))
+        return True
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "count": len(self.items),
+            "truncated": self.truncated,
+            "items": self.items,
+        }
+
+
+def summarize(method: str, items: Iterator[Any], max_results: Optional[int] = None) -> Dict[str, Any]:
+    """Collect a truncated summary of ``items``, reading no further than needed."""
+    summary = Summary(method, max_results)
+    try:
+        for item in items:
+            if not summary.add(item):
+                break
+    finally:
+        close = getattr(items, "close", None)
+        if close is not None:
+            close()
+    return summary.result()
+
+
+async def asummarize(method: str, items: AsyncIterator[Any], max_results: Optional[int] = None) -> Dict[str, Any]:
+    """Async counterpart of ``summarize``."""
+    summary = Summary(method, max_results)
+    try:
+        async for item in items:
+            if not summary.add(item):
+                break
+    finally:
+        aclose = getattr(items, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return summary.result()
@@ -0,0 +1,116 @@
+"""Process-wide HTTP connection pools shared by SirenAPI instances."""
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from .configuration import Context
+from .middleware import parse_retry_after, retry_after
+
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+PoolKey = Tuple[str, str]
+
+
+class PooledTransport:
+    """Drop-in replacement for the SDK's ``AsyncTransport`` backed by a shared client.
+
+    The underlying ``httpx.AsyncClient`` is owned by the pool, so ``aclose``
+    leaves it open for the other ``SirenAPI`` instances borrowing it.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, timeout: Optional[float] = None):
+        self._client = client
+        self._timeout = timeout if timeout is not None else DEFAULT_TIMEOUT
+
+    async def request(
+        self,
+        *,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """Make a request on the shared keep-alive connections."""
+        response = await self._client.request(
+            method=method,
+            url=url,
+            headers=headers,
+            json=json,
+            params=params,
+            timeout=self._timeout,
+        )
+        if response.status_code in (429, 503) and "Retry-After" in response.headers:
+            retry_after.set(parse_retry_after(response.headers["Retry-After"]))
+        return response
+
+    async def aclose(self) -> None:
+        """No-op: pooled connections outlive the borrowing client."""
+
+
+class ConnectionPool:
+    """Registry of ``httpx.AsyncClient`` instances keyed by ``(env, base_url)``.
+
+    Clients are tracked per event loop because asyncio connections cannot be
+    shared between loops. Pool limits are taken from the context of the first
+    ``SirenAPI`` that borrows a given key.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[PoolKey, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self, env: str, base_url: str, context: Optional[Context] = None) -> httpx.AsyncClient:
+        """Return the shared client for ``(env, base_url)`` on the running loop."""
+        loop = asyncio.get_running_loop()
+        key = (env, base_url)
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(key)
+            if client is None or client.is_closed:
+                client = clients[key] = _create_client(context or {})
+            return client
+
+    async def aclose(self) -> None:
+        """Close every client created on the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.pop(loop, {})
+        for client in clients.values():
+            await client.aclose()
+
+
+def _create_client(context: Context) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=context.get("max_connections") or DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections=(
+            context.get("max_keepalive_connections") or DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        keepalive_expiry=context.get("keepalive_expiry") or DEFAULT_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=context.get("timeout") or DEFAULT_TIMEOUT,
+        http2=HTTP2_AVAILABLE,
+    )
+
+
+pool = ConnectionPool()
+
+
+async def close_pool() -> None:
+    """Close the shared connections on the running loop, e.g. at app shutdown."""
+    await pool.aclose()
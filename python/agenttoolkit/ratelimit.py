@@ -0,0 +1,262 @@
+"""Client-side rate limiting of Siren calls.
+
+``RateLimitMiddleware`` keeps one token bucket per ``Object`` category
+(messaging, templates, users, workflows, webhooks) and makes each call take a
+token before it reaches Siren. Callers that find the bucket empty queue for
+their turn instead of failing; once ``max_queue`` callers are already waiting,
+or the wait would exceed ``max_wait``, ``RateLimitExceeded`` is raised.
+
+Buckets are shared by every ``SirenAPI`` of the same account in the process.
+With a ``directory`` they are also shared between processes on the host: the
+bucket state lives in a small file updated under an exclusive ``flock``.
+"""
+
+import asyncio
+import json
+import math
+import os
+import struct
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from .cache import account_id
+from .configuration import OBJECTS, Context
+from .instrumentation import instrumentation
+from .middleware import AsyncHandler, CallRejected, Handler, Middleware
+from .tools import tools
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_RATE_LIMIT_MAX_QUEUE = 100
+DEFAULT_RATE_LIMIT_MAX_WAIT = 30.0
+
+# The category whose bucket each method draws from. Batch tools such as
+# send_messages_batch are not limited themselves; each call they fan out to is.
+METHOD_CATEGORIES: Dict[str, str] = {
+    tool["method"]: next(iter(tool["actions"])) for tool in tools
+    if not tool.get("fans_out_to")
+}
+METHOD_CATEGORIES.update({
+    "create_channel_templates": "templates",
+    "get_channel_templates": "templates",
+    "trigger_workflow_bulk": "workflows",
+})
+
+
+class RateLimitExceeded(CallRejected):
+    """Raised instead of queueing when too many calls are already waiting for a category."""
+
+    def __init__(self, category: str, reason: str):
+        super().__init__(f"Rate limit for {category} exceeded: {reason}")
+        self.category = category
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    ``reserve`` takes a token even when none is left, letting the count go
+    negative; the negative part is the queue of callers waiting for a refill,
+    and the returned delay is how long the caller has to wait for its token.
+    """
+
+    def __init__(self, rate: float, capacity: float, timer: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._timer = timer
+        self._tokens = self.capacity
+        self._updated = timer()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_queue: int, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take a token and return the seconds to wait for it, or None if refused.
+
+        A token is refused when ``max_queue`` callers are already waiting or
+        the wait would exceed ``max_wait``.
+        """
+
+        def take(tokens: float) -> Tuple[float, Optional[float]]:
+            if tokens >= 1:
+                return tokens - 1, 0.0
+            wait = (1 - tokens) / self.rate
+            if 1 - tokens > max_queue or (max_wait is not None and wait > max_wait):
+                return tokens, None
+            return tokens - 1, wait
+
+        return self._update(take)
+
+    def refund(self) -> None:
+        """Give back a reserved token whose caller stopped waiting."""
+        self._update(lambda tokens: (min(tokens + 1, self.capacity), None))
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers currently queued for a token."""
+        return self._update(lambda tokens: (tokens, max(math.ceil(-tokens), 0)))
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.capacity, tokens + max(now - updated, 0.0) * self.rate)
+
+    def _update(self, change: Callable[[float], Tuple[float, Any]]) -> Any:
+        with self._lock:
+            now = self._timer()
+            self._tokens, result = change(self._refill(self._tokens, self._updated, now))
+            self._updated = now
+            return result
+
+
+class FileTokenBucket(TokenBucket):
+    """``TokenBucket`` whose state is kept in ``path`` so that processes on one host share it.
+
+    Every operation opens the file and holds an exclusive ``flock`` for the
+    few microseconds it takes to read and rewrite the state. Wall-clock time
+    is used since monotonic clocks are not comparable between processes.
+    """
+
+    _STATE = struct.Struct("<dd")
+
+    def __init__(self, path: str, rate: float, capacity: float, timer: Callable[[], float] = time.time):
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket needs fcntl, which is not available on this platform")
+        super().__init__(rate, capacity, timer)
+        self.path = path
+
+    def _update(self, change: Callable[[float], Tuple[float, Any]]) -> Any:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, self._STATE.size, 0)
+            now = self._timer()
+            if len(data) == self._STATE.size:
+                tokens, updated = self._STATE.unpack(data)
+            else:
+                tokens, updated = self.capacity, now
+            tokens, result = change(self._refill(tokens, updated, now))
+            os.pwrite(fd, self._STATE.pack(tokens, now), 0)
+            return result
+        finally:
+            os.close(fd)  # also releases the flock
+
+
+class RateLimitMiddleware(Middleware):
+    """Make every call take a token from the bucket of its method's category.
+
+    ``limits`` maps categories (see ``configuration.OBJECTS``) to calls per
+    second; ``burst`` is how many calls may go out at once after a quiet
+    period and defaults to one second's worth. Methods of categories without
+    a limit pass through. With ``directory``, buckets are ``FileTokenBucket``
+    files in it named after ``account``, shared by every process using them.
+    """
+
+    _shared: Dict[Tuple[Any, ...], "RateLimitMiddleware"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        limits: Mapping[str, float],
+        burst: Optional[Mapping[str, float]] = None,
+        max_queue: int = DEFAULT_RATE_LIMIT_MAX_QUEUE,
+        max_wait: Optional[float] = DEFAULT_RATE_LIMIT_MAX_WAIT,
+        directory: Optional[str] = None,
+        account: str = "default",
+        sleep: Callable[[float], None] = time.sleep,
+        asleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        unknown = set(limits) - set(OBJECTS)
+        if unknown:
+            raise ValueError(f"Unknown rate limit categories: {', '.join(sorted(unknown))}")
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._sleep = sleep
+        self._asleep = asleep
+        self.buckets: Dict[str, TokenBucket] = {}
+        for category, rate in limits.items():
+            capacity = (burst or {}).get(category) or max(rate, 1.0)
+            if directory is None:
+                self.buckets[category] = TokenBucket(rate, capacity)
+            else:
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f"siren-{account[:16]}-{category}.bucket")
+                self.buckets[category] = FileTokenBucket(path, rate, capacity)
+
+    @classmethod
+    def shared(cls, account: str, limits: Mapping[str, float], **kwargs: Any) -> "RateLimitMiddleware":
+        """Return the process-wide limiter for ``account``, so every SirenAPI draws from one set of buckets."""
+        key = (account, json.dumps([limits, kwargs], sort_keys=True, default=str))
+        with cls._shared_lock:
+            middleware = cls._shared.get(key)
+            if middleware is None:
+                middleware = cls._shared[key] = cls(limits, account=account, **kwargs)
+            return middleware
+
+    def bucket(self, method: str) -> Optional[TokenBucket]:
+        return self.buckets.get(METHOD_CATEGORIES.get(method, ""))
+
+    def acquire(self, method: str) -> float:
+        """Take a token for ``method``; returns the seconds to wait before calling Siren."""
+        bucket = self.bucket(method)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve(self.max_queue, self.max_wait)
+        if wait:
+            instrumentation.count(method, "rate_limit_waits")
+        if wait is None:
+            instrumentation.count(method, "rate_limited")
+            category = METHOD_CATEGORIES[method]
+            raise RateLimitExceeded(category, f"{bucket.waiting} calls already queued")
+        return wait
+
+    def wrap(self, method: str, handler: Handler) -> Handler:
+        if self.bucket(method) is None:
+            return handler
+
+        def call(**params: Any) -> Any:
+            wait = self.acquire(method)
+            if wait:
+                self._sleep(wait)
+            return handler(**params)
+
+        return call
+
+    def awrap(self, method: str, handler: AsyncHandler) -> AsyncHandler:
+        bucket = self.bucket(method)
+        if bucket is None:
+            return handler
+
+        async def call(**params: Any) -> Any:
+            wait = self.acquire(method)
+            if wait:
+                try:
+                    await self._asleep(wait)
+                except asyncio.CancelledError:
+                    bucket.refund()
+                    raise
+            return await handler(**params)
+
+        return call
+
+
+def rate_limit_middleware(context: Context, api_key: str, base_url: str) -> Optional[RateLimitMiddleware]:
+    """Build the shared ``RateLimitMiddleware`` the ``context`` asks for, if any.
+
+    ``rate_limits`` maps categories to calls per second, ``rate_limit_burst``
+    to burst sizes; ``rate_limit_max_queue``, ``rate_limit_max_wait`` and
+    ``rate_limit_dir`` (for buckets shared across processes) tune it.
+    """
+    limits = context.get("rate_limits")
+    if not limits:
+        return None
+    max_queue = context.get("rate_limit_max_queue")
+    return RateLimitMiddleware.shared(
+        account_id(api_key, base_url),
+        limits,
+        burst=context.get("rate_limit_burst"),
+        max_queue=DEFAULT_RATE_LIMIT_MAX_QUEUE if max_queue is None else max_queue,
+        max_wait=context.get("rate_limit_max_wait", DEFAULT_RATE_LIMIT_MAX_WAIT),
+        directory=context.get("rate_limit_dir"),
+    )
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Any, Dict, List, Literal, Optional
 
 
@@ -14,12 +14,30 @@ class SendMessage(BaseModel):
     provider_code: Optional[str] = Field(None, description="Provider code (must be provided with provider_name)")
 
 
+class BatchRecipient(BaseModel):
+    recipient_value: str = Field(description="The identifier for the recipient (e.g., Slack user ID, email address)")
+    channel: Optional[str] = Field(None, description="Channel for this recipient; defaults to the batch channel")
+    template_variables: Optional[Dict[str, Any]] = Field(None, description="Template variables for this recipient, merged over the batch template_variables")
+
+
+class SendMessagesBatch(BaseModel):
+    recipients: List[BatchRecipient] = Field(description="The recipients to send the message to")
+    channel: Optional[str] = Field(None, description="Default channel for recipients without their own (e.g., 'SLACK', 'EMAIL')")
+    body: Optional[str] = Field(None, description="Message body text (required if no template)")
+    subject: Optional[str] = Field(None, description="Message subject text (required if no template)")
+    template_name: Optional[str] = Field(None, description="Template name (required if no body)")
+    template_variables: Optional[Dict[str, Any]] = Field(None, description="Template variables shared by all recipients")
+    provider_name: Optional[str] = Field(None, description="Provider name (must be provided with provider_code)")
+    provider_code: Optional[str] = Field(None, description="Provider code (must be provided with provider_name)")
+
+
 class GetMessageStatus(BaseModel):
     message_id: str = Field(description="The ID of the message for which to retrieve the status")
 
 
 class GetMessageReplies(BaseModel):
     message_id: str = Field(description="The ID of the message for which to retrieve replies")
+    wait_seconds: Optional[float] = Field(None, ge=0, le=60, description="If there are no replies yet, wait up to this many seconds (at most 60) for the first one")
 
 
 class ListTemplates(BaseModel):
@@ -28,6 +46,8 @@ class ListTemplates(BaseModel):
     sort: Optional[str] = Field(None, description="Sort by field")
     page: Optional[int] = Field(None, description="Page number")
     size: Optional[int] = Field(None, description="Page size")
+    all_pages: Optional[bool] = Field(None, description="Search every page and return a truncated summary (id, name, tags) of the matching templates instead of one page")
+    max_results: Optional[int] = Field(None, description="Maximum number of templates in the all_pages summary (default 50)")
 
 
 class CreateTemplate(BaseModel):
@@ -87,6 +107,31 @@ class DeleteUser(BaseModel):
     unique_id: str = Field(description="Unique identifier for the user to delete")
 
 
+class BulkUserUpdate(UpdateUser):
+    model_config = ConfigDict(populate_by_name=True)
+
+    unique_id: str = Field(description="Unique identifier of the user to update")
+    id: Optional[str] = Field(None, description="Siren's id of the user")
+
+
+# The records of the bulk tools are validated one by one while the tool runs,
+# so that invalid ones are reported without failing the valid ones.
+class AddUsersBulk(BaseModel):
+    users: List[Dict[str, Any]] = Field(
+        description="The users to create, or update if their unique_id exists; each takes the fields of add_user"
+    )
+
+
+class UpdateUsersBulk(BaseModel):
+    users: List[Dict[str, Any]] = Field(
+        description="The updates, each with the unique_id of the user to update and the fields of update_user"
+    )
+
+
+class DeleteUsersBulk(BaseModel):
+    unique_ids: List[str] = Field(description="Unique identifiers of the users to delete")
+
+
 class GetUser(BaseModel):
     unique_id: str = Field(description="Unique identifier for the user to retrieve")
 
@@ -95,6 +140,8 @@ class ListUsers(BaseModel):
     page: Optional[int] = Field(None, description="Page number")
     size: Optional[int] = Field(None, description="Page size")
     search: Optional[str] = Field(None, description="Search term")
+    all_pages: Optional[bool] = Field(None, description="Search every page and return a truncated summary (unique_id, name, email, phone) of the matching users instead of one page")
+    max_results: Optional[int] = Field(None, description="Maximum number of users in the all_pages summary (default 50)")
 
 
 class TriggerWorkflow(BaseModel):
@@ -2,6 +2,7 @@ from typing import Dict, List
 
 from .schema import (
     SendMessage,
+    SendMessagesBatch,
     GetMessageStatus,
     GetMessageReplies,
     ListTemplates,
@@ -12,6 +13,9 @@ from .schema import (
     AddUser,
     UpdateUser,
     DeleteUser,
+    AddUsersBulk,
+    UpdateUsersBulk,
+    DeleteUsersBulk,
     GetUser,
     ListUsers,
     TriggerWorkflow,
@@ -21,12 +25,36 @@ from .schema import (
     ConfigureInboundWebhooks,
 )
 
+# Tool entries may set "idempotent": True when repeating the call has no
+# further effect (reads, updates, deletes); only those are retried by SirenAPI.
+# Calls that do have an effect may set "dedupe_window" to a number of seconds:
+# with "dedupe" enabled in the context, SirenAPI then sends identical calls
+# only once, whether they overlap or the repeat comes within that many seconds
+# of the first call succeeding.
+# "result_fields" lists the fields of a result (or of each listed item) that
+# the toolkits hand back to the model; dotted names select nested fields.
+# "fans_out_to" names the method a batch tool calls once per item; those
+# calls are what retries and rate limits apply to.
 tools: List[Dict] = [
     {
         "method": "send_message",
         "name": "Send Message",
         "description": "Send a message either using a template or directly to a recipient via a chosen channel",
         "args_schema": SendMessage,
+        "dedupe_window": 60,
+        "actions": {
+            "messaging": {
+                "create": True,
+            }
+        },
+    },
+    {
+        "method": "send_messages_batch",
+        "name": "Send Messages Batch",
+        "description": "Send the same message to several recipients at once, optionally with per-recipient channels or template variables, and get back a summary of sent and failed messages",
+        "args_schema": SendMessagesBatch,
+        "dedupe_window": 60,
+        "fans_out_to": "send_message",
         "actions": {
             "messaging": {
                 "create": True,
@@ -38,6 +66,7 @@ tools: List[Dict] = [
         "name": "Get Message Status", 
         "description": "Retrieve the status of a specific message (e.g., 'DELIVERED', 'PENDING', 'FAILED')",
         "args_schema": GetMessageStatus,
+        "idempotent": True,
         "actions": {
             "messaging": {
                 "read": True,
@@ -49,6 +78,8 @@ tools: List[Dict] = [
         "name": "Get Message Replies",
         "description": "Retrieve replies for a specific message",
         "args_schema": GetMessageReplies,
+        "idempotent": True,
+        "result_fields": ("text", "user", "ts", "thread_ts"),
         "actions": {
             "messaging": {
                 "read": True,
@@ -61,6 +92,17 @@ tools: List[Dict] = [
         "name": "List Templates",
         "description": "Retrieve a list of notification templates with optional filtering, sorting, and pagination",
         "args_schema": ListTemplates,
+        "idempotent": True,
+        "result_fields": (
+            "id",
+            "name",
+            "tags",
+            "variables.name",
+            "draft_version.id",
+            "draft_version.status",
+            "published_version.id",
+            "published_version.status",
+        ),
         "actions": {
             "templates": {
                 "read": True,
@@ -72,6 +114,7 @@ tools: List[Dict] = [
         "name": "Create Template",
         "description": "Create a new notification template",
         "args_schema": CreateTemplate,
+        "dedupe_window": 60,
         "actions": {
             "templates": {
                 "create": True,
@@ -83,6 +126,7 @@ tools: List[Dict] = [
         "name": "Update Template",
         "description": "Update an existing notification template",
         "args_schema": UpdateTemplate,
+        "idempotent": True,
         "actions": {
             "templates": {
                 "update": True,
@@ -94,6 +138,7 @@ tools: List[Dict] = [
         "name": "Delete Template",
         "description": "Delete an existing notification template",
         "args_schema": DeleteTemplate,
+        "idempotent": True,
         "actions": {
             "templates": {
                 "delete": True,
@@ -105,6 +150,7 @@ tools: List[Dict] = [
         "name": "Publish Template",
         "description": "Publish a template, making its latest draft version live",
         "args_schema": PublishTemplate,
+        "idempotent": True,
         "actions": {
             "templates": {
                 "update": True,
@@ -117,6 +163,7 @@ tools: List[Dict] = [
         "name": "Add User",
         "description": "Create a new user or update existing user with given unique_id",
         "args_schema": AddUser,
+        "dedupe_window": 60,
         "actions": {
             "users": {
                 "create": True,
@@ -128,6 +175,7 @@ tools: List[Dict] = [
         "name": "Update User",
         "description": "Update an existing user's information",
         "args_schema": UpdateUser,
+        "idempotent": True,
         "actions": {
             "users": {
                 "update": True,
@@ -139,6 +187,44 @@ tools: List[Dict] = [
         "name": "Delete User",
         "description": "Delete an existing user",
         "args_schema": DeleteUser,
+        "idempotent": True,
+        "actions": {
+            "users": {
+                "delete": True,
+            }
+        },
+    },
+    {
+        "method": "add_users_bulk",
+        "name": "Add Users Bulk",
+        "description": "Create or update many users at once and get back a summary of succeeded and failed users",
+        "args_schema": AddUsersBulk,
+        "dedupe_window": 60,
+        "fans_out_to": "add_user",
+        "actions": {
+            "users": {
+                "create": True,
+            }
+        },
+    },
+    {
+        "method": "update_users_bulk",
+        "name": "Update Users Bulk",
+        "description": "Update many existing users at once and get back a summary of succeeded and failed users",
+        "args_schema": UpdateUsersBulk,
+        "fans_out_to": "update_user",
+        "actions": {
+            "users": {
+                "update": True,
+            }
+        },
+    },
+    {
+        "method": "delete_users_bulk",
+        "name": "Delete Users Bulk",
+        "description": "Delete many users at once and get back a summary of succeeded and failed deletions",
+        "args_schema": DeleteUsersBulk,
+        "fans_out_to": "delete_user",
         "actions": {
             "users": {
                 "delete": True,
@@ -150,6 +236,7 @@ tools: List[Dict] = [
         "name": "Get User",
         "description": "Retrieve a specific user by unique_id",
         "args_schema": GetUser,
+        "idempotent": True,
         "actions": {
             "users": {
                 "read": True,
@@ -161,6 +248,8 @@ tools: List[Dict] = [
         "name": "List Users",
         "description": "Retrieve a list of users with optional pagination and search",
         "args_schema": ListUsers,
+        "idempotent": True,
+        "result_fields": ("id", "unique_id", "first_name", "last_name", "email", "phone", "active_channels"),
         "actions": {
             "users": {
                 "read": True,
@@ -173,6 +262,7 @@ tools: List[Dict] = [
         "name": "Trigger Workflow",
         "description": "Trigger a workflow with given data and notification payloads",
         "args_schema": TriggerWorkflow,
+        "dedupe_window": 60,
         "actions": {
             "workflows": {
                 "trigger": True,
@@ -180,10 +270,12 @@ tools: List[Dict] = [
         },
     },
     {
-        "method": "trigger_workflow_bulk",
+        "method": "trigger_workflow_bulk_chunked",
         "name": "Trigger Workflow Bulk",
-        "description": "Trigger a workflow in bulk for multiple recipients",
+        "description": "Trigger a workflow in bulk for multiple recipients and get back a summary of succeeded and failed chunks",
         "args_schema": TriggerWorkflowBulk,
+        "dedupe_window": 60,
+        "fans_out_to": "trigger_workflow_bulk",
         "actions": {
             "workflows": {
                 "trigger": True,
@@ -195,6 +287,7 @@ tools: List[Dict] = [
         "name": "Schedule Workflow",
         "description": "Schedule a workflow to run at a future time (once or recurring)",
         "args_schema": ScheduleWorkflow,
+        "dedupe_window": 60,
         "actions": {
             "workflows": {
                 "schedule": True,
@@ -207,6 +300,7 @@ tools: List[Dict] = [
         "name": "Configure Notification Webhooks",
         "description": "Configure webhook URL for receiving status updates",
         "args_schema": ConfigureNotificationWebhooks,
+        "idempotent": True,
         "actions": {
             "webhooks": {
                 "create": True,
@@ -218,6 +312,7 @@ tools: List[Dict] = [
         "name": "Configure Inbound Webhooks",
         "description": "Configure webhook URL for receiving inbound messages",
         "args_schema": ConfigureInboundWebhooks,
+        "idempotent": True,
         "actions": {
             "webhooks": {
                 "create": True,
@@ -0,0 +1,57 @@
+"""Validation of tool call arguments against the tools' schemas.
+
+``validate`` turns a tool call's arguments into the params ``SirenAPI`` takes:
+keyword arguments by field name (aliased fields such as ``customData`` come
+out as ``custom_data``), with fields left at ``None`` omitted so the SDK's own
+defaults apply. ``validate_json`` does the same for the raw JSON text of an
+OpenAI tool call; pydantic-core parses it straight into the schema without an
+intermediate dict. ``validate_many`` validates a batch of records in one
+pydantic-core call. The ``TypeAdapter`` of each schema is built once and reused.
+"""
+
+import functools
+from typing import Any, Dict, List, Mapping, Sequence, Type, Union
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+@functools.lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    """Return the cached ``TypeAdapter`` for ``schema``, a model or a type such as ``List[model]``."""
+    return TypeAdapter(schema)
+
+
+def validate(schema: Type[BaseModel], arguments: Mapping[str, Any]) -> Dict[str, Any]:
+    """Validate ``arguments`` against ``schema`` and return them as ``SirenAPI`` params."""
+    adapter = type_adapter(schema)
+    return adapter.dump_python(adapter.validate_python(arguments), exclude_none=True)
+
+
+def validate_json(schema: Type[BaseModel], arguments: Union[str, bytes]) -> Dict[str, Any]:
+    """Validate the JSON text ``arguments`` against ``schema`` and return them as ``SirenAPI`` params.
+
+    Empty text, which some models send for tools without arguments, counts as ``{}``.
+    """
+    adapter = type_adapter(schema)
+    return adapter.dump_python(adapter.validate_json(arguments or "{}"), exclude_none=True)
+
+
+def validate_many(
+    schema: Type[BaseModel], records: Sequence[Mapping[str, Any]]
+) -> List[Union[Dict[str, Any], ValidationError]]:
+    """Validate ``records`` against ``schema`` as one list; returns params or the error of each record.
+
+    Only a batch with invalid records falls back to validating them one by one.
+    """
+    adapter = type_adapter(List[schema])  # type: ignore[valid-type]
+    try:
+        return adapter.dump_python(adapter.validate_python(records), exclude_none=True)
+    except ValidationError:
+        pass
+    results: List[Union[Dict[str, Any], ValidationError]] = []
+    for record in records:
+        try:
+            results.append(validate(schema, record))
+        except ValidationError as error:
+            results.append(error)
+    return results
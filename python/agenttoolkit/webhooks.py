@@ -0,0 +1,594 @@
+"""Local receiver for Siren webhooks and the indexes it feeds.
+
+Instead of polling ``get_message_status``, point the notification webhook
+(``configure_notification_webhooks``) at a ``WebhookReceiver``. The receiver
+is a small stdlib HTTP server running on a background thread. It records
+every status callback in a bounded ``StatusIndex``; ``SirenAPI`` answers
+``get_message_status`` from that index once it is attached with
+``SirenAPI.use_status_index``, and ``wait_for_status`` waits on it without
+any HTTP traffic::
+
+    receiver = WebhookReceiver(port=8080).start()
+    api.use_status_index(receiver.statuses)
+    api.run("configure_notification_webhooks", {"url": "https://example.com/siren/status"})
+    status = await api.wait_for_status(message_id, {"DELIVERED", "FAILED"}, timeout=60)
+
+Inbound messages (``configure_inbound_webhooks``) posted to ``/inbound`` are
+appended to a ``ReplyStore`` in the same way, which backs
+``get_message_replies`` and ``wait_for_reply`` once attached with
+``SirenAPI.use_reply_store``.
+"""
+
+import asyncio
+import hmac
+import ipaddress
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Collection, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATUS_INDEX_SIZE = 10_000
+# Seconds after which SirenAPI asks the API again for a message's status, in
+# case the notification webhook missed a change.
+DEFAULT_STATUS_MAX_AGE = 300.0
+DEFAULT_REPLY_STORE_SIZE = 10_000
+# Seconds after which SirenAPI fetches a message's replies from the API again,
+# in case the inbound webhook missed one.
+DEFAULT_REPLY_MAX_AGE = 300.0
+STATUS_PATH = "/status"
+INBOUND_PATH = "/inbound"
+
+# Keys a status callback may carry its message id and status under, in the
+# order they are tried; nested "message"/"data" objects are searched too.
+MESSAGE_ID_KEYS = ("message_id", "messageId", "notification_id", "notificationId", "id")
+STATUS_KEYS = ("status", "delivery_status", "deliveryStatus", "state")
+# Keys an inbound callback may reference the message it answers under.
+REPLY_TO_KEYS = (
+    "reply_to_message_id",
+    "replyToMessageId",
+    "original_message_id",
+    "originalMessageId",
+    "message_id",
+    "messageId",
+)
+
+# Keys an inbound callback may carry each field of a reply under, in the
+# order they are tried; replies are stored in the shape of the SDK's ReplyData.
+REPLY_FIELD_KEYS: Dict[str, Tuple[str, ...]] = {
+    "text": ("text", "body", "content"),
+    "thread_ts": ("thread_ts", "threadTs"),
+    "user": ("user", "user_id", "userId", "sender", "from"),
+    "ts": ("ts", "timestamp"),
+}
+
+Waiter = Tuple[asyncio.AbstractEventLoop, "asyncio.Future[str]", Collection[str]]
+
+
+def _find(payload: Mapping[str, Any], keys: Tuple[str, ...]) -> Optional[Any]:
+    for key in keys:
+        value = payload.get(key)
+        if value not in (None, ""):
+            return value
+    for nested in ("message", "data", "payload"):
+        inner = payload.get(nested)
+        if isinstance(inner, Mapping):
+            value = _find(inner, keys)
+            if value is not None:
+                return value
+    return None
+
+
+def _events(payload: Any) -> List[Mapping[str, Any]]:
+    if isinstance(payload, Mapping):
+        for key in ("events", "data"):
+            if isinstance(payload.get(key), list):
+                payload = payload[key]
+                break
+        else:
+            payload = [payload]
+    if not isinstance(payload, list):
+        return []
+    return [event for event in payload if isinstance(event, Mapping)]
+
+
+def parse_status_events(payload: Any) -> Iterator[Tuple[str, str]]:
+    """Yield ``(message_id, STATUS)`` for every status event in a callback body.
+
+    Accepts a single event object, a list of them, or an object wrapping a list
+    under ``events``/``data``; events without both fields are skipped.
+    """
+    for event in _events(payload):
+        message_id = _find(event, MESSAGE_ID_KEYS)
+        status = _find(event, STATUS_KEYS)
+        if message_id is not None and status is not None:
+            yield str(message_id), str(status).upper()
+
+
+class StatusIndex:
+    """Bounded, thread-safe index of the latest known status per message.
+
+    Holds at most ``maxsize`` messages, dropping the least recently updated.
+    Statuses can be recorded from any thread (the webhook receiver's, or a
+    worker falling back to the API) and awaited from any event loop.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_STATUS_INDEX_SIZE, timer: Callable[[], float] = time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._timer = timer
+        self._statuses: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._waiters: Dict[str, List[Waiter]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._statuses)
+
+    def record(self, message_id: str, status: str) -> None:
+        """Store the latest ``status`` of ``message_id`` and wake its waiters."""
+        status = str(status).upper()
+        with self._lock:
+            self._statuses[message_id] = (status, self._timer())
+            self._statuses.move_to_end(message_id)
+            while len(self._statuses) > self.maxsize:
+                self._statuses.popitem(last=False)
+            waiters = self._waiters.get(message_id)
+            if waiters:
+                ready = [waiter for waiter in waiters if status in waiter[2]]
+                waiters[:] = [waiter for waiter in waiters if status not in waiter[2]]
+                if not waiters:
+                    del self._waiters[message_id]
+            else:
+                ready = []
+        for loop, future, _ in ready:
+            loop.call_soon_threadsafe(_resolve, future, status)
+
+    def get(self, message_id: str, max_age: Optional[float] = None) -> Optional[str]:
+        """Return the known status, or None if unknown or older than ``max_age`` seconds."""
+        entry = self._statuses.get(message_id)
+        if entry is None:
+            return None
+        status, received = entry
+        if max_age is not None and self._timer() - received > max_age:
+            return None
+        return status
+
+    async def wait(self, message_id: str, states: Collection[str], timeout: Optional[float] = None) -> str:
+        """Wait until ``message_id`` is recorded in one of ``states`` and return that status.
+
+        Raises ``asyncio.TimeoutError`` after ``timeout`` seconds.
+        """
+        states = frozenset(state.upper() for state in states)
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[str]" = loop.create_future()
+        waiter = (loop, future, states)
+        with self._lock:
+            entry = self._statuses.get(message_id)
+            if entry is not None and entry[0] in states:
+                return entry[0]
+            self._waiters.setdefault(message_id, []).append(waiter)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(message_id)
+                if waiters and waiter in waiters:
+                    waiters.remove(waiter)
+                    if not waiters:
+                        del self._waiters[message_id]
+
+    def ingest(self, payload: Any) -> int:
+        """Record every status event in a webhook body; returns how many were found."""
+        count = 0
+        for message_id, status in parse_status_events(payload):
+            self.record(message_id, status)
+            count += 1
+        return count
+
+
+def _resolve(future: "asyncio.Future[Any]", result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def parse_reply_events(payload: Any) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(message_id, reply)`` for every inbound event in a callback body.
+
+    ``reply`` is the event itself, converted by ``reply_to_dict`` when it is
+    stored; events that do not reference a message are skipped.
+    """
+    for event in _events(payload):
+        message_id = _find(event, REPLY_TO_KEYS)
+        if message_id is not None:
+            yield str(message_id), dict(event)
+
+
+def _same_reply(first: Mapping[str, Any], second: Mapping[str, Any]) -> bool:
+    # The webhook and the API may disagree on whether a reply has a ts.
+    return (first["user"], first["text"]) == (second["user"], second["text"]) and (
+        first["ts"] == second["ts"] or first["ts"] is None or second["ts"] is None
+    )
+
+
+def reply_to_dict(reply: Any) -> Dict[str, Any]:
+    """Convert an SDK reply model, a dict or an inbound webhook event to the dict of a ``ReplyData``.
+
+    The result always has ``text``, ``thread_ts``, ``user`` and ``ts``, so
+    replies from the webhook and from the API look alike.
+    """
+    if not isinstance(reply, Mapping):
+        model_dump = getattr(reply, "model_dump", None)
+        reply = model_dump(mode="json", by_alias=False) if model_dump is not None else vars(reply)
+    row = {}
+    for field, keys in REPLY_FIELD_KEYS.items():
+        value = _find(reply, keys)
+        row[field] = None if value is None else str(value)
+    return row
+
+
+class ReplyStore:
+    """Bounded, append-only store of the replies to each message.
+
+    Replies are kept in memory, or in a SQLite database at ``path`` so that
+    they survive restarts and can be shared by processes on one host. At most
+    ``maxsize`` messages are kept, dropping the least recently updated. A
+    message is *known* once a reply for it was appended or its replies were
+    seeded from the API; ``replies`` returns None for unknown messages, and
+    for messages not seeded within ``max_age`` seconds, so callers can fall
+    back to the API. Waiters can block on a thread or await on any event loop.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        maxsize: int = DEFAULT_REPLY_STORE_SIZE,
+        timer: Callable[[], float] = time.time,
+    ):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.path = path
+        self.maxsize = maxsize
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._appended = threading.Condition(self._lock)
+        # message_id -> [time seeded from the API (None if never), replies]
+        self._memory: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]]] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS replies ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, message_id TEXT NOT NULL, "
+                "received_at REAL NOT NULL, reply TEXT NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS replies_message_id ON replies (message_id, seq)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS known_messages "
+                "(message_id TEXT PRIMARY KEY, synced_at REAL, updated_at REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(known_messages)")}
+            if "synced_at" not in columns:
+                self._db.execute("ALTER TABLE known_messages ADD COLUMN synced_at REAL")
+            if "updated_at" not in columns:
+                self._db.execute("ALTER TABLE known_messages ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+            self._db.execute("CREATE INDEX IF NOT EXISTS known_messages_updated ON known_messages (updated_at)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db is None:
+                return len(self._memory)
+            return self._db.execute("SELECT COUNT(*) FROM known_messages").fetchone()[0]
+
+    def append(self, message_id: str, reply: Any) -> None:
+        """Append ``reply`` to the replies of ``message_id`` and wake its waiters."""
+        self.extend(message_id, [reply])
+
+    def extend(self, message_id: str, replies: List[Any]) -> None:
+        """Append several replies at once; an empty list just marks the message as known."""
+        rows = [reply_to_dict(reply) for reply in replies]
+        with self._lock:
+            if self._db is not None:
+                self._write(self._db, message_id, rows, replace=False, synced_at=None)
+            else:
+                entry = self._memory.setdefault(message_id, [None, []])
+                entry[1].extend(rows)
+                self._memory.move_to_end(message_id)
+                self._evict()
+            self._wake(message_id, bool(rows))
+
+    def seed(self, message_id: str, replies: List[Any]) -> List[Dict[str, Any]]:
+        """Record the replies fetched from the API for ``message_id`` and return them.
+
+        The message counts as synced from now on. Replies appended by the
+        webhook that the API did not return are kept after the API's own.
+        """
+        rows = [reply_to_dict(reply) for reply in replies]
+        with self._lock:
+            current = self._replies(message_id) or []
+            merged = rows + [row for row in current if not any(_same_reply(row, seen) for seen in rows)]
+            now = self._timer()
+            if self._db is not None:
+                self._write(self._db, message_id, merged, replace=True, synced_at=now)
+            else:
+                self._memory[message_id] = [now, merged]
+                self._memory.move_to_end(message_id)
+                self._evict()
+            self._wake(message_id, len(merged) > len(current))
+        return list(merged)
+
+    def replies(self, message_id: str, max_age: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """Return the replies to ``message_id`` in arrival order.
+
+        Returns None if the message is unknown or, with ``max_age``, was not
+        seeded from the API within the last ``max_age`` seconds.
+        """
+        with self._lock:
+            if max_age is not None:
+                synced_at = self._synced_at(message_id)
+                if synced_at is None or self._timer() - synced_at > max_age:
+                    return None
+            return self._replies(message_id)
+
+    def _synced_at(self, message_id: str) -> Optional[float]:
+        if self._db is None:
+            entry = self._memory.get(message_id)
+            return None if entry is None else entry[0]
+        row = self._db.execute("SELECT synced_at FROM known_messages WHERE message_id = ?", (message_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def _replies(self, message_id: str) -> Optional[List[Dict[str, Any]]]:
+        if self._db is None:
+            entry = self._memory.get(message_id)
+            return None if entry is None else list(entry[1])
+        if self._db.execute("SELECT 1 FROM known_messages WHERE message_id = ?", (message_id,)).fetchone() is None:
+            return None
+        rows = self._db.execute(
+            "SELECT reply FROM replies WHERE message_id = ? ORDER BY seq", (message_id,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _write(
+        self,
+        db: sqlite3.Connection,
+        message_id: str,
+        rows: List[Dict[str, Any]],
+        replace: bool,
+        synced_at: Optional[float],
+    ) -> None:
+        now = self._timer()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if replace:
+                db.execute("DELETE FROM replies WHERE message_id = ?", (message_id,))
+            db.execute(
+                "INSERT INTO known_messages (message_id, synced_at, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (message_id) DO UPDATE SET updated_at = excluded.updated_at, "
+                "synced_at = COALESCE(excluded.synced_at, known_messages.synced_at)",
+                (message_id, synced_at, now),
+            )
+            db.executemany(
+                "INSERT INTO replies (message_id, received_at, reply) VALUES (?, ?, ?)",
+                [(message_id, now, json.dumps(row, default=str)) for row in rows],
+            )
+            excess = db.execute("SELECT COUNT(*) FROM known_messages").fetchone()[0] - self.maxsize
+            if excess > 0:
+                evicted = [
+                    row[0] for row in db.execute(
+                        "SELECT message_id FROM known_messages ORDER BY updated_at LIMIT ?", (excess,)
+                    )
+                ]
+                db.executemany("DELETE FROM replies WHERE message_id = ?", [(m,) for m in evicted])
+                db.executemany("DELETE FROM known_messages WHERE message_id = ?", [(m,) for m in evicted])
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _evict(self) -> None:
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _wake(self, message_id: str, appended: bool) -> None:
+        # Called with the lock held.
+        if not appended:
+            return
+        waiters = self._waiters.pop(message_id, [])
+        self._appended.notify_all()
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future, None)
+
+    def wait_blocking(self, message_id: str, after: int = 0, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Block until ``message_id`` has more than ``after`` replies; return the new ones.
+
+        Returns an empty list if none arrive within ``timeout`` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._appended:
+            while True:
+                replies = self._replies(message_id) or []
+                if len(replies) > after:
+                    return replies[after:]
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return []
+                # Other processes may append to a shared database, so wake up
+                # now and then even without a local notification.
+                self._appended.wait(remaining if self._db is None else min(remaining or 1.0, 1.0))
+
+    async def wait(self, message_id: str, after: int = 0, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Async counterpart of ``wait_blocking``."""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            future: "asyncio.Future[None]" = loop.create_future()
+            with self._lock:
+                replies = self._replies(message_id) or []
+                if len(replies) > after:
+                    return replies[after:]
+                self._waiters.setdefault(message_id, []).append((loop, future))
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return []
+            if self._db is not None:
+                remaining = min(remaining or 1.0, 1.0)
+            try:
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._lock:
+                    waiters = self._waiters.get(message_id)
+                    if waiters and (loop, future) in waiters:
+                        waiters.remove((loop, future))
+                        if not waiters:
+                            del self._waiters[message_id]
+
+    def ingest(self, payload: Any) -> int:
+        """Append every inbound reply in a webhook body; returns how many were found."""
+        count = 0
+        for message_id, reply in parse_reply_events(payload):
+            self.append(message_id, reply)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class WebhookReceiver:
+    """Minimal HTTP server that feeds Siren webhook callbacks into local indexes.
+
+    ``POST /status`` bodies go to ``statuses`` and ``POST /inbound`` bodies to
+    ``replies``; further paths can be attached
+    with ``route``. When ``token`` is set, requests must carry it as a
+    ``token`` query parameter or a ``Bearer`` authorization header, so that it
+    can be part of the URL configured in Siren. A ``token`` is required unless
+    ``host`` is a loopback address.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        statuses: Optional[StatusIndex] = None,
+        token: Optional[str] = None,
+        replies: Optional[ReplyStore] = None,
+    ):
+        if token is None and not _is_loopback(host):
+            raise ValueError(f"WebhookReceiver on {host!r} needs a token; only loopback hosts may go without")
+        self.statuses = statuses if statuses is not None else StatusIndex()
+        self.replies = replies if replies is not None else ReplyStore()
+        self.token = token
+        self._routes: Dict[str, Callable[[Any], Any]] = {
+            STATUS_PATH: self.statuses.ingest,
+            INBOUND_PATH: self.replies.ingest,
+        }
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, path: str, ingest: Callable[[Any], Any]) -> None:
+        """Send JSON bodies posted to ``path`` to ``ingest``."""
+        self._routes[path] = ingest
+
+    def start(self) -> "WebhookReceiver":
+        """Serve on a daemon thread; returns ``self`` for chaining."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                kwargs={"poll_interval": 0.1},
+                name="siren-webhooks",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "WebhookReceiver":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _authorized(self, query: str, authorization: Optional[str]) -> bool:
+        if self.token is None:
+            return True
+        candidates = parse_qs(query).get("token", [])
+        if authorization and authorization.startswith("Bearer "):
+            candidates.append(authorization[len("Bearer "):])
+        return any(hmac.compare_digest(candidate, self.token) for candidate in candidates)
+
+    def _dispatch(self, path: str, body: bytes) -> HTTPStatus:
+        ingest = self._routes.get(path)
+        if ingest is None:
+            return HTTPStatus.NOT_FOUND
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST
+        try:
+            ingest(payload)
+        except Exception:
+            logger.exception("Failed to ingest Siren webhook posted to %s", path)
+            return HTTPStatus.INTERNAL_SERVER_ERROR
+        return HTTPStatus.NO_CONTENT
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _make_handler(receiver: WebhookReceiver) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            url = urlsplit(self.path)
+            if not receiver._authorized(url.query, self.headers.get("Authorization")):
+                status = HTTPStatus.UNAUTHORIZED
+            else:
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The body cannot be delimited, so the connection cannot be reused.
+                    self.close_connection = True
+                    status = HTTPStatus.BAD_REQUEST
+                else:
+                    status = receiver._dispatch(url.path, self.rfile.read(length))
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    return Handler
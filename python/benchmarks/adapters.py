@@ -0,0 +1,48 @@
+"""Uniform driver over the OpenAI, LangChain and CrewAI toolkits for the benchmarks."""
+
+import asyncio
+import importlib
+import json
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+
+import pytest
+
+ADAPTERS = ("openai", "langchain", "crewai")
+
+
+def toolkit_class(adapter: str) -> Any:
+    """Import an adapter's ``SirenAgentToolkit``, skipping the benchmark if its framework is missing."""
+    try:
+        return importlib.import_module(f"agenttoolkit.{adapter}").SirenAgentToolkit
+    except ImportError as error:
+        pytest.skip(f"{adapter} is not installed: {error}")
+
+
+def tool_call(method: str, arguments: Dict[str, Any], call_id: str = "call-1") -> Any:
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=method, arguments=json.dumps(arguments)))
+
+
+def async_caller(adapter: str, toolkit: Any, method: str) -> Callable[[Dict[str, Any]], Awaitable[Any]]:
+    """Return a coroutine function running one tool call the way the framework would."""
+    if adapter == "openai":
+        return lambda arguments: toolkit.handle_tool_call(tool_call(method, arguments))
+    tool = next(tool for tool in toolkit.get_tools() if tool.name == method)
+    if adapter == "langchain":
+        return tool.ainvoke
+    return lambda arguments: tool._arun(**arguments)
+
+
+def sync_caller(adapter: str, toolkit: Any, method: str, loop: asyncio.AbstractEventLoop) -> Callable[[Dict[str, Any]], Any]:
+    """Return a function running one tool call synchronously (on ``loop`` for OpenAI, which is async only)."""
+    if adapter == "openai":
+        call = async_caller(adapter, toolkit, method)
+        return lambda arguments: loop.run_until_complete(call(arguments))
+    tool = next(tool for tool in toolkit.get_tools() if tool.name == method)
+    if adapter == "langchain":
+        return tool.invoke
+    return lambda arguments: tool._run(**arguments)
+
+
+async def run_concurrently(call: Callable[[Dict[str, Any]], Awaitable[Any]], arguments: List[Dict[str, Any]]) -> List[Any]:
+    return await asyncio.gather(*(call(item) for item in arguments))
@@ -0,0 +1,90 @@
+"""Microbenchmark: encoding tool results into the text handed back to the model.
+
+Compares the previous adapter path (``result.__dict__`` then ``json.dumps``)
+with ``agenttoolkit.encoding.encode_result``, with orjson and with the
+pydantic-core fallback, on results shaped like large template and user
+listings made of Siren SDK models.
+
+    python benchmarks/bench_encoding.py
+"""
+
+import json
+import timeit
+
+from siren.models.messaging import ReplyData
+from siren.models.templates import Template
+from siren.models.user import User
+
+from agenttoolkit import encoding
+
+
+def legacy_encode(result):
+    """The adapters' encoding before agenttoolkit.encoding; fails on nested models."""
+    if not isinstance(result, (str, dict, list)):
+        result = result.__dict__
+    return json.dumps(result) if not isinstance(result, str) else result
+
+
+def legacy_encode_models(result):
+    """The closest working legacy path for lists of models: a __dict__ copy per item."""
+    return json.dumps([item.__dict__ for item in result], default=lambda value: value.__dict__)
+
+
+def _template(index):
+    return Template.model_validate({
+        "id": f"tpl-{index}",
+        "name": f"template-{index}",
+        "variables": [{"name": "first_name", "defaultValue": "there"}],
+        "tags": ["onboarding", "email"],
+        "draftVersion": {"id": f"ver-{index}", "version": 1, "status": "DRAFT"},
+        "templateVersions": [],
+    })
+
+
+def _user(index):
+    return User.model_validate({
+        "id": f"usr-{index}",
+        "uniqueId": f"user-{index}",
+        "firstName": "Ada",
+        "lastName": "Lovelace",
+        "email": f"ada{index}@example.com",
+        "phone": "+15555550100",
+        "attributes": {"plan": "pro", "seats": index},
+    })
+
+
+CASES = {
+    "send_message (str)": ("msg-123", legacy_encode),
+    "status dict": ({"message_id": "msg-123", "status": "DELIVERED"}, legacy_encode),
+    "50 replies": ([ReplyData(text=f"reply {i}", thread_ts="1.0", user="U1", ts=str(i)) for i in range(50)],
+                   legacy_encode_models),
+    "500 templates": ([_template(i) for i in range(500)], legacy_encode_models),
+    "1000 users": ([_user(i) for i in range(1000)], legacy_encode_models),
+    "summary of 500": ({"count": 500, "truncated": False, "items": [
+        {"id": f"tpl-{i}", "name": f"template-{i}", "tags": ["onboarding"]} for i in range(500)
+    ]}, legacy_encode),
+}
+
+
+def _time(call, number):
+    return min(timeit.repeat(call, number=number, repeat=5)) / number
+
+
+def main(number: int = 200) -> None:
+    print(f"{'result':<20} {'legacy us':>11} {'pydantic us':>12} {'orjson us':>10} {'speedup':>8}")
+    orjson_available = encoding.ORJSON_AVAILABLE
+    for name, (result, legacy) in CASES.items():
+        legacy_time = _time(lambda: legacy(result), number)
+        encoding.ORJSON_AVAILABLE = False
+        fallback_time = _time(lambda: encoding.encode_result(result), number)
+        encoding.ORJSON_AVAILABLE = orjson_available
+        fast_time = _time(lambda: encoding.encode_result(result), number) if orjson_available else float("nan")
+        best = min(fallback_time, fast_time) if orjson_available else fallback_time
+        print(
+            f"{name:<20} {legacy_time * 1e6:>11.1f} {fallback_time * 1e6:>12.1f} {fast_time * 1e6:>10.1f}"
+            f" {legacy_time / best:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Microbenchmark: validating the arguments of an OpenAI tool call.
+
+Compares the previous path, ``json.loads`` followed by ``schema(**kwargs)``
+and ``model_dump()``, with ``validation.validate_json``, which validates the
+raw arguments text through a cached ``TypeAdapter``. Reports time and bytes
+allocated per call.
+
+    python benchmarks/bench_validation.py
+"""
+
+import json
+import timeit
+import tracemalloc
+
+from agenttoolkit.tools import tools
+from agenttoolkit.validation import validate_json
+
+SCHEMAS = {tool["method"]: tool["args_schema"] for tool in tools}
+
+CASES = {
+    "send_message": {"recipient_value": "a@b.c", "channel": "EMAIL", "body": "hi", "subject": "s"},
+    "get_message_status": {"message_id": "m-1"},
+    "list_templates": {"page": 0, "size": 50, "search": "welcome"},
+    "trigger_workflow_bulk_chunked": {
+        "workflow_name": "welcome",
+        "notify": [{"notify": {"email": f"user{i}@example.com"}} for i in range(100)],
+    },
+}
+
+
+def legacy_validate(schema, arguments):
+    return schema(**json.loads(arguments)).model_dump()
+
+
+def allocated(func, number: int = 100) -> float:
+    """Peak bytes held during a call, as traced by tracemalloc, averaged over ``number`` calls."""
+    func()
+    total = 0
+    tracemalloc.start()
+    for _ in range(number):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return total / number
+
+
+def main(number: int = 20_000) -> None:
+    print(f"{'method':<24} {'legacy us':>10} {'fast us':>10} {'speedup':>8} {'legacy B':>10} {'fast B':>10}")
+    for method, params in CASES.items():
+        schema, arguments = SCHEMAS[method], json.dumps(params)
+        legacy_call = lambda: legacy_validate(schema, arguments)  # noqa: E731
+        fast_call = lambda: validate_json(schema, arguments)  # noqa: E731
+        calls = number // 50 if method == "trigger_workflow_bulk_chunked" else number
+        legacy = min(timeit.repeat(legacy_call, number=calls, repeat=5)) / calls
+        fast = min(timeit.repeat(fast_call, number=calls, repeat=5)) / calls
+        print(
+            f"{method:<24} {legacy * 1e6:>10.2f} {fast * 1e6:>10.2f} {legacy / fast:>7.2f}x"
+            f" {allocated(legacy_call):>10.0f} {allocated(fast_call):>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Fixtures for the benchmark suite; see "Running Benchmarks" in the README."""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from agenttoolkit import api  # noqa: E402
+from agenttoolkit.cache import toolkit_cache  # noqa: E402
+from fake_siren import FakeAsyncSirenClient, FakeSirenClient  # noqa: E402
+
+# Simulated Siren round trip in seconds and entries per listing; raise them to
+# see how the toolkit behaves under realistic latency and payloads.
+LATENCY = float(os.environ.get("SIREN_BENCH_LATENCY", "0"))
+ITEMS = int(os.environ.get("SIREN_BENCH_ITEMS", "50"))
+
+# Keep the dedupe window off so identical benchmark calls all reach the fake.
+CONFIGURATION = {"context": {"dedupe": False}}
+
+
+@pytest.fixture(autouse=True)
+def fake_siren(monkeypatch):
+    """Route every SirenAPI to the in-process fake instead of Siren."""
+    FakeSirenClient.configure(latency=LATENCY, items=ITEMS)
+    monkeypatch.setattr(api, "SirenClient", FakeSirenClient)
+    monkeypatch.setattr(api, "PooledAsyncSirenClient", FakeAsyncSirenClient)
+    toolkit_cache.clear()
+    yield FakeSirenClient
+    toolkit_cache.clear()
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
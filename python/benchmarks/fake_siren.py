@@ -0,0 +1,180 @@
+"""In-process stand-in for the Siren SDK clients, for benchmarking the toolkit alone.
+
+``FakeSirenClient`` has the domain clients and methods ``SirenAPI`` routes
+to. Every call waits ``latency`` seconds and listings return ``items`` SDK
+models, so a benchmark can dial in a realistic network delay and payload size
+without touching the network. ``FakeAsyncSirenClient`` is its async twin and
+replaces the pooled async client.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from siren.models.messaging import ReplyData
+from siren.models.templates import Template
+from siren.models.user import User
+
+# Arguments every tool is benchmarked with; required fields only, plus a body
+# or template name where the tool needs one.
+SAMPLE_ARGUMENTS: Dict[str, Dict[str, Any]] = {
+    "send_message": {"recipient_value": "ada@example.com", "channel": "EMAIL", "body": "Hello", "subject": "Hi"},
+    "send_messages_batch": {
+        "recipients": [{"recipient_value": f"user{i}@example.com"} for i in range(10)],
+        "channel": "EMAIL",
+        "body": "Hello",
+    },
+    "get_message_status": {"message_id": "msg-1"},
+    "get_message_replies": {"message_id": "msg-1"},
+    "list_templates": {"page": 0, "size": 50},
+    "create_template": {"name": "welcome"},
+    "update_template": {"template_id": "tpl-1", "name": "welcome-v2"},
+    "delete_template": {"template_id": "tpl-1"},
+    "publish_template": {"template_id": "tpl-1"},
+    "add_user": {"unique_id": "user-1", "first_name": "Ada", "email": "ada@example.com"},
+    "update_user": {"id": "user-1", "slack": "U0001"},
+    "delete_user": {"unique_id": "user-1"},
+    "add_users_bulk": {"users": [{"unique_id": f"user-{i}", "email": f"user{i}@example.com"} for i in range(100)]},
+    "update_users_bulk": {"users": [{"unique_id": f"user-{i}", "slack": f"U{i:04d}"} for i in range(100)]},
+    "delete_users_bulk": {"unique_ids": [f"user-{i}" for i in range(100)]},
+    "list_users": {"page": 0, "size": 50},
+    "trigger_workflow": {"workflow_name": "welcome", "data": {"plan": "pro"}},
+    "trigger_workflow_bulk_chunked": {
+        "workflow_name": "welcome",
+        "notify": [{"notify": {"email": f"user{i}@example.com"}} for i in range(100)],
+    },
+    "schedule_workflow": {
+        "name": "digest",
+        "schedule_time": "09:00:00",
+        "timezone_id": "UTC",
+        "start_date": "2025-01-01",
+        "workflow_type": "DAILY",
+        "workflow_id": "wf-1",
+    },
+    "configure_notification_webhooks": {"url": "https://example.com/siren/status"},
+    "configure_inbound_webhooks": {"url": "https://example.com/siren/inbound"},
+}
+
+
+def make_template(index: int) -> Template:
+    return Template.model_validate({
+        "id": f"tpl-{index}",
+        "name": f"template-{index}",
+        "variables": [{"name": "first_name", "defaultValue": "there"}],
+        "tags": ["onboarding", "email"],
+        "draftVersion": {"id": f"ver-{index}", "version": 2, "status": "DRAFT"},
+        "templateVersions": [
+            {"id": f"ver-{index}-{v}", "version": v, "status": "PUBLISHED_LATEST"} for v in range(3)
+        ],
+    })
+
+
+def make_user(index: int) -> User:
+    return User.model_validate({
+        "id": f"usr-{index}",
+        "uniqueId": f"user-{index}",
+        "firstName": "Ada",
+        "lastName": "Lovelace",
+        "email": f"ada{index}@example.com",
+        "phone": "+15555550100",
+        "attributes": {"plan": "pro"},
+    })
+
+
+class Payloads:
+    """Canned responses; listings hold ``items`` entries, built once."""
+
+    def __init__(self, items: int):
+        self.templates = [make_template(i) for i in range(items)]
+        self.users = [make_user(i) for i in range(items)]
+        self.replies = [ReplyData(text=f"reply {i}", thread_ts="1.0", user="U1", ts=str(i)) for i in range(items)]
+
+    def respond(self, namespace: str, attribute: str, params: Dict[str, Any]) -> Any:
+        if (namespace, attribute) == ("template", "get"):
+            return self.templates
+        if (namespace, attribute) == ("message", "get_replies"):
+            return self.replies
+        if (namespace, attribute) == ("message", "get_status"):
+            return "DELIVERED"
+        if (namespace, attribute) == ("message", "send"):
+            return "msg-1"
+        if namespace == "workflow":
+            return {"request_id": "req-1", "workflow_execution_id": "exec-1"}
+        return {"id": "obj-1", **{key: value for key, value in params.items() if isinstance(value, str)}}
+
+
+class _FakeDomain:
+    def __init__(self, namespace: str, payloads: Payloads, latency: float):
+        self.namespace = namespace
+        self.base_url = ""
+        self.timeout = None
+        self._payloads = payloads
+        self._latency = latency
+        self._channel_template_client = self
+
+    def __getattr__(self, attribute: str) -> Any:
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+
+        def call(*args: Any, **params: Any) -> Any:
+            if self._latency:
+                time.sleep(self._latency)
+            return self._payloads.respond(self.namespace, attribute, params)
+
+        return call
+
+    def _make_request(self, **request: Any) -> Any:
+        # Only the user listing goes through _make_request.
+        if self._latency:
+            time.sleep(self._latency)
+        return self._payloads.users
+
+
+class _FakeAsyncDomain(_FakeDomain):
+    def __getattr__(self, attribute: str) -> Any:
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+
+        async def call(*args: Any, **params: Any) -> Any:
+            if self._latency:
+                await asyncio.sleep(self._latency)
+            return self._payloads.respond(self.namespace, attribute, params)
+
+        return call
+
+    async def _make_request(self, **request: Any) -> Any:
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return self._payloads.users
+
+
+NAMESPACES = ("message", "template", "channel_template", "user", "workflow", "webhook")
+
+
+class FakeSirenClient:
+    """Drop-in for ``siren.SirenClient``; configure it with ``configure`` before building toolkits."""
+
+    latency = 0.0
+    payloads = Payloads(50)
+
+    def __init__(self, api_key: str, env: Any = None):
+        self.api_key = api_key
+        self.env = env or "prod"
+        self.base_url = "https://api.fake.siren"
+        for namespace in NAMESPACES:
+            setattr(self, namespace, _FakeDomain(namespace, self.payloads, self.latency))
+
+    @classmethod
+    def configure(cls, latency: float = 0.0, items: int = 50) -> None:
+        cls.latency = latency
+        cls.payloads = Payloads(items)
+
+
+class FakeAsyncSirenClient:
+    """Drop-in for ``agenttoolkit.api.PooledAsyncSirenClient``."""
+
+    def __init__(self, api_key: str, base_url: str, transport: Any):
+        for namespace in NAMESPACES:
+            setattr(
+                self, namespace, _FakeAsyncDomain(namespace, FakeSirenClient.payloads, FakeSirenClient.latency)
+            )
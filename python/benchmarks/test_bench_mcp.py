@@ -0,0 +1,69 @@
+"""MCP server benchmarks: startup, per-request latency and concurrent throughput over a session."""
+
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("mcp")
+
+import mcp.types as types
+from conftest import CONFIGURATION
+from fake_siren import SAMPLE_ARGUMENTS
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from agenttoolkit.mcp import SirenAgentToolkit
+
+CONCURRENT_CALLS = 100
+CONCURRENT_LATENCY = 0.005
+
+
+def test_startup(benchmark):
+    """Building the server: tools, definitions and the streamable HTTP app."""
+    def start():
+        toolkit = SirenAgentToolkit("bench-key", CONFIGURATION)
+        toolkit.streamable_http_app()
+        return toolkit
+
+    benchmark.group = "mcp:startup"
+    benchmark(start)
+
+
+def test_cold_startup(benchmark):
+    """A fresh interpreter importing the server and building it, as ``python -m agenttoolkit.mcp`` does."""
+    code = "from agenttoolkit.mcp import SirenAgentToolkit; SirenAgentToolkit('bench-key').streamable_http_app()"
+    benchmark.group = "mcp:startup"
+    benchmark.pedantic(subprocess.run, args=([sys.executable, "-c", code],), kwargs={"check": True}, rounds=5)
+
+
+@pytest.mark.parametrize("method", SAMPLE_ARGUMENTS)
+def test_request_latency(benchmark, method, loop):
+    """One tools/call request through the server's handler, without a transport."""
+    toolkit = SirenAgentToolkit("bench-key", CONFIGURATION)
+    handler = toolkit.server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name=method, arguments=SAMPLE_ARGUMENTS[method]),
+    )
+    benchmark.group = "mcp:request"
+    result = benchmark(lambda: loop.run_until_complete(handler(request)))
+    assert not result.root.isError, result.root.content
+
+
+def test_session_throughput(benchmark, loop, fake_siren):
+    """CONCURRENT_CALLS status lookups in flight at once over an in-memory MCP session."""
+    fake_siren.configure(latency=CONCURRENT_LATENCY)
+    toolkit = SirenAgentToolkit("bench-key", CONFIGURATION, max_concurrency=CONCURRENT_CALLS)
+
+    async def run():
+        async with create_connected_server_and_client_session(toolkit.server) as session:
+            return await asyncio.gather(*(
+                session.call_tool("get_message_status", {"message_id": f"msg-{i}"})
+                for i in range(CONCURRENT_CALLS)
+            ))
+
+    benchmark.group = "mcp:throughput"
+    benchmark.extra_info["calls"] = CONCURRENT_CALLS
+    results = benchmark.pedantic(lambda: loop.run_until_complete(run()), rounds=10, warmup_rounds=1)
+    assert len(results) == CONCURRENT_CALLS
@@ -0,0 +1,48 @@
+"""Per-phase benchmarks of the shared tool path: validate, dispatch (SirenAPI.run) and serialize."""
+
+import pytest
+from conftest import CONFIGURATION
+from fake_siren import SAMPLE_ARGUMENTS
+
+from agenttoolkit.api import SirenAPI
+from agenttoolkit.compaction import Compactor
+from agenttoolkit.encoding import dumps
+from agenttoolkit.instrumentation import validate_arguments
+from agenttoolkit.tools import tools
+
+TOOLS = {tool["method"]: tool for tool in tools if tool["method"] in SAMPLE_ARGUMENTS}
+
+
+@pytest.fixture
+def siren_api():
+    return SirenAPI("bench-key", CONFIGURATION["context"])
+
+
+@pytest.mark.parametrize("method", TOOLS)
+def test_validate(benchmark, method):
+    benchmark.group = "validate"
+    benchmark(validate_arguments, method, TOOLS[method]["args_schema"], SAMPLE_ARGUMENTS[method])
+
+
+@pytest.mark.parametrize("method", TOOLS)
+def test_dispatch(benchmark, method, siren_api):
+    params = validate_arguments(method, TOOLS[method]["args_schema"], SAMPLE_ARGUMENTS[method])
+    benchmark.group = "dispatch"
+    benchmark(siren_api.run, method, params)
+
+
+@pytest.mark.parametrize("method", TOOLS)
+def test_serialize(benchmark, method, siren_api):
+    params = validate_arguments(method, TOOLS[method]["args_schema"], SAMPLE_ARGUMENTS[method])
+    result = siren_api.run(method, params)
+    compactor = Compactor()
+    benchmark.group = "serialize"
+    benchmark(compactor.encode, method, result)
+
+
+@pytest.mark.parametrize("method", TOOLS)
+def test_validate_json(benchmark, method):
+    """Validation of the raw arguments text of an OpenAI tool call."""
+    arguments = dumps(SAMPLE_ARGUMENTS[method])
+    benchmark.group = "validate_json"
+    benchmark(validate_arguments, method, TOOLS[method]["args_schema"], arguments)
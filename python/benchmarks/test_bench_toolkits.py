@@ -0,0 +1,64 @@
+"""End-to-end toolkit benchmarks: construction, get_tools, single calls and concurrent throughput."""
+
+import pytest
+from conftest import CONFIGURATION
+from adapters import ADAPTERS, async_caller, run_concurrently, sync_caller, tool_call, toolkit_class
+from fake_siren import SAMPLE_ARGUMENTS
+
+from agenttoolkit.tools import tools
+
+CONCURRENT_CALLS = 100
+CONCURRENT_LATENCY = 0.005
+
+METHODS = [tool["method"] for tool in tools if tool["method"] in SAMPLE_ARGUMENTS]
+
+
+@pytest.mark.parametrize("adapter", ADAPTERS)
+def test_construction(benchmark, adapter):
+    cls = toolkit_class(adapter)
+    benchmark.group = "construction"
+    benchmark(cls, "bench-key", CONFIGURATION)
+
+
+@pytest.mark.parametrize("adapter", ADAPTERS)
+def test_cached_construction(benchmark, adapter):
+    cls = toolkit_class(adapter)
+    benchmark.group = "construction"
+    benchmark(cls.cached, "bench-key", CONFIGURATION)
+
+
+@pytest.mark.parametrize("adapter", ADAPTERS)
+def test_get_tools(benchmark, adapter):
+    toolkit = toolkit_class(adapter)("bench-key", CONFIGURATION)
+    benchmark.group = "get_tools"
+    benchmark(toolkit.get_tools)
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("adapter", ADAPTERS)
+def test_tool_call(benchmark, adapter, method, loop):
+    """One validate, dispatch and serialize round trip through the adapter."""
+    toolkit = toolkit_class(adapter)("bench-key", CONFIGURATION)
+    call = sync_caller(adapter, toolkit, method, loop)
+    benchmark.group = f"call:{method}"
+    benchmark(call, SAMPLE_ARGUMENTS[method])
+
+
+@pytest.mark.parametrize("adapter", ADAPTERS)
+def test_concurrent_throughput(benchmark, adapter, loop, fake_siren):
+    """CONCURRENT_CALLS status lookups in flight at once against a slow Siren."""
+    fake_siren.configure(latency=CONCURRENT_LATENCY)
+    toolkit = toolkit_class(adapter)("bench-key", CONFIGURATION)
+    arguments = [{"message_id": f"msg-{i}"} for i in range(CONCURRENT_CALLS)]
+    if adapter == "openai":
+        calls = [tool_call("get_message_status", item, f"call-{i}") for i, item in enumerate(arguments)]
+        run = lambda: loop.run_until_complete(  # noqa: E731
+            toolkit.handle_tool_calls(calls, max_concurrency=CONCURRENT_CALLS)
+        )
+    else:
+        call = async_caller(adapter, toolkit, "get_message_status")
+        run = lambda: loop.run_until_complete(run_concurrently(call, arguments))  # noqa: E731
+    benchmark.group = "throughput"
+    benchmark.extra_info["calls"] = CONCURRENT_CALLS
+    results = benchmark.pedantic(run, rounds=10, warmup_rounds=1)
+    assert len(results) == CONCURRENT_CALLS
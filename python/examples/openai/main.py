@@ -69,10 +69,7 @@ async def main():
     
     if message.tool_calls:
 
-        tool_results = []
-        for tool_call in message.tool_calls:
-            result = await siren_toolkit.handle_tool_call(tool_call)
-            tool_results.append(result)
+        tool_results = await siren_toolkit.handle_tool_calls(message.tool_calls)
         
         print("Tool execution results:")
         for result in tool_results:
@@ -0,0 +1,313 @@
+"""Tests for api module."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from siren.clients.messaging import MessageClient
+from siren.clients.templates import TemplateClient
+
+from agenttoolkit.api import SirenAPI, _AsyncState
+from agenttoolkit.instrumentation import validate_arguments
+from agenttoolkit.tools import tools
+
+
+class FakeAsyncNamespace:
+    """Async stand-in for an SDK domain client that records its calls."""
+
+    def __init__(self, calls):
+        self._calls = calls
+
+    def __getattr__(self, name):
+        async def method(*args, **kwargs):
+            self._calls.append((name, args, kwargs, threading.current_thread()))
+            await asyncio.sleep(0)
+            return {"method": name, "args": list(args), "kwargs": kwargs}
+
+        return method
+
+
+def use_async_client(api, client):
+    """Install a fake async client for the running event loop."""
+    api._async_states[asyncio.get_running_loop()] = _AsyncState(client)
+
+
+def make_async_api():
+    calls = []
+    api = SirenAPI(api_key="test-key")
+    use_async_client(api, SimpleNamespace(
+        message=FakeAsyncNamespace(calls),
+        template=FakeAsyncNamespace(calls),
+        channel_template=FakeAsyncNamespace(calls),
+        user=FakeAsyncNamespace(calls),
+        workflow=FakeAsyncNamespace(calls),
+        webhook=FakeAsyncNamespace(calls),
+    ))
+    return api, calls
+
+
+async def test_arun_uses_async_client_on_event_loop_thread():
+    """Test that arun awaits the async client instead of blocking in a thread."""
+    api, calls = make_async_api()
+
+    result = await api.arun("get_message_status", {"message_id": "msg-1"})
+
+    assert result == {"method": "get_status", "args": [], "kwargs": {"message_id": "msg-1"}}
+    assert calls[0][3] is threading.current_thread()
+
+
+async def test_arun_does_not_mutate_params():
+    """Test that arun leaves the caller's params untouched."""
+    api, calls = make_async_api()
+    params = {"template_id": "tpl-1", "name": "Welcome"}
+
+    await api.arun("update_template", params)
+
+    assert params == {"template_id": "tpl-1", "name": "Welcome"}
+    assert calls[0][2] == {"template_id": "tpl-1", "name": "Welcome"}
+
+
+async def test_arun_falls_back_to_sync_client_for_direct_messages(monkeypatch):
+    """Test that body-based messages go through the sync client off the loop."""
+    seen = []
+
+    def send(self, **kwargs):
+        seen.append((kwargs, threading.current_thread()))
+        return "msg-2"
+
+    async def async_send(template_name, channel, recipient_value, template_variables=None):
+        seen.append(({"template_name": template_name}, threading.current_thread()))
+        return "msg-3"
+
+    monkeypatch.setattr(MessageClient, "send", send)
+    api = SirenAPI(api_key="test-key")
+    use_async_client(api, SimpleNamespace(message=SimpleNamespace(send=async_send)))
+
+    direct = await api.arun(
+        "send_message",
+        {"recipient_value": "a@b.c", "channel": "EMAIL", "body": "Hi", "template_name": None},
+    )
+    templated = await api.arun(
+        "send_message",
+        {"recipient_value": "a@b.c", "channel": "EMAIL", "body": None, "template_name": "welcome"},
+    )
+
+    assert (direct, templated) == ("msg-2", "msg-3")
+    assert seen[0][1] is not threading.current_thread()
+    assert seen[1] == ({"template_name": "welcome"}, threading.current_thread())
+
+
+async def test_arun_many_calls_share_one_loop():
+    """Test that concurrent arun calls interleave on a single event loop."""
+    api, calls = make_async_api()
+
+    results = await asyncio.gather(
+        *(api.arun("get_message_replies", {"message_id": f"msg-{i}"}) for i in range(50))
+    )
+
+    assert [r["kwargs"]["message_id"] for r in results] == [f"msg-{i}" for i in range(50)]
+    assert {call[3] for call in calls} == {threading.current_thread()}
+
+
+async def test_arun_unknown_method():
+    """Test that arun rejects unknown methods."""
+    api, _ = make_async_api()
+
+    with pytest.raises(ValueError):
+        await api.arun("unknown_method", {})
+
+
+def test_every_tool_has_a_handler():
+    """Test that each registered tool method can be dispatched."""
+    api = SirenAPI(api_key="test-key")
+
+    for tool in tools:
+        assert tool["method"] in api._handlers
+
+
+def test_run_dispatches_without_mutating_params(monkeypatch):
+    """Test that run routes ids to the SDK without touching the caller's dict."""
+    calls = []
+    monkeypatch.setattr(
+        TemplateClient, "update", lambda self, template_id, **kw: calls.append((template_id, kw)) or "ok"
+    )
+    api = SirenAPI(api_key="test-key")
+    params = {"template_id": "tpl-1", "name": "Welcome"}
+
+    assert api.run("update_template", params) == "ok"
+    assert params == {"template_id": "tpl-1", "name": "Welcome"}
+    assert calls == [("tpl-1", {"name": "Welcome"})]
+
+
+def test_run_not_implemented_and_unknown():
+    """Test the error paths of run."""
+    api = SirenAPI(api_key="test-key")
+
+    with pytest.raises(NotImplementedError):
+        api.run("get_user", {})
+    with pytest.raises(ValueError):
+        api.run("unknown_method", {})
+
+
+async def test_register_custom_method():
+    """Test that new methods can be registered without editing run."""
+    api = SirenAPI(api_key="test-key")
+    api.register("echo", lambda value: value)
+
+    assert api.run("echo", {"value": 1}) == 1
+    assert await api.arun("echo", {"value": 2}) == 2
+
+
+def fake_send(recipient_value, channel, **kwargs):
+    if recipient_value.startswith("bad"):
+        raise ValueError(f"cannot reach {recipient_value}")
+    return f"msg-{recipient_value}-{channel}-{(kwargs.get('template_variables') or {}).get('name')}"
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+async def test_send_messages_batch_summarizes_fan_out(use_async):
+    """Test per-recipient overrides and the sent/failed summary."""
+    api = SirenAPI(api_key="test-key")
+    api.register("send_message", fake_send)
+    params = {
+        "recipients": [
+            {"recipient_value": "a"},
+            {"recipient_value": "b", "channel": "SLACK", "template_variables": {"name": "Bea"}},
+            {"recipient_value": "bad-c"},
+        ],
+        "channel": "EMAIL",
+        "template_name": "welcome",
+        "template_variables": {"name": "team"},
+    }
+
+    if use_async:
+        summary = await api.arun("send_messages_batch", params)
+    else:
+        summary = api.run("send_messages_batch", params)
+
+    assert summary == {
+        "total": 3,
+        "sent": 2,
+        "failed": 1,
+        "message_ids": ["msg-a-EMAIL-team", "msg-b-SLACK-Bea"],
+        "errors": [{"recipient_value": "bad-c", "channel": "EMAIL", "error": "cannot reach bad-c"}],
+    }
+
+
+async def test_send_messages_batch_runs_concurrently():
+    """Test that recipients are dispatched concurrently up to the limit."""
+    api = SirenAPI(api_key="test-key")
+    in_flight = 0
+    peak = 0
+
+    async def send(recipient_value, channel, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return recipient_value
+
+    api.register("send_message", fake_send, send)
+    recipients = [{"recipient_value": str(i)} for i in range(20)]
+
+    summary = await api.asend_messages_batch(recipients, channel="EMAIL", body="hi", max_concurrency=5)
+
+    assert summary["sent"] == 20
+    assert peak == 5
+
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+async def test_users_bulk_streams_validates_and_summarizes(use_async):
+    """Test chunked validation, per-record failures and the compact summary."""
+    api = SirenAPI(api_key="test-key", context={"dedupe": False})
+    added = []
+
+    def add(**params):
+        if params["unique_id"] == "u-down":
+            raise ValueError("rejected")
+        added.append(params)
+        return {"id": params["unique_id"]}
+
+    api.register("add_user", add)
+    users = iter([
+        {"unique_id": "u-1", "email": "a@example.com"},
+        {"email": "missing-id@example.com"},
+        {"unique_id": "u-down"},
+        {"unique_id": "u-2", "first_name": "Bea"},
+        {"unique_id": "u-3"},
+    ])
+
+    if use_async:
+        summary = await api.aadd_users_bulk(users, chunk_size=2)
+    else:
+        summary = api.add_users_bulk(users, chunk_size=2)
+
+    assert summary == {
+        "total": 5,
+        "succeeded": 3,
+        "failed": 2,
+        "errors": [
+            {"index": 1, "unique_id": None, "error": "unique_id: Field required"},
+            {"index": 2, "unique_id": "u-down", "error": "rejected"},
+        ],
+    }
+    assert added == [
+        {"unique_id": "u-1", "email": "a@example.com"},
+        {"unique_id": "u-2", "first_name": "Bea"},
+        {"unique_id": "u-3"},
+    ]
+
+
+async def test_users_bulk_tools_resend_unprocessed_calls_only():
+    """Test the bulk tools end to end, resending only calls Siren never received."""
+    api = SirenAPI(api_key="test-key", context={"retry_attempts": 0, "dedupe": False})
+    attempts = {}
+
+    def update(unique_id, **params):
+        attempts[unique_id] = attempts.get(unique_id, 0) + 1
+        if unique_id == "u-flaky" and attempts[unique_id] == 1:
+            raise ConnectionRefusedError("refused")
+        if unique_id == "u-reset":
+            raise ConnectionResetError("reset")
+        return {"id": unique_id, **params}
+
+    deleted = []
+    api.register("update_user", update)
+    api.register("delete_user", lambda unique_id: deleted.append(unique_id))
+
+    updated = await api.arun(
+        "update_users_bulk",
+        {"users": [
+            {"unique_id": "u-1", "custom_data": {"plan": "pro"}},
+            {"unique_id": "u-flaky"},
+            {"unique_id": "u-reset"},
+        ]},
+    )
+    removed = api.run("delete_users_bulk", {"unique_ids": ["u-1", "u-2"]})
+
+    assert (updated["succeeded"], updated["failed"]) == (2, 1)
+    assert updated["errors"][0]["unique_id"] == "u-reset"
+    assert attempts == {"u-1": 1, "u-flaky": 2, "u-reset": 1}
+    assert removed["succeeded"] == 2 and deleted == ["u-1", "u-2"]
+
+
+def test_users_bulk_tool_writes_valid_records_of_mixed_batch():
+    """Test that invalid records of a bulk tool call fail alone, after tool argument validation."""
+    api = SirenAPI(api_key="test-key", context={"dedupe": False})
+    added = []
+    api.register("add_user", lambda **params: added.append(params["unique_id"]))
+    schema = next(tool["args_schema"] for tool in tools if tool["method"] == "add_users_bulk")
+
+    params = validate_arguments(
+        "add_users_bulk",
+        schema,
+        '{"users": [{"unique_id": "u-1"}, {"email": "missing-id@example.com"}, {"unique_id": "u-2"}]}',
+    )
+    summary = api.run("add_users_bulk", params)
+
+    assert added == ["u-1", "u-2"]
+    assert summary["succeeded"] == 2 and summary["failed"] == 1
+    assert summary["errors"] == [{"index": 1, "unique_id": None, "error": "unique_id: Field required"}]
@@ -0,0 +1,153 @@
+"""Tests for batching module."""
+
+import asyncio
+import threading
+
+import pytest
+from siren.exceptions import SirenSDKError
+
+from agenttoolkit.api import SirenAPI
+from agenttoolkit.batching import arun_chunks, chunked, entry_size, run_chunks
+
+
+def notify_entries(count):
+    for index in range(count):
+        yield {"notify": {"email": f"user{index}@example.com"}}
+
+
+def test_chunked_bounds_count_and_bytes():
+    """Test that chunks respect both the entry and the byte limit."""
+    entries = list(notify_entries(25))
+    size = entry_size(entries[0])
+
+    by_count = list(chunked(entries, max_items=10, max_bytes=None))
+    by_bytes = list(chunked(entries, max_items=100, max_bytes=size * 4))
+
+    assert [len(chunk) for chunk in by_count] == [10, 10, 5]
+    assert all(len(chunk) <= 4 for chunk in by_bytes)
+    assert [entry for chunk in by_bytes for entry in chunk] == entries
+    assert list(chunked([{"big": "x" * 100}], max_bytes=10)) == [[{"big": "x" * 100}]]
+
+
+def test_chunked_consumes_generators_lazily():
+    """Test that only one chunk is pulled from the source at a time."""
+    pulled = []
+
+    def source():
+        for index in range(100):
+            pulled.append(index)
+            yield index
+
+    first = next(chunked(source(), max_items=10, max_bytes=None))
+
+    assert first == list(range(10))
+    assert len(pulled) == 11
+
+
+async def test_arun_chunks_bounds_concurrency_and_retries():
+    """Test parallelism limit, retry of a flaky chunk and the aggregated result."""
+    in_flight = 0
+    peak = 0
+    failures = {1: 1, 3: 5}
+
+    async def send(chunk):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if failures.get(chunk[0], 0):
+            failures[chunk[0]] -= 1
+            raise RuntimeError(f"chunk {chunk[0]} failed")
+        return {"accepted": len(chunk)}
+
+    result = await arun_chunks(([i] for i in range(6)), send, max_concurrency=2, retries=2, retry_delay=0)
+
+    assert peak <= 2
+    assert [chunk.index for chunk in result.chunks] == list(range(6))
+    assert result.chunks[1].ok and result.chunks[1].attempts == 2
+    assert not result.chunks[3].ok and result.chunks[3].attempts == 3
+    assert (result.total, result.succeeded, result.failed) == (6, 5, 1)
+    assert result.failed_entries() == [3]
+    assert result.to_dict()["chunks"][3]["status"] == "failed"
+
+
+def test_run_chunks_sends_from_threads():
+    """Test the blocking variant with bounded worker threads."""
+    threads = set()
+
+    def send(chunk):
+        threads.add(threading.get_ident())
+        return len(chunk)
+
+    result = run_chunks(chunked(range(50), max_items=5, max_bytes=None), send, max_concurrency=3)
+
+    assert result.ok
+    assert [chunk.result for chunk in result.chunks] == [5] * 10
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+async def test_trigger_workflow_bulk_chunked(use_async):
+    """Test that SirenAPI streams notify entries through trigger_workflow_bulk."""
+    api = SirenAPI(api_key="test-key")
+    calls = []
+
+    def trigger_bulk(workflow_name, notify, data=None):
+        calls.append((workflow_name, len(notify), data))
+        return {"count": len(notify)}
+
+    api.register("trigger_workflow_bulk", trigger_bulk)
+    kwargs = dict(workflow_name="welcome", notify=notify_entries(2500), data={"a": 1}, chunk_size=1000)
+    if use_async:
+        result = await api.atrigger_workflow_bulk_chunked(**kwargs)
+    else:
+        result = api.trigger_workflow_bulk_chunked(**kwargs)
+
+    assert sorted(size for _, size, _ in calls) == [500, 1000, 1000]
+    assert {(name, data["a"]) for name, _, data in calls} == {("welcome", 1)}
+    assert result.succeeded == 2500
+
+
+async def test_trigger_workflow_bulk_tool_returns_chunk_summary():
+    """Test that the bulk workflow tool chunks its notify list and returns the BulkResult summary."""
+    api = SirenAPI(api_key="test-key", context={"dedupe": False})
+    sizes = []
+
+    def trigger_bulk(workflow_name, notify, data=None):
+        sizes.append(len(notify))
+        return {"count": len(notify)}
+
+    api.register("trigger_workflow_bulk", trigger_bulk)
+    params = {"workflow_name": "welcome", "notify": list(notify_entries(1500))}
+
+    for summary in (api.run("trigger_workflow_bulk_chunked", params),
+                    await api.arun("trigger_workflow_bulk_chunked", params)):
+        assert (summary["total"], summary["succeeded"], summary["failed"]) == (1500, 1500, 0)
+        assert [chunk["size"] for chunk in summary["chunks"]] == [1000, 500]
+    assert sorted(sizes) == [500, 500, 1000, 1000]
+
+
+def test_trigger_workflow_bulk_chunked_only_resends_unprocessed_chunks():
+    """Test that throttled chunks are retried but read timeouts and 4xx errors are not."""
+    api = SirenAPI(api_key="test-key", context={"retry_attempts": 0, "dedupe": False})
+    attempts = {}
+    faults = {
+        0: [SirenSDKError("throttled", status_code=429)],
+        1: [TimeoutError("read timed out")],
+        2: [SirenSDKError("bad request", status_code=400)],
+    }
+
+    def trigger_bulk(workflow_name, notify, data=None):
+        chunk = int(notify[0]["notify"]["email"][4:].split("@")[0]) // 10
+        attempts[chunk] = attempts.get(chunk, 0) + 1
+        if faults.get(chunk):
+            raise faults[chunk].pop(0)
+        return {"count": len(notify)}
+
+    api.register("trigger_workflow_bulk", trigger_bulk)
+    result = api.trigger_workflow_bulk_chunked("welcome", notify_entries(40), chunk_size=10, max_concurrency=1)
+
+    assert attempts == {0: 2, 1: 1, 2: 1, 3: 1}
+    assert [chunk.ok for chunk in result.chunks] == [True, False, False, True]
+    assert len(result.failed_entries()) == 20
@@ -0,0 +1,254 @@
+"""Tests for cache module."""
+
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from pydantic import TypeAdapter
+from siren.models.templates import ChannelTemplate, Template
+
+from agenttoolkit.cache import MISSING, SQLiteCache, TTLCache, cached_toolkit, hash_api_key, toolkit_key
+from agenttoolkit.api import SirenAPI
+from agenttoolkit.openai import SirenAgentToolkit
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used(timer):
+    """Test TTL expiry, LRU eviction and hit/miss counters."""
+    cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    timer.now = 11
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cached_toolkit_shares_instances_for_equal_inputs():
+    """Test that equal arguments return one toolkit and different ones do not."""
+    cache = TTLCache(maxsize=4)
+    configuration = {"actions": {"messaging": {"create": True}}}
+
+    first = cached_toolkit(SirenAgentToolkit, "key-1", configuration, cache=cache)
+    second = cached_toolkit(SirenAgentToolkit, "key-1", dict(configuration), cache=cache)
+    other_key = cached_toolkit(SirenAgentToolkit, "key-2", configuration, cache=cache)
+    other_config = cached_toolkit(SirenAgentToolkit, "key-1", None, cache=cache)
+
+    assert first is second
+    assert first is not other_key
+    assert first is not other_config
+    assert [tool["function"]["name"] for tool in first.get_tools()] == ["send_message", "send_messages_batch"]
+
+
+def test_cached_classmethod_builds_once_across_threads():
+    """Test that concurrent callers share a single toolkit instance."""
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        toolkits = list(executor.map(lambda _: SirenAgentToolkit.cached("thread-key"), range(32)))
+
+    assert all(toolkit is toolkits[0] for toolkit in toolkits)
+
+
+def test_api_key_is_hashed_in_cache_key():
+    """Test that the plain API key never appears in the cache key."""
+    key = toolkit_key(SirenAgentToolkit, "secret-api-key", {"context": {"env": "dev"}})
+
+    assert "secret-api-key" not in repr(key)
+    assert hash_api_key("secret-api-key") in key
+
+
+def test_context_api_key_is_hashed_in_cache_key():
+    """Test that an API key in the configuration's context is hashed too."""
+    key = toolkit_key(SirenAgentToolkit, "api-key", {"context": {"api_key": "sk-secret"}})
+    other = toolkit_key(SirenAgentToolkit, "api-key", {"context": {"api_key": "sk-other"}})
+
+    assert "sk-secret" not in repr(key)
+    assert hash_api_key("sk-secret") in key[2]
+    assert key != other
+
+
+def test_get_or_set_builds_different_keys_concurrently():
+    """Test that a slow factory only blocks callers of its own key."""
+    cache = TTLCache(maxsize=4)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        slow_results = [executor.submit(cache.get_or_set, "slow", slow) for _ in range(2)]
+        assert started.wait(5)
+        assert cache.get_or_set("fast", lambda: "fast") == "fast"
+        release.set()
+        assert [future.result() for future in slow_results] == ["slow", "slow"]
+
+    assert cache._building == {}
+
+
+def test_shared_api_keeps_async_client_per_event_loop():
+    """Test that threads running their own loops get separate async clients."""
+    toolkit = SirenAgentToolkit.cached("loop-key")
+    clients = []
+
+    async def grab():
+        clients.append(toolkit.siren_api.async_client)
+        assert toolkit.siren_api.async_client is clients[-1]
+
+    threads = [threading.Thread(target=asyncio.run, args=(grab(),)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(clients) == 2
+    assert clients[0] is not clients[1]
+
+
+def test_ttl_cache_bounds_approximate_bytes():
+    """Test that the byte bound evicts old entries and skips oversized values."""
+    cache = TTLCache(maxsize=100, max_bytes=300, sizeof=len)
+
+    cache.set("a", "x" * 100)
+    cache.set("b", "x" * 100)
+    cache.set("c", "x" * 150)
+    cache.set("huge", "x" * 500)
+
+    assert "a" not in cache and "huge" not in cache
+    assert "b" in cache and "c" in cache
+    assert cache.bytes == 250
+
+
+def make_cached_api(calls, api_key="read-cache-key", **context):
+    api = SirenAPI(api_key=api_key, context={"read_cache": True, **context})
+
+    def recorder(method, result):
+        def handler(**params):
+            calls.append((method, params))
+            return result
+        return handler
+
+    api.register("list_templates", recorder("list_templates", [Template(id="t1", name="welcome")]))
+    api.register("get_channel_templates", recorder("get_channel_templates", [ChannelTemplate(channel="EMAIL", configuration={})]))
+    api.register("update_template", recorder("update_template", "ok"))
+    api.register("get_message_replies", recorder("get_message_replies", []))
+    return api
+
+
+def test_read_cache_hits_on_normalized_params_and_invalidates():
+    """Test read-through hits, param normalization and invalidation by mutations."""
+    calls = []
+    api = make_cached_api(calls)
+    other = make_cached_api(calls)
+
+    api.run("list_templates", {"search": "welcome", "page": None})
+    api.run("list_templates", {"search": "welcome"})
+    other.run("list_templates", {"search": "welcome"})
+    assert len(calls) == 2
+    assert api.read_cache.stats()["hits"] == 1
+
+    api.run("update_template", {"template_id": "t1", "name": "new"})
+    api.run("list_templates", {"search": "welcome"})
+    other.run("list_templates", {"search": "welcome"})
+
+    assert [method for method, _ in calls].count("list_templates") == 4
+    assert api.read_cache.stats()["misses"] == 2
+
+
+async def test_read_cache_never_caches_replies():
+    """Test that replies, which can arrive at any time, are always fetched."""
+    calls = []
+    api = make_cached_api(calls)
+
+    await api.arun("get_message_replies", {"message_id": "m1"})
+    await api.arun("get_message_replies", {"message_id": "m1"})
+
+    assert [method for method, _ in calls].count("get_message_replies") == 2
+
+
+def test_read_cache_disabled_by_default():
+    """Test that handlers are not wrapped unless the context enables caching."""
+    api = SirenAPI(api_key="test-key", context={"retry_attempts": 0, "circuit_breaker_threshold": 0})
+
+    assert api.read_cache is None
+    assert api._handlers["get_channel_templates"] == api.client.channel_template.get
+
+
+def test_read_cache_store_survives_restarts_and_invalidates(tmp_path):
+    """Test that a fresh SirenAPI reads what another wrote to disk, until a mutation."""
+    calls = []
+    path = str(tmp_path / "reads.db")
+    make_cached_api(calls, "disk-key", read_cache_path=path).run("list_templates", {"search": "welcome"})
+
+    restarted = make_cached_api(calls, "disk-key", read_cache_path=path)
+    assert restarted.run("list_templates", {"search": "welcome"}) == [Template(id="t1", name="welcome")]
+    assert len(calls) == 1
+    assert restarted.read_cache.stats()["disk"]["hits"] == 1
+
+    other_account = make_cached_api(calls, "other-key", read_cache_path=path)
+    other_account.run("list_templates", {"search": "welcome"})
+    restarted.run("update_template", {"template_id": "t1", "name": "new"})
+    make_cached_api(calls, "disk-key", read_cache_path=path).run("list_templates", {"search": "welcome"})
+    make_cached_api(calls, "other-key", read_cache_path=path).run("list_templates", {"search": "welcome"})
+
+    assert [method for method, _ in calls].count("list_templates") == 3
+
+
+def test_sqlite_cache_expires_evicts_oldest_and_shares_content(tmp_path, timer):
+    cache = SQLiteCache(str(tmp_path / "reads.db"), max_bytes=3000, timer=timer)
+    account = (hash_api_key("k"), "https://api")
+
+    cache.set("a", account, "list_templates", "x" * 1000, ttl=10)
+    cache.set("b", account, "list_templates", "x" * 1000, ttl=10)
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["bytes"] < 1100
+
+    timer.now = 1
+    cache.set("c", account, "list_templates", "y" * 1000, ttl=100)
+    timer.now = 2
+    cache.set("d", account, "list_templates", "z" * 1000, ttl=100)
+    assert cache.get("a")[0] is MISSING and cache.get("b")[0] is MISSING
+    assert cache.get("c") == ("y" * 1000, 99)
+
+    timer.now = 101
+    assert cache.get("c")[0] is MISSING
+    assert cache.get("d")[0] == "z" * 1000
+
+
+def test_sqlite_cache_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "reads.db")
+    account = ("account", "https://api")
+    code = (
+        "import sys; from agenttoolkit.cache import SQLiteCache; "
+        "SQLiteCache(sys.argv[1]).set('k', ('account', 'https://api'), 'list_templates', ['welcome'], 60)"
+    )
+    cache = SQLiteCache(path)
+    subprocess.run([sys.executable, "-c", code, path], check=True)
+
+    assert cache.get("k")[0] == ["welcome"]
+    assert cache.invalidate(account, ["list_templates"]) == 1
+
+
+def test_sqlite_cache_stores_json_and_validates_it_on_read(tmp_path):
+    """Test that models are stored as JSON, and a value that no longer validates is a miss."""
+    cache = SQLiteCache(str(tmp_path / "reads.db"))
+    account = ("account", "https://api")
+    cache.set("k", account, "list_templates", [Template(id="t1", name="welcome", tags=["onboarding"])], 60)
+    cache.set("stale", account, "list_templates", [{"name": "no id"}], 60)
+
+    data = cache._connection().execute("SELECT data FROM blobs JOIN entries USING (digest) WHERE key = 'k'").fetchone()[0]
+    assert json.loads(data)[0]["tags"] == ["onboarding"]
+    validate = TypeAdapter(List[Template]).validate_python
+    assert cache.get("k", validate)[0] == [Template(id="t1", name="welcome", tags=["onboarding"])]
+    assert cache.get("stale", validate)[0] is MISSING
+    assert cache.stats()["misses"] == 1
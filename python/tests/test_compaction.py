@@ -0,0 +1,128 @@
+"""Tests for compaction module."""
+
+import json
+from types import SimpleNamespace
+
+from siren.models.messaging import ReplyData
+from siren.models.templates import Template
+
+from agenttoolkit.api import SirenAPI
+from agenttoolkit.compaction import Compactor, compile_projection, project
+from agenttoolkit.encoding import encode_result
+from agenttoolkit.openai import SirenAgentToolkit
+from agenttoolkit.webhooks import ReplyStore
+
+
+def make_template(index):
+    return Template.model_validate({
+        "id": f"tpl-{index}",
+        "name": f"template-{index}",
+        "variables": [{"name": "first_name", "defaultValue": "there"}],
+        "tags": ["onboarding"],
+        "draftVersion": {
+            "id": f"ver-{index}",
+            "version": 3,
+            "status": "DRAFT",
+            "publishedAt": None,
+        },
+        "templateVersions": [
+            {"id": f"ver-{index}-{v}", "version": v, "status": "PUBLISHED_LATEST", "publishedAt": "2024-01-01"}
+            for v in range(3)
+        ],
+    })
+
+
+def test_projects_declared_fields_of_listings():
+    """Test that list_templates keeps only its result_fields, nested ones included."""
+    templates = [make_template(i) for i in range(5)]
+
+    text = Compactor().encode("list_templates", templates)
+
+    assert json.loads(text)[0] == {
+        "id": "tpl-0",
+        "name": "template-0",
+        "tags": ["onboarding"],
+        "variables": [{"name": "first_name"}],
+        "draft_version": {"id": "ver-0", "status": "DRAFT"},
+    }
+    assert len(encode_result(templates)) > 3 * len(text)
+
+
+def test_truncates_lists_with_markers():
+    """Test that long lists end in an "N more" marker, summaries included."""
+    compactor = Compactor(max_items=2)
+
+    assert json.loads(compactor.encode("get_message_replies", list(range(5)))) == [0, 1, "... 3 more"]
+    summary = {"count": 3, "truncated": True, "items": [make_template(i) for i in range(3)]}
+    compacted = json.loads(compactor.encode("list_templates", summary))
+    assert compacted["count"] == 3 and compacted["truncated"] is True
+    assert [item.get("id") for item in compacted["items"][:2]] == ["tpl-0", "tpl-1"]
+    assert compacted["items"][2] == "... 1 more"
+
+
+def test_budget_cuts_lists_then_previews():
+    """Test that a character or token budget shrinks lists first and previews last."""
+    templates = [make_template(i) for i in range(40)]
+
+    text = Compactor(max_chars=1000).encode("list_templates", templates)
+    assert len(text) <= 1000
+    assert json.loads(text)[-1].endswith("more")
+
+    text = Compactor(max_tokens=20).encode("get_message_replies", [{"text": "x" * 500}])
+    assert json.loads(text)["truncated"] is True
+    assert Compactor(compact=False).encode("list_templates", templates) == encode_result(templates)
+
+
+def test_compacts_webhook_replies_like_api_replies():
+    """Test that a reply ingested from an inbound webhook compacts to the ReplyData fields."""
+    store = ReplyStore()
+    store.ingest({
+        "messageId": "m1",
+        "body": "yes please",
+        "sender": "U1",
+        "timestamp": 1700000000,
+        "channel": "SLACK",
+        "raw": {"blocks": ["..."]},
+    })
+    api_reply = ReplyData(text="yes please", user="U1", ts="1700000000")
+
+    text = Compactor().encode("get_message_replies", store.replies("m1"))
+
+    assert json.loads(text) == [{"text": "yes please", "user": "U1", "ts": "1700000000"}]
+    assert text == Compactor().encode("get_message_replies", [api_reply])
+
+
+def test_results_of_tools_without_result_fields_stay_whole():
+    """Test that a batch of more than 50 recipients keeps every message id, whatever the limits."""
+    api = SirenAPI(api_key="test-key", context={"dedupe": False})
+    api.register("send_message", lambda recipient_value, **params: f"msg-{recipient_value}")
+    recipients = [{"recipient_value": f"user{i}@example.com"} for i in range(60)]
+
+    summary = api.run("send_messages_batch", {"recipients": recipients, "channel": "EMAIL", "body": "Hi"})
+
+    assert len(summary["message_ids"]) == 60
+    for compactor in (Compactor(), Compactor(max_items=5, max_chars=200)):
+        assert json.loads(compactor.encode("send_messages_batch", summary)) == summary
+
+
+def test_projection_helpers():
+    """Test compiling dotted field names and projecting plain data."""
+    projection = compile_projection(["a", "b.c", "b.d"])
+
+    assert projection == {"a": None, "b": {"c": None, "d": None}}
+    assert project([{"a": 1, "b": [{"c": 2, "e": 3}], "z": 4}], projection) == [{"a": 1, "b": [{"c": 2}]}]
+
+
+async def test_openai_toolkit_compacts_results():
+    """Test that the toolkit's results configuration applies to tool messages."""
+    toolkit = SirenAgentToolkit(api_key="test-key", configuration={"results": {"max_items": 1}})
+
+    async def arun(method, params):
+        return [make_template(i) for i in range(3)]
+
+    toolkit.siren_api.arun = arun
+    tool_call = SimpleNamespace(id="call-1", function=SimpleNamespace(name="list_templates", arguments="{}"))
+
+    message = await toolkit.handle_tool_call(tool_call)
+
+    assert json.loads(message["content"])[1] == "... 2 more"
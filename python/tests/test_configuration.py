@@ -1,7 +1,8 @@
 """Tests for configuration module."""
 
 import pytest
-from agenttoolkit.configuration import is_tool_allowed
+from agenttoolkit.configuration import filter_tools, is_tool_allowed
+from agenttoolkit.tools import tools
 
 
 def test_is_tool_allowed_no_configuration():
@@ -89,4 +90,47 @@ def test_is_tool_allowed_missing_resource():
         }
     }
     
-    assert is_tool_allowed(tool, configuration) is False
\ No newline at end of file
+    assert is_tool_allowed(tool, configuration) is False
+
+def test_is_tool_allowed_requires_every_permission():
+    """Test that a tool needing several permissions needs all of them granted."""
+    tool = {"actions": {"messaging": {"create": True}, "users": {"read": True}}}
+
+    assert is_tool_allowed(tool, {"actions": {"messaging": {"create": True}, "users": {"read": True}}})
+    assert not is_tool_allowed(tool, {"actions": {"messaging": {"create": True}, "users": {"read": False}}})
+    assert not is_tool_allowed(tool, {"actions": {"messaging": {"create": True}}})
+
+
+def test_filter_tools_matches_is_tool_allowed():
+    """Test that the compiled filter agrees with the per-tool check."""
+    configurations = [
+        None,
+        {},
+        {"actions": {"messaging": {"read": True}}},
+        {"actions": {"templates": {"read": True, "update": True}, "users": {"delete": True}}},
+        {"actions": {"workflows": {"trigger": True, "schedule": False}, "webhooks": {}}},
+    ]
+
+    for configuration in configurations:
+        expected = [tool for tool in tools if is_tool_allowed(tool, configuration)]
+        assert list(filter_tools(tools, configuration)) == expected
+
+
+def test_filter_tools_memoizes_equivalent_configurations():
+    """Test that tenants with equivalent actions share one filtered tuple."""
+    first = filter_tools(tools, {"actions": {"messaging": {"read": True, "create": False}}})
+    second = filter_tools(tools, {"actions": {"messaging": {"read": True}}, "context": {"env": "dev"}})
+
+    assert first is second
+    assert {tool["method"] for tool in first} == {"get_message_status", "get_message_replies"}
+
+
+def test_filter_tools_recompiles_when_tools_change():
+    """Test that registering a new tool is picked up by the compiled filter."""
+    custom_tools = list(tools)
+    configuration = {"actions": {"messaging": {"read": True}}}
+    before = filter_tools(custom_tools, configuration)
+
+    custom_tools.append({"method": "custom", "actions": {"messaging": {"read": True}}})
+
+    assert len(filter_tools(custom_tools, configuration)) == len(before) + 1
@@ -0,0 +1,65 @@
+"""Tests for definitions module."""
+
+import copy
+import json
+
+import pytest
+from agenttoolkit.definitions import (
+    json_schema,
+    langchain_definition,
+    mcp_definition,
+    openai_definition,
+)
+from agenttoolkit.openai import SirenAgentToolkit
+from agenttoolkit.schema import SendMessage
+from agenttoolkit.tools import tools
+
+
+def test_definition_shapes():
+    """Test the OpenAI, LangChain and MCP definition shapes."""
+    tool = tools[0]
+
+    assert openai_definition(tool) == {
+        "type": "function",
+        "function": {
+            "name": tool["method"],
+            "description": tool["description"],
+            "parameters": tool["args_schema"].model_json_schema(),
+        },
+    }
+    assert langchain_definition(tool)["parameters"] == tool["args_schema"].model_json_schema()
+    assert mcp_definition(tool)["inputSchema"] == tool["args_schema"].model_json_schema()
+    assert mcp_definition(tool)["name"] == tool["method"]
+
+
+def test_schema_generated_once_per_process(monkeypatch):
+    """Test that repeated get_tools calls reuse the cached definitions."""
+    for tool in tools:
+        openai_definition(tool)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("model_json_schema should not be called again")
+
+    monkeypatch.setattr(SendMessage, "model_json_schema", fail)
+
+    first = SirenAgentToolkit(api_key="test-key").get_tools()
+    second = SirenAgentToolkit(api_key="test-key").get_tools()
+
+    assert len(first) == len(tools)
+    assert all(a is b for a, b in zip(first, second))
+    assert first is not second
+
+
+def test_definitions_are_immutable_but_serializable():
+    """Test that cached definitions cannot be modified but still behave like dicts."""
+    definition = openai_definition(tools[0])
+
+    with pytest.raises(TypeError):
+        definition["type"] = "other"
+    with pytest.raises(TypeError):
+        definition["function"]["parameters"]["properties"].pop("channel")
+
+    assert json.loads(json.dumps(definition)) == copy.deepcopy(definition)
+    mutable = copy.deepcopy(definition)
+    mutable["function"]["parameters"]["required"].append("body")
+    assert "body" not in json_schema(SendMessage)["required"]
@@ -0,0 +1,59 @@
+"""Tests for encoding module."""
+
+import dataclasses
+import datetime
+import json
+
+import pytest
+from siren.models.messaging import ReplyData
+from siren.models.user import User
+
+from agenttoolkit import encoding
+from agenttoolkit.encoding import dumps, encode_result, loads
+
+
+@dataclasses.dataclass
+class Sent:
+    message_id: str
+    at: datetime.datetime
+
+
+class Plain:
+    def __init__(self):
+        self.replies = [ReplyData(text="hé", thread_ts=None, user="U1", ts="1")]
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "pydantic-core"])
+def backend(request, monkeypatch):
+    if request.param and not encoding.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(encoding, "ORJSON_AVAILABLE", request.param)
+    return request.param
+
+
+def test_encodes_sdk_models_and_nested_objects(backend):
+    """Test models by field name, dataclasses, plain objects and non-str keys."""
+    user = User.model_validate({"uniqueId": "u-1", "firstName": "Ada"})
+    result = {
+        "user": user,
+        "sent": Sent("msg-1", datetime.datetime(2024, 1, 1)),
+        "plain": Plain(),
+        1: "one",
+    }
+
+    decoded = json.loads(dumps(result))
+
+    assert decoded["user"]["unique_id"] == "u-1" and decoded["user"]["first_name"] == "Ada"
+    assert decoded["sent"] == {"message_id": "msg-1", "at": "2024-01-01T00:00:00"}
+    assert decoded["plain"] == {"replies": [{"text": "hé", "thread_ts": None, "user": "U1", "ts": "1"}]}
+    assert decoded["1"] == "one"
+    assert json.loads(dumps([user, user]))[1]["unique_id"] == "u-1"
+    assert "é" in dumps(Plain())
+
+
+def test_encode_result_passes_strings_through(backend):
+    """Test that string results are returned unchanged and others become compact JSON."""
+    assert encode_result("msg-1") == "msg-1"
+    assert encode_result({"status": "DELIVERED"}) == '{"status":"DELIVERED"}'
+    assert encode_result(None) == "null"
+    assert loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
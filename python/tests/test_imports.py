@@ -0,0 +1,86 @@
+"""Import-time regression tests.
+
+Each check runs ``python -X importtime`` in a fresh interpreter and inspects
+the modules it reports, so the results do not depend on what the test
+process has already imported.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+import agenttoolkit
+from agenttoolkit.schema import SendMessage
+
+HEAVY_MODULES = ("siren", "pydantic", "httpx", "openai", "langchain", "crewai", "mcp")
+
+# Generous budget for the package's own cumulative import time; it only has
+# to catch an eager import of the SDK or a framework sneaking back in.
+IMPORT_BUDGET_US = 50_000
+
+
+def import_times(code):
+    """Return {module: cumulative microseconds} reported by -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def heavy_modules(times):
+    return sorted(m for m in times if m.split(".")[0] in HEAVY_MODULES)
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import agenttoolkit",
+        "from agenttoolkit import Configuration, Context, Actions, is_tool_allowed",
+        "import agenttoolkit.openai",
+        "import agenttoolkit.langchain",
+        "import agenttoolkit.crewai",
+        "import agenttoolkit.mcp",
+    ],
+)
+def test_light_imports_skip_sdk_and_frameworks(code):
+    """Test that configuration-only imports load no SDK or framework modules."""
+    times = import_times(code)
+
+    assert heavy_modules(times) == []
+    assert times["agenttoolkit"] < IMPORT_BUDGET_US
+
+
+def test_lazy_attributes_load_on_access():
+    """Test that SirenAPI, tools and the schemas resolve on first access."""
+    times = import_times("import agenttoolkit; agenttoolkit.SirenAPI")
+
+    assert "siren" in times
+    assert agenttoolkit.SendMessage is SendMessage
+    assert len(agenttoolkit.tools) > 0
+    assert "SirenAPI" in dir(agenttoolkit)
+    with pytest.raises(AttributeError):
+        agenttoolkit.DoesNotExist
+
+
+def test_lazy_schema_names_cover_schema_module():
+    """Test that every schema model is reachable from the package."""
+    import pydantic
+    from agenttoolkit import _LAZY_ATTRIBUTES, schema
+
+    models = {
+        name for name, value in vars(schema).items()
+        if isinstance(value, type) and issubclass(value, pydantic.BaseModel)
+        and value.__module__ == schema.__name__
+    }
+
+    assert models <= set(_LAZY_ATTRIBUTES)
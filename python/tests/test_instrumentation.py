@@ -0,0 +1,87 @@
+"""Tests for instrumentation module."""
+
+from types import SimpleNamespace
+
+import pytest
+from siren.exceptions import SirenSDKError
+
+from agenttoolkit.instrumentation import InMemorySink, PrometheusSink, add_sink, instrumentation, remove_sink
+from agenttoolkit.middleware import RetryMiddleware
+from agenttoolkit.openai import SirenAgentToolkit
+
+
+@pytest.fixture
+def sink():
+    sink = add_sink(PrometheusSink())
+    yield sink
+    remove_sink(sink)
+
+
+def make_toolkit(status):
+    toolkit = SirenAgentToolkit(
+        api_key="test-key", configuration={"context": {"retry_attempts": 0, "circuit_breaker_threshold": 0}}
+    )
+    toolkit.siren_api.register("get_message_status", status)
+    return toolkit
+
+
+def tool_call(message_id):
+    return SimpleNamespace(
+        id="call-1",
+        function=SimpleNamespace(name="get_message_status", arguments=f'{{"message_id": "{message_id}"}}'),
+    )
+
+
+async def test_records_every_phase_and_payload_size(sink):
+    """Test validate, run and serialize timings plus request and response sizes."""
+    toolkit = make_toolkit(lambda message_id: {"status": "DELIVERED"})
+
+    await toolkit.handle_tool_call(tool_call("m1"))
+
+    assert {phase for (method, phase) in sink.latency} == {"validate", "run", "serialize"}
+    assert all(h.count == 1 for h in sink.latency.values())
+    assert sink.sizes[("get_message_status", "request")].sum == len('{"message_id":"m1"}')
+    assert sink.sizes[("get_message_status", "response")].sum == len('{"status":"DELIVERED"}')
+
+
+async def test_counts_errors_and_retries(sink):
+    """Test error counters by phase and type, and retries reported by the middleware."""
+    def fail(message_id):
+        raise SirenSDKError("unavailable", status_code=503)
+
+    toolkit = make_toolkit(fail)
+    toolkit.siren_api.add_middleware(RetryMiddleware(["get_message_status"], attempts=2, sleep=lambda delay: None))
+
+    results = await toolkit.handle_tool_calls([tool_call("m1")])
+
+    assert "unavailable" in results[0]["content"]
+    assert sink.errors == {("get_message_status", "run", "SirenSDKError"): 1}
+    assert sink.events == {("get_message_status", "retries"): 2}
+
+
+def test_prometheus_text_format(sink):
+    """Test the rendered histogram, error and event series."""
+    instrumentation.time("send_message", "run", lambda: None)
+    instrumentation.count("send_message", "deduplicated")
+    sink.errors[("send_message", "run", "Bad\"Error")] = 1
+
+    text = sink.render()
+
+    assert '# TYPE siren_tool_phase_seconds histogram' in text
+    assert 'siren_tool_phase_seconds_bucket{method="send_message",phase="run",le="+Inf"} 1' in text
+    assert 'siren_tool_phase_seconds_count{method="send_message",phase="run"} 1' in text
+    assert 'siren_tool_events_total{method="send_message",event="deduplicated"} 1' in text
+    assert 'error="Bad\\"Error"' in text
+    assert sink.snapshot()["events"] == {"send_message.deduplicated": 1}
+
+
+def test_disabled_by_default():
+    """Test that there are no sinks by default and removed sinks stop recording."""
+    toolkit = make_toolkit(lambda message_id: "DELIVERED")
+    sink = add_sink(InMemorySink())
+    toolkit.siren_api.run("get_message_status", {"message_id": "m1"})
+    remove_sink(sink)
+    toolkit.siren_api.run("get_message_status", {"message_id": "m1"})
+
+    assert instrumentation.sinks == ()
+    assert sink.latency[("get_message_status", "run")].count == 1
@@ -0,0 +1,94 @@
+"""Tests for the MCP server."""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from agenttoolkit.definitions import mcp_definition
+from agenttoolkit.mcp import SirenAgentToolkit
+from agenttoolkit.mcp.server import build_configuration, parse_args
+from agenttoolkit.tools import tools
+
+
+def make_toolkit(arun, configuration=None, **kwargs):
+    toolkit = SirenAgentToolkit("test-key", configuration, **kwargs)
+    toolkit.siren_api.arun = arun
+    return toolkit
+
+
+async def test_lists_the_allowed_tools():
+    toolkit = make_toolkit(None, {"actions": {"messaging": {"read": True}}})
+
+    async with create_connected_server_and_client_session(toolkit.server) as session:
+        listed = (await session.list_tools()).tools
+
+    assert [tool.name for tool in listed] == ["get_message_status", "get_message_replies"]
+    expected = mcp_definition(next(tool for tool in tools if tool["method"] == "get_message_status"))
+    assert listed[0].inputSchema == expected["inputSchema"]
+
+
+async def test_handles_tool_calls_concurrently_up_to_the_cap():
+    running = 0
+    peak = 0
+
+    async def arun(method, params):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"status": "DELIVERED", "message_id": params["message_id"]}
+
+    toolkit = make_toolkit(arun, max_concurrency=3)
+
+    async with create_connected_server_and_client_session(toolkit.server) as session:
+        results = await asyncio.gather(*(
+            session.call_tool("get_message_status", {"message_id": str(i)}) for i in range(10)
+        ))
+
+    assert [json.loads(r.content[0].text)["message_id"] for r in results] == [str(i) for i in range(10)]
+    assert peak == 3
+
+
+async def test_invalid_arguments_and_unknown_tools_are_tool_errors():
+    async def arun(method, params):
+        raise AssertionError("must not be called")
+
+    toolkit = make_toolkit(arun, {"actions": {"messaging": {"read": True}}})
+
+    async with create_connected_server_and_client_session(toolkit.server) as session:
+        invalid = await session.call_tool("get_message_status", {})
+        unknown = await session.call_tool("delete_user", {"unique_id": "u-1"})
+
+    assert invalid.isError and "message_id" in invalid.content[0].text
+    assert unknown.isError and "Unknown tool: delete_user" in unknown.content[0].text
+
+
+def test_build_configuration_allows_the_selected_tools():
+    configuration = build_configuration(["send_message", "delete_user"], {"env": "dev"})
+
+    assert configuration == {
+        "context": {"env": "dev"},
+        "actions": {"messaging": {"create": True}, "users": {"delete": True}},
+    }
+    assert "actions" not in build_configuration(["all"])
+
+
+def test_parse_args_rejects_unknown_tools_and_missing_key(monkeypatch, capsys):
+    monkeypatch.delenv("SIREN_API_KEY", raising=False)
+
+    with pytest.raises(SystemExit):
+        parse_args(["--tools=send_message,nope", "--api-key=k"])
+    assert "Invalid tool: nope" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        parse_args(["--tools=all"])
+    assert "SIREN_API_KEY" in capsys.readouterr().err
+
+    args = parse_args(["--tools= send_message ,all", "--api-key=k", "--transport=http"])
+    assert (args.tools, args.transport) == (["send_message", "all"], "http")
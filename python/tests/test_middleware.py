@@ -0,0 +1,305 @@
+"""Tests for middleware module."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from siren.exceptions import SirenSDKError
+
+from agenttoolkit.api import SirenAPI
+from agenttoolkit.schema import SendMessage
+from agenttoolkit.middleware import (
+    CircuitBreakerMiddleware,
+    CircuitOpenError,
+    DedupeMiddleware,
+    Middleware,
+    RetryMiddleware,
+    is_transient,
+    is_unprocessed,
+)
+
+
+class FaultyClient:
+    """Fake Siren client that fails with the given status codes before succeeding."""
+
+    def __init__(self, faults, raw_response=None):
+        self.faults = list(faults)
+        self.raw_response = raw_response
+        self.calls = 0
+
+    def _next(self, result):
+        self.calls += 1
+        if self.faults:
+            status = self.faults.pop(0)
+            raise SirenSDKError(f"HTTP {status}", status_code=status, raw_response=self.raw_response)
+        return result
+
+    def get_status(self, message_id):
+        return self._next("DELIVERED")
+
+    def send(self, **params):
+        return self._next("msg-1")
+
+    async def aget_status(self, message_id):
+        return self.get_status(message_id)
+
+
+def make_api(client, sleeps, **context):
+    retry = RetryMiddleware(
+        ["get_message_status"], attempts=context.pop("attempts", 2), backoff=0.5, max_backoff=4, sleep=sleeps.append
+    )
+
+    async def asleep(delay):
+        sleeps.append(delay)
+
+    retry._asleep = asleep
+    api = SirenAPI(
+        api_key="test-key",
+        context={"retry_attempts": 0, "circuit_breaker_threshold": 0, **context},
+        middleware=[retry],
+    )
+    api.register("get_message_status", client.get_status, client.aget_status)
+    api.register("send_message", client.send)
+    return api
+
+
+def test_retries_transient_errors_of_idempotent_methods():
+    """Test backoff retries on 503/429 and no retry for writes or client errors."""
+    sleeps = []
+    client = FaultyClient([503, 429])
+    api = make_api(client, sleeps)
+
+    assert api.run("get_message_status", {"message_id": "m1"}) == "DELIVERED"
+    assert client.calls == 3
+    assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+
+    client.faults = [503]
+    with pytest.raises(SirenSDKError):
+        api.run("send_message", {"recipient_value": "a", "channel": "EMAIL"})
+    client.faults = [400]
+    with pytest.raises(SirenSDKError):
+        api.run("get_message_status", {"message_id": "m1"})
+    assert len(sleeps) == 2
+
+
+async def test_async_retry_honors_retry_after():
+    """Test that Retry-After replaces the backoff and too long a wait gives up."""
+    sleeps = []
+    client = FaultyClient([429], raw_response={"error": {"retryAfter": 3}})
+    api = make_api(client, sleeps)
+
+    assert await api.arun("get_message_status", {"message_id": "m1"}) == "DELIVERED"
+    assert sleeps == [3.0]
+
+    client.faults = [429]
+    client.raw_response = {"retryAfter": 60}
+    with pytest.raises(SirenSDKError):
+        await api.arun("get_message_status", {"message_id": "m1"})
+    assert sleeps == [3.0]
+
+
+def test_retry_gives_up_after_attempts():
+    """Test that persistent failures raise after the configured retries."""
+    sleeps = []
+    client = FaultyClient([500, 500, 500, 500])
+    api = make_api(client, sleeps)
+
+    with pytest.raises(SirenSDKError):
+        api.run("get_message_status", {"message_id": "m1"})
+    assert client.calls == 3
+
+
+def test_circuit_breaker_opens_and_recovers(timer):
+    """Test fail-fast while open, a half-open trial and closing on success."""
+    breaker = CircuitBreakerMiddleware(threshold=3, reset_timeout=10, timer=timer)
+    client = FaultyClient([503] * 4)
+    api = make_api(client, [], attempts=0)
+    api.add_middleware(breaker)
+
+    for _ in range(3):
+        with pytest.raises(SirenSDKError):
+            api.run("get_message_status", {"message_id": "m1"})
+    with pytest.raises(CircuitOpenError):
+        api.run("get_message_status", {"message_id": "m1"})
+    assert client.calls == 3
+
+    timer.now = 10
+    with pytest.raises(SirenSDKError):
+        api.run("get_message_status", {"message_id": "m1"})
+    assert breaker.breaker("get_message_status").state == "open"
+
+    timer.now = 20
+    assert api.run("get_message_status", {"message_id": "m1"}) == "DELIVERED"
+    assert breaker.breaker("get_message_status").state == "closed"
+    assert api.run("send_message", {"recipient_value": "a", "channel": "EMAIL"}) == "msg-1"
+
+
+async def test_cancelled_trial_call_releases_half_open_circuit(timer):
+    """Test that cancelling the half-open trial lets the next call try again."""
+    breaker = CircuitBreakerMiddleware(threshold=1, reset_timeout=10, timer=timer)
+    api = SirenAPI(api_key="test-key", context={"retry_attempts": 0, "circuit_breaker_threshold": 0})
+    api.add_middleware(breaker)
+    outcomes = [SirenSDKError("HTTP 503", status_code=503), None, "DELIVERED"]
+
+    async def get_status(message_id):
+        outcome = outcomes.pop(0)
+        if outcome is None:
+            await asyncio.sleep(10)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    api.register("get_message_status", lambda message_id: None, get_status)
+    with pytest.raises(SirenSDKError):
+        await api.arun("get_message_status", {"message_id": "m1"})
+
+    timer.now = 10
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(api.arun("get_message_status", {"message_id": "m1"}), 0.01)
+
+    assert breaker.breaker("get_message_status").state == "half-open"
+    assert await api.arun("get_message_status", {"message_id": "m1"}) == "DELIVERED"
+    assert breaker.breaker("get_message_status").state == "closed"
+
+
+def test_circuit_breakers_are_per_account_and_ignore_throttling():
+    """Test that one account's failures or 429s never open another account's circuit."""
+    context = {"retry_attempts": 0, "circuit_breaker_threshold": 2}
+    throttled = SirenAPI(api_key="throttled-key", context=context)
+    healthy = SirenAPI(api_key="healthy-key", context=context)
+    breakers = [
+        next(m for m in api.middleware if isinstance(m, CircuitBreakerMiddleware)) for api in (throttled, healthy)
+    ]
+    client = FaultyClient([429] * 3 + [503] * 2)
+    throttled.register("get_message_status", client.get_status)
+
+    for _ in range(5):
+        with pytest.raises(SirenSDKError):
+            throttled.run("get_message_status", {"message_id": "m1"})
+
+    assert breakers[0] is not breakers[1]
+    assert breakers[0].breaker("get_message_status").state == "open"
+    assert breakers[1].breaker("get_message_status").state == "closed"
+    assert client.calls == 5
+
+
+def test_custom_middleware_and_context_defaults():
+    """Test that custom middleware wraps handlers and the context configures defaults."""
+    seen = []
+
+    class Recorder(Middleware):
+        def wrap(self, method, handler):
+            def call(**params):
+                seen.append(method)
+                return handler(**params)
+            return call
+
+    api = SirenAPI(api_key="test-key", middleware=[Recorder()])
+    api.register("echo", lambda value: value)
+
+    assert api.run("echo", {"value": 1}) == 1
+    assert seen == ["echo"]
+    assert [type(m).__name__ for m in api.middleware] == ["RetryMiddleware", "CircuitBreakerMiddleware", "Recorder"]
+    assert [type(m).__name__ for m in SirenAPI(api_key="test-key", context={"dedupe": True}).middleware] == [
+        "DedupeMiddleware", "RetryMiddleware", "CircuitBreakerMiddleware"
+    ]
+    assert SirenAPI(
+        api_key="k", context={"retry_attempts": 0, "circuit_breaker_threshold": 0, "dedupe": False}
+    ).middleware == []
+    assert is_transient(SirenSDKError("boom", original_exception=ConnectionError()))
+    assert not is_transient(SirenSDKError("bad", original_exception=ValueError()))
+
+
+def test_unprocessed_errors_of_the_sync_transport():
+    """Test that requests' connection errors mean unprocessed, and its read timeouts do not."""
+    exceptions = requests.exceptions
+    assert is_unprocessed(SirenSDKError("down", original_exception=exceptions.ConnectionError("refused")))
+    assert is_unprocessed(SirenSDKError("slow", original_exception=exceptions.ConnectTimeout()))
+    assert not is_unprocessed(SirenSDKError("slow", original_exception=exceptions.ReadTimeout()))
+    assert is_unprocessed(SirenSDKError("throttled", status_code=429))
+    assert not is_unprocessed(SirenSDKError("failed", status_code=500))
+
+
+def make_dedupe_api(handler, async_handler=None, timer=None):
+    api = SirenAPI(api_key="test-key", context={"retry_attempts": 0, "circuit_breaker_threshold": 0, "dedupe": False})
+    api.add_middleware(DedupeMiddleware(
+        {"send_message": 60}, {"send_message": SendMessage}, **({"timer": timer} if timer else {})
+    ))
+    api.register("send_message", handler, async_handler)
+    return api
+
+
+def test_dedupe_repeats_within_window(timer):
+    """Test that identical sends return the first result until the window ends."""
+    sent = []
+
+    def send(**params):
+        sent.append(params)
+        if params.get("body") == "fail":
+            raise SirenSDKError("bad request", status_code=400)
+        return f"msg-{len(sent)}"
+
+    api = make_dedupe_api(send, timer=timer)
+    params = {"recipient_value": "a@example.com", "channel": "EMAIL", "body": "hi"}
+
+    assert api.run("send_message", params) == "msg-1"
+    assert api.run("send_message", {**params, "subject": None}) == "msg-1"
+    assert api.run("send_message", {**params, "recipient_value": "b@example.com"}) == "msg-2"
+    assert len(sent) == 2
+
+    timer.now = 61
+    assert api.run("send_message", params) == "msg-3"
+
+    failing = {**params, "body": "fail"}
+    for _ in range(2):
+        with pytest.raises(SirenSDKError):
+            api.run("send_message", failing)
+    assert len(sent) == 5
+
+
+def test_dedupe_coalesces_concurrent_calls():
+    """Test that identical calls from several threads share one in-flight call."""
+    started = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    def send(**params):
+        sent.append(params)
+        started.set()
+        release.wait(5)
+        return "msg-1"
+
+    api = make_dedupe_api(send)
+    params = {"recipient_value": "a@example.com", "channel": "EMAIL", "body": "hi"}
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(api.run, "send_message", params) for _ in range(4)]
+        started.wait(5)
+        release.set()
+        assert [future.result(5) for future in futures] == ["msg-1"] * 4
+    assert len(sent) == 1
+
+
+async def test_dedupe_coalesces_async_calls_and_shares_errors():
+    """Test singleflight on the async path, including a failing leader."""
+    sent = []
+
+    async def send(**params):
+        sent.append(params)
+        await asyncio.sleep(0.01)
+        if params.get("body") == "fail":
+            raise SirenSDKError("bad request", status_code=400)
+        return "msg-1"
+
+    api = make_dedupe_api(send, send)
+    params = {"recipient_value": "a@example.com", "channel": "EMAIL", "body": "hi"}
+
+    results = await asyncio.gather(*(api.arun("send_message", params) for _ in range(3)))
+    assert results == ["msg-1"] * 3
+    assert len(sent) == 1
+
+    failing = {**params, "body": "fail"}
+    results = await asyncio.gather(*(api.arun("send_message", failing) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, SirenSDKError) for result in results)
+    assert len(sent) == 2
@@ -0,0 +1,114 @@
+"""Tests for the OpenAI toolkit."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+from agenttoolkit.openai import SirenAgentToolkit
+
+
+def make_tool_call(call_id, name, arguments):
+    return SimpleNamespace(
+        id=call_id,
+        function=SimpleNamespace(name=name, arguments=json.dumps(arguments)),
+    )
+
+
+def make_toolkit(arun, **kwargs):
+    toolkit = SirenAgentToolkit(api_key="test-key", **kwargs)
+    toolkit.siren_api.arun = arun
+    return toolkit
+
+
+async def test_handle_tool_calls_preserves_input_order():
+    """Test that results come back in the order of the tool calls."""
+    async def arun(method, params):
+        await asyncio.sleep(0.01 * (3 - int(params["message_id"])))
+        return {"status": f"status-{params['message_id']}"}
+
+    toolkit = make_toolkit(arun)
+    tool_calls = [
+        make_tool_call(f"call-{i}", "get_message_status", {"message_id": str(i)})
+        for i in range(3)
+    ]
+
+    results = await toolkit.handle_tool_calls(tool_calls)
+
+    assert [r["tool_call_id"] for r in results] == ["call-0", "call-1", "call-2"]
+    assert [json.loads(r["content"])["status"] for r in results] == [
+        "status-0", "status-1", "status-2",
+    ]
+    assert all(r["role"] == "tool" for r in results)
+
+
+async def test_handle_tool_calls_respects_concurrency_cap():
+    """Test that no more than max_concurrency calls are in flight."""
+    in_flight = 0
+    peak = 0
+
+    async def arun(method, params):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "DELIVERED"
+
+    toolkit = make_toolkit(arun, max_concurrency=2)
+    tool_calls = [
+        make_tool_call(f"call-{i}", "get_message_status", {"message_id": str(i)})
+        for i in range(6)
+    ]
+
+    await toolkit.handle_tool_calls(tool_calls)
+    assert peak == 2
+
+    peak = 0
+    await toolkit.handle_tool_calls(tool_calls, max_concurrency=3)
+    assert peak == 3
+
+
+async def test_handle_tool_calls_validates_before_executing():
+    """Test that invalid calls never run and do not sink the batch."""
+    executed = []
+
+    async def arun(method, params):
+        executed.append(method)
+        if params["message_id"] == "boom":
+            raise RuntimeError("Siren unavailable")
+        return "DELIVERED"
+
+    toolkit = make_toolkit(arun)
+    tool_calls = [
+        make_tool_call("call-0", "get_message_status", {"message_id": "1"}),
+        make_tool_call("call-1", "unknown_tool", {}),
+        make_tool_call("call-2", "get_message_status", {}),
+        make_tool_call("call-3", "get_message_status", {"message_id": "boom"}),
+    ]
+
+    results = await toolkit.handle_tool_calls(tool_calls)
+
+    assert executed == ["get_message_status", "get_message_status"]
+    assert results[0]["content"] == "DELIVERED"
+    assert "Unknown tool" in json.loads(results[1]["content"])["error"]
+    assert "message_id" in json.loads(results[2]["content"])["error"]
+    assert json.loads(results[3]["content"]) == {"error": "Siren unavailable"}
+
+
+async def test_handle_tool_calls_reports_unencodable_result_of_its_call_only():
+    """Test that a result failing to encode becomes that call's error message."""
+    cyclic = {}
+    cyclic["self"] = cyclic
+
+    async def arun(method, params):
+        return cyclic if params["message_id"] == "cyclic" else "DELIVERED"
+
+    toolkit = make_toolkit(arun)
+    results = await toolkit.handle_tool_calls([
+        make_tool_call("call-0", "get_message_status", {"message_id": "cyclic"}),
+        make_tool_call("call-1", "get_message_status", {"message_id": "1"}),
+    ])
+
+    assert [result["tool_call_id"] for result in results] == ["call-0", "call-1"]
+    assert "error" in json.loads(results[0]["content"])
+    assert results[1]["content"] == "DELIVERED"
@@ -0,0 +1,122 @@
+"""Tests for pagination module."""
+
+import asyncio
+import threading
+
+from agenttoolkit.api import SirenAPI
+from agenttoolkit.pagination import aiter_pages, iter_pages, summarize
+
+
+def make_pages(total, page_size, calls):
+    def fetch(page, **filters):
+        calls.append(page)
+        start = page * page_size
+        return [{"id": str(i), "name": f"t{i}", "variables": []} for i in range(start, min(start + page_size, total))]
+    return fetch
+
+
+def test_iter_pages_prefetches_next_page():
+    """Test that the next page is requested while the current one is consumed."""
+    calls = []
+    fetched = threading.Event()
+    fetch = make_pages(25, 10, calls)
+
+    def tracking_fetch(page):
+        result = fetch(page)
+        if page == 1:
+            fetched.set()
+        return result
+
+    items = iter_pages(tracking_fetch, page_size=10)
+    first = next(items)
+
+    assert first["id"] == "0"
+    assert fetched.wait(1)
+    assert [item["id"] for item in items] == [str(i) for i in range(1, 25)]
+    assert calls == [0, 1, 2]
+
+
+def test_iter_pages_without_prefetch_stops_on_short_page():
+    """Test lazy paging and the stop condition on an exactly full last page."""
+    calls = []
+    items = list(iter_pages(make_pages(20, 10, calls), page_size=10, prefetch=False))
+
+    assert len(items) == 20
+    assert calls == [0, 1, 2]
+
+
+async def test_aiter_pages_overlaps_fetch_and_consume():
+    """Test that the async iterator fetches page n + 1 while page n is consumed."""
+    calls = []
+    fetch = make_pages(30, 10, calls)
+
+    async def afetch(page):
+        return fetch(page)
+
+    seen = []
+    async for item in aiter_pages(afetch, page_size=10):
+        seen.append(item["id"])
+        if item["id"] == "0":
+            await asyncio.sleep(0)
+            assert calls == [0, 1]
+
+    assert seen == [str(i) for i in range(30)]
+
+
+def test_summarize_truncates_and_stops_reading():
+    """Test that summaries keep only summary fields and stop early."""
+    calls = []
+    items = iter_pages(make_pages(1000, 10, calls), page_size=10, prefetch=False)
+
+    summary = summarize("list_templates", items, max_results=15)
+
+    assert summary["count"] == 15 and summary["truncated"] is True
+    assert summary["items"][0] == {"id": "0", "name": "t0"}
+    assert calls == [0, 1]
+
+
+async def test_list_tools_all_pages_mode():
+    """Test the all_pages tool mode for templates (sync) and users (async)."""
+    api = SirenAPI(api_key="test-key")
+    template_calls = []
+    user_calls = []
+    templates = make_pages(120, 50, template_calls)
+
+    def users(page=None, size=None, search=None):
+        user_calls.append((page, size, search))
+        return [{"unique_id": "u1", "email": "a@example.com", "attributes": {"x": 1}}] if page == 0 else []
+
+    async def ausers(**params):
+        return users(**params)
+
+    api.register("list_templates", lambda **params: templates(**params))
+    api.register("list_users", users, ausers)
+
+    summary = api.run("list_templates", {"search": "t", "all_pages": True, "max_results": 200})
+    user_summary = await api.arun("list_users", {"search": "a", "all_pages": True, "size": 5})
+
+    assert summary["count"] == 120 and summary["truncated"] is False
+    assert template_calls == [0, 1, 2]
+    assert user_summary == {
+        "count": 1,
+        "truncated": False,
+        "items": [{"unique_id": "u1", "email": "a@example.com"}],
+    }
+    assert user_calls == [(0, 5, "a")]
+
+
+def test_list_users_uses_users_endpoint(monkeypatch):
+    """Test that list_users calls the public users endpoint with the given params."""
+    api = SirenAPI(api_key="test-key")
+    requests = []
+
+    def make_request(**kwargs):
+        requests.append(kwargs)
+        return []
+
+    monkeypatch.setattr(api.client.user, "_make_request", make_request)
+
+    assert list(api.iter_users(page_size=20, search="ann")) == []
+    assert requests[0]["endpoint"] == "/api/v1/public/users"
+    assert requests[0]["method"] == "GET"
+    assert requests[0]["params"] == {"page": 0, "size": 20, "search": "ann"}
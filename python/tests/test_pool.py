@@ -0,0 +1,56 @@
+"""Tests for pool module."""
+
+import httpx
+
+from agenttoolkit.api import SirenAPI
+from agenttoolkit.pool import ConnectionPool, pool
+
+
+async def test_pool_shares_client_per_env_and_base_url():
+    """Test that one client is shared per (env, base_url) key."""
+    connection_pool = ConnectionPool()
+
+    first = connection_pool.get("prod", "https://api.trysiren.io")
+    second = connection_pool.get("prod", "https://api.trysiren.io")
+    other = connection_pool.get("dev", "https://api.dev.trysiren.io")
+
+    assert first is second
+    assert other is not first
+    await connection_pool.aclose()
+    assert first.is_closed and other.is_closed
+
+
+async def test_pool_applies_context_limits_and_timeout():
+    """Test that pool size and timeout are taken from the context."""
+    connection_pool = ConnectionPool()
+
+    client = connection_pool.get(
+        "prod",
+        "https://api.trysiren.io",
+        {"timeout": 3, "max_connections": 7, "max_keepalive_connections": 2},
+    )
+
+    assert client.timeout == httpx.Timeout(3)
+    assert client._transport._pool._max_connections == 7
+    assert client._transport._pool._max_keepalive_connections == 2
+    await connection_pool.aclose()
+
+
+async def test_siren_api_instances_borrow_the_shared_pool():
+    """Test that separate SirenAPI objects reuse the same connections."""
+    first = SirenAPI("key-1").async_client
+    second = SirenAPI("key-2").async_client
+
+    assert first.message._transport._client is second.template._transport._client
+    assert first.message.api_key == "key-1"
+    assert second.message.api_key == "key-2"
+    await pool.aclose()
+
+
+def test_context_configures_sync_client():
+    """Test that base_url and timeout from the context reach the SDK clients."""
+    api = SirenAPI("key", {"base_url": "http://localhost:9000", "timeout": 4})
+
+    assert api.client.message.base_url == "http://localhost:9000"
+    assert api.client.template._channel_template_client.base_url == "http://localhost:9000"
+    assert api.client.workflow.timeout == 4
@@ -0,0 +1,106 @@
+"""Tests for ratelimit module."""
+
+import asyncio
+import time
+
+import pytest
+
+from agenttoolkit.api import SirenAPI
+from agenttoolkit.ratelimit import (
+    METHOD_CATEGORIES,
+    FileTokenBucket,
+    RateLimitExceeded,
+    RateLimitMiddleware,
+    TokenBucket,
+)
+
+
+def test_token_bucket_queues_then_refuses(timer):
+    """Test burst capacity, queued waits, the queue limit and refill."""
+    bucket = TokenBucket(rate=2, capacity=2, timer=timer)
+
+    assert bucket.reserve(max_queue=2) == 0
+    assert bucket.reserve(max_queue=2) == 0
+    assert bucket.reserve(max_queue=2) == pytest.approx(0.5)
+    assert bucket.reserve(max_queue=2) == pytest.approx(1.0)
+    assert bucket.waiting == 2
+    assert bucket.reserve(max_queue=2) is None
+
+    bucket.refund()
+    assert bucket.waiting == 1
+    timer.now = 10
+    assert bucket.waiting == 0
+    assert bucket.reserve(max_queue=0) == 0
+    assert bucket.reserve(max_queue=5, max_wait=0.1) == 0
+    assert bucket.reserve(max_queue=5, max_wait=0.1) is None
+
+
+def test_file_token_bucket_is_shared(tmp_path, timer):
+    """Test that two buckets on one file, as in two processes, share tokens."""
+    timer.now = 1000.0
+    path = str(tmp_path / "messaging.bucket")
+    first = FileTokenBucket(path, rate=1, capacity=2, timer=timer)
+    second = FileTokenBucket(path, rate=1, capacity=2, timer=timer)
+
+    assert first.reserve(max_queue=0) == 0
+    assert second.reserve(max_queue=0) == 0
+    assert first.reserve(max_queue=0) is None
+    assert second.reserve(max_queue=1) == pytest.approx(1.0)
+    timer.now += 3
+    assert first.waiting == 0
+
+
+def test_middleware_limits_per_category():
+    """Test that categories have separate buckets and unlimited ones pass through."""
+    sleeps = []
+    limiter = RateLimitMiddleware({"messaging": 1}, max_queue=1, sleep=sleeps.append)
+    api = SirenAPI(api_key="test-key", context={"retry_attempts": 0, "circuit_breaker_threshold": 0, "dedupe": False})
+    api.add_middleware(limiter)
+    api.register("send_message", lambda **params: "msg-1")
+    api.register("list_users", lambda **params: [])
+
+    assert api.run("send_message", {}) == "msg-1"
+    assert api.run("send_message", {}) == "msg-1"
+    assert len(sleeps) == 1 and 0 < sleeps[0] <= 1.0
+    with pytest.raises(RateLimitExceeded):
+        api.run("send_message", {})
+    for _ in range(5):
+        api.run("list_users", {})
+    assert len(sleeps) == 1
+    assert METHOD_CATEGORIES["trigger_workflow_bulk"] == "workflows"
+    assert "send_messages_batch" not in METHOD_CATEGORIES
+    assert "add_users_bulk" not in METHOD_CATEGORIES and METHOD_CATEGORIES["add_user"] == "users"
+
+
+async def test_async_callers_queue_in_order():
+    """Test that concurrent async calls are spaced out by the bucket."""
+    api = SirenAPI(api_key="test-key", context={"retry_attempts": 0, "circuit_breaker_threshold": 0, "dedupe": False})
+    api.add_middleware(RateLimitMiddleware({"users": 50}, burst={"users": 1}))
+    calls = []
+
+    async def add(**params):
+        calls.append(time.monotonic())
+
+    api.register("add_user", add, add)
+
+    await asyncio.gather(*(api.arun("add_user", {}) for _ in range(4)))
+    assert len(calls) == 4
+    assert calls[-1] - calls[0] >= 0.05
+
+
+def test_context_configures_shared_limiter(tmp_path):
+    """Test that SirenAPIs of one account share a limiter built from the context."""
+    context = {"rate_limits": {"messaging": 5}, "rate_limit_dir": str(tmp_path)}
+    first = SirenAPI(api_key="test-key", context=context)
+    second = SirenAPI(api_key="test-key", context=context)
+    other = SirenAPI(api_key="other-key", context=context)
+
+    first_limiter = [m for m in first.middleware if isinstance(m, RateLimitMiddleware)]
+    assert len(first_limiter) == 1
+    assert first_limiter[0] in second.middleware
+    assert first_limiter[0] not in other.middleware
+    assert type(first.middleware[-1]).__name__ == "RateLimitMiddleware"
+    assert first_limiter[0].acquire("send_message") == 0
+    assert [path.name.endswith("-messaging.bucket") for path in tmp_path.iterdir()] == [True]
+    with pytest.raises(ValueError):
+        SirenAPI(api_key="test-key", context={"rate_limits": {"sms": 1}})
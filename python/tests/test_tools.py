@@ -114,12 +114,12 @@ def test_workflow_tools_exist():
     # Check for specific workflow tools
     tool_methods = [tool["method"] for tool in workflow_tools]
     assert "trigger_workflow" in tool_methods
-    assert "trigger_workflow_bulk" in tool_methods
+    assert "trigger_workflow_bulk_chunked" in tool_methods
     assert "schedule_workflow" in tool_methods
     
     # Verify permissions
     for tool in workflow_tools:
-        if tool["method"] in ["trigger_workflow", "trigger_workflow_bulk"]:
+        if tool["method"] in ["trigger_workflow", "trigger_workflow_bulk_chunked"]:
             assert tool["actions"]["workflows"].get("trigger") is True
         elif tool["method"] == "schedule_workflow":
             assert tool["actions"]["workflows"].get("schedule") is True
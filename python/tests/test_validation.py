@@ -0,0 +1,43 @@
+"""Tests for tool argument validation."""
+
+import pytest
+from pydantic import ValidationError
+
+from agenttoolkit.schema import ListTemplates, SendMessage, UpdateUser
+from agenttoolkit.validation import type_adapter, validate, validate_json
+
+
+def test_validate_drops_unset_optional_fields():
+    params = validate(SendMessage, {"recipient_value": "a@b.c", "channel": "EMAIL", "body": "hi"})
+
+    assert params == {"recipient_value": "a@b.c", "channel": "EMAIL", "body": "hi"}
+
+
+def test_validate_returns_aliased_fields_by_name():
+    params = validate(UpdateUser, {"id": "u-1", "customData": {"plan": "pro"}, "inApp": True})
+
+    assert params == {"id": "u-1", "custom_data": {"plan": "pro"}, "in_app": True}
+
+
+def test_validate_json_matches_validate():
+    arguments = '{"recipient_value": "a@b.c", "channel": "EMAIL", "subject": "s", "body": "hi"}'
+
+    assert validate_json(SendMessage, arguments) == validate(
+        SendMessage, {"recipient_value": "a@b.c", "channel": "EMAIL", "subject": "s", "body": "hi"}
+    )
+    assert validate_json(SendMessage, arguments.encode()) == validate_json(SendMessage, arguments)
+
+
+def test_validate_json_treats_empty_arguments_as_empty_object():
+    assert validate_json(ListTemplates, "") == {}
+
+
+@pytest.mark.parametrize("arguments", ['{"channel": "EMAIL"}', "{not json", "[]"])
+def test_validate_json_rejects_invalid_arguments(arguments):
+    with pytest.raises(ValidationError):
+        validate_json(SendMessage, arguments)
+
+
+def test_type_adapter_is_cached_per_schema():
+    assert type_adapter(SendMessage) is type_adapter(SendMessage)
+    assert type_adapter(SendMessage) is not type_adapter(ListTemplates)
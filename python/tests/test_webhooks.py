@@ -0,0 +1,244 @@
+"""Tests for webhooks module."""
+
+import asyncio
+import http.client
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+from pydantic import ValidationError
+from siren.models.messaging import ReplyData
+
+from agenttoolkit.api import SirenAPI
+from agenttoolkit.schema import GetMessageReplies
+from agenttoolkit.webhooks import ReplyStore, StatusIndex, WebhookReceiver, parse_status_events
+
+
+def post(url, payload, headers=None):
+    """Fake webhook sender: POST a JSON body and return the response status."""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json", **(headers or {})},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as error:
+        return error.code
+
+
+@pytest.fixture
+def receiver():
+    with WebhookReceiver(token="s3cret") as receiver:
+        yield receiver
+
+
+def test_parse_status_events_accepts_common_shapes():
+    """Test single, listed and nested status callbacks."""
+    assert list(parse_status_events({"messageId": "m1", "status": "delivered"})) == [("m1", "DELIVERED")]
+    assert list(parse_status_events({"events": [{"message": {"id": "m2"}, "status": "FAILED"}, {"x": 1}]})) == [
+        ("m2", "FAILED")
+    ]
+    assert list(parse_status_events("not an event")) == []
+
+
+def test_status_index_is_bounded():
+    """Test that the least recently updated messages are dropped."""
+    index = StatusIndex(maxsize=2)
+    index.record("a", "SENT")
+    index.record("b", "SENT")
+    index.record("a", "DELIVERED")
+    index.record("c", "SENT")
+
+    assert index.get("b") is None
+    assert index.get("a") == "DELIVERED"
+    assert len(index) == 2
+
+
+def test_receiver_ingests_status_callbacks(receiver):
+    """Test that posted callbacks land in the index and the token is enforced."""
+    assert post(f"{receiver.url}/status?token=s3cret", {"message_id": "m1", "status": "SENT"}) == 204
+    assert post(f"{receiver.url}/status", {"message_id": "m1", "status": "FAILED"}) == 401
+    assert post(f"{receiver.url}/other?token=s3cret", {}) == 404
+
+    assert receiver.statuses.get("m1") == "SENT"
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_receiver_rejects_malformed_content_length(receiver, length):
+    """Test that a bad Content-Length is answered with 400 instead of an exception."""
+    host, port = receiver._server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    connection.putrequest("POST", "/status?token=s3cret")
+    connection.putheader("Content-Length", length)
+    connection.endheaders()
+
+    assert connection.getresponse().status == 400
+    connection.close()
+
+
+def test_receiver_requires_token_off_loopback():
+    """Test that only loopback receivers may run without a token."""
+    with pytest.raises(ValueError):
+        WebhookReceiver(host="0.0.0.0")
+    WebhookReceiver(host="localhost").stop()
+    WebhookReceiver(host="127.0.0.1").stop()
+
+
+def test_get_message_status_answers_from_fresh_index(receiver):
+    """Test that fresh statuses skip the API and stale ones fall back to it."""
+    api = SirenAPI(api_key="test-key")
+    calls = []
+    api.register("get_message_status", lambda message_id: calls.append(message_id) or "PENDING")
+    api.use_status_index(receiver.statuses, max_age=60)
+
+    post(f"{receiver.url}/status", {"message_id": "m1", "status": "DELIVERED"}, {"Authorization": "Bearer s3cret"})
+
+    assert api.run("get_message_status", {"message_id": "m1"}) == "DELIVERED"
+    assert api.run("get_message_status", {"message_id": "m2"}) == "PENDING"
+    assert api.run("get_message_status", {"message_id": "m2"}) == "PENDING"
+    assert calls == ["m2"]
+
+
+def test_status_index_falls_back_to_the_api_by_default(timer):
+    """Test that statuses recorded from the API are asked for again after the default max_age."""
+    api = SirenAPI(api_key="test-key")
+    statuses = ["SENT", "DELIVERED"]
+    api.register("get_message_status", lambda message_id: statuses.pop(0))
+    api.use_status_index(StatusIndex(timer=timer))
+
+    assert api.run("get_message_status", {"message_id": "m1"}) == "SENT"
+    timer.now = 60
+    assert api.run("get_message_status", {"message_id": "m1"}) == "SENT"
+    timer.now = 400
+    assert api.run("get_message_status", {"message_id": "m1"}) == "DELIVERED"
+
+
+async def test_wait_for_status_wakes_on_webhook(receiver):
+    """Test that wait_for_status returns when the fake sender posts a final status."""
+    api = SirenAPI(api_key="test-key")
+    calls = []
+
+    async def get_status(message_id):
+        calls.append(message_id)
+        return "SENT"
+
+    api.register("get_message_status", lambda message_id: "SENT", get_status)
+    api.use_status_index(receiver.statuses)
+    loop = asyncio.get_running_loop()
+
+    waiting = asyncio.ensure_future(api.wait_for_status("m1", {"DELIVERED", "FAILED"}, timeout=5))
+    await asyncio.sleep(0.05)
+    await loop.run_in_executor(
+        None, post, f"{receiver.url}/status?token=s3cret", {"message_id": "m1", "status": "delivered"}
+    )
+
+    assert await waiting == "DELIVERED"
+    assert calls == ["m1"]
+
+    with pytest.raises(asyncio.TimeoutError):
+        await api.wait_for_status("m2", {"DELIVERED"}, timeout=0.05)
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_reply_store_appends_and_persists(tmp_path, persistent):
+    """Test append-only replies, unknown messages and reopening a SQLite store."""
+    path = str(tmp_path / "replies.db") if persistent else None
+    store = ReplyStore(path)
+
+    assert store.replies("m1") is None
+    store.seed("m1", [])
+    store.append("m1", {"text": "yes", "user": "U1", "ts": "1"})
+    store.append("m1", {"text": "and no", "user": "U1", "ts": "2"})
+
+    assert [reply["text"] for reply in store.replies("m1")] == ["yes", "and no"]
+    assert store.wait_blocking("m1", after=2, timeout=0.01) == []
+    if persistent:
+        store.close()
+        assert len(ReplyStore(path).replies("m1")) == 2
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_reply_store_evicts_least_recently_updated(tmp_path, persistent, timer):
+    """Test that the store keeps at most maxsize messages."""
+    store = ReplyStore(str(tmp_path / "replies.db") if persistent else None, maxsize=2, timer=timer)
+
+    for index, message_id in enumerate(["m1", "m2", "m3"]):
+        timer.now = index
+        store.append(message_id, {"text": message_id})
+
+    assert len(store) == 2
+    assert store.replies("m1") is None
+    assert [reply["text"] for reply in store.replies("m3")] == ["m3"]
+
+
+def test_stale_replies_fall_back_to_the_api(timer):
+    """Test that stale replies are fetched again and merged without duplicating webhook ones."""
+    store = ReplyStore(timer=timer)
+    api = SirenAPI(api_key="test-key")
+    served = [
+        [],
+        [ReplyData(text="via webhook", user="U1", ts="1"), ReplyData(text="missed", user="U2", ts="2")],
+    ]
+    api.register("get_message_replies", lambda message_id: served.pop(0))
+    api.use_reply_store(store, max_age=60)
+
+    assert api.run("get_message_replies", {"message_id": "m1"}) == []
+    store.ingest({"message_id": "m1", "text": "via webhook", "user": "U1", "ts": "1"})
+    timer.now = 30
+    assert api.run("get_message_replies", {"message_id": "m1"}) == [
+        {"text": "via webhook", "thread_ts": None, "user": "U1", "ts": "1"}
+    ]
+
+    timer.now = 100
+    assert [reply["text"] for reply in api.run("get_message_replies", {"message_id": "m1"})] == [
+        "via webhook",
+        "missed",
+    ]
+    assert served == []
+
+
+def test_get_message_replies_bounds_wait_seconds():
+    """Test that tool calls cannot block a worker for long."""
+    with pytest.raises(ValidationError):
+        GetMessageReplies(message_id="m1", wait_seconds=3600)
+
+
+def test_receiver_ingests_inbound_replies(receiver):
+    """Test that inbound callbacks are appended per referenced message."""
+    payload = {"events": [{"messageId": "m1", "text": "hi", "user": "U1"}, {"text": "orphan"}]}
+
+    assert post(f"{receiver.url}/inbound?token=s3cret", payload) == 204
+    assert receiver.replies.replies("m1") == [{"text": "hi", "thread_ts": None, "user": "U1", "ts": None}]
+
+
+async def test_get_message_replies_long_polls_reply_store(receiver):
+    """Test seeding from the API once, wait_seconds and wait_for_reply."""
+    api = SirenAPI(api_key="test-key")
+    calls = []
+
+    async def get_replies(message_id):
+        calls.append(message_id)
+        return []
+
+    api.register("get_message_replies", lambda message_id: [], get_replies)
+    api.use_reply_store(receiver.replies)
+    loop = asyncio.get_running_loop()
+
+    def reply_later(text):
+        loop.call_later(0.05, lambda: loop.run_in_executor(
+            None, post, f"{receiver.url}/inbound?token=s3cret", {"message_id": "m1", "text": text}
+        ))
+
+    reply_later("first")
+    replies = await api.arun("get_message_replies", {"message_id": "m1", "wait_seconds": 5})
+    assert [reply["text"] for reply in replies] == ["first"]
+
+    reply_later("second")
+    new = await api.wait_for_reply("m1", timeout=5)
+    assert [reply["text"] for reply in new] == ["second"]
+    assert await api.wait_for_reply("m1", timeout=0.05) == []
+    assert calls == ["m1"]